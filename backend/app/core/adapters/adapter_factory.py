@@ -4,6 +4,7 @@ from sqlalchemy.engine import Engine
 from .base_adapter import DatabaseAdapter
 from .mysql_adapter import MySQLAdapter
 from .postgresql_adapter import PostgreSQLAdapter
+from .sqlite_adapter import SQLiteAdapter
 
 logger = logging.getLogger(__name__)
 
@@ -35,4 +36,7 @@ class DatabaseAdapterFactory:
     @classmethod
     def register_adapter(cls, database_type: str, adapter_class: Type[DatabaseAdapter]):
         """Registra um novo adaptador"""
-        cls._adapters[database_type.lower()] = adapter_class 
\ No newline at end of file
+        cls._adapters[database_type.lower()] = adapter_class 
+
+# SQLite: origem ou destino local em arquivo, sem servidor
+DatabaseAdapterFactory.register_adapter("sqlite", SQLiteAdapter)
@@ -1,14 +1,72 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Dict, List, Any, Iterator, Optional, Tuple
+import logging
+import math
+import re
+import threading
+import zlib
+from time import monotonic
+from sqlalchemy import text
 from sqlalchemy.engine import Engine
+from ..dependency_graph import plan_load_order
+
+logger = logging.getLogger(__name__)
+
+# Tipos de contagem de registros do inventário de tabelas
+COUNT_ESTIMATED = "estimated"
+COUNT_EXACT = "exact"
+COUNT_CACHED = "cached"
+COUNT_STRATEGIES = [COUNT_ESTIMATED, COUNT_EXACT, COUNT_CACHED]
+
+
+def _checksum_text(value: Any) -> str:
+    """Representação textual normalizada de um valor, igual entre drivers diferentes"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).hex()
+    if isinstance(value, Decimal):
+        return format(value.normalize(), "f")
+    if isinstance(value, float):
+        return repr(value)
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, timedelta):
+        return str(value.total_seconds())
+    return str(value)
 
 
 class DatabaseAdapter(ABC):
     """Interface base para adaptadores de banco de dados"""
     
+    # Estratégia de carga padrão, suportada por todos os adaptadores
+    LOAD_STRATEGY_INSERT = "insert"
+    
+    # Algoritmo do checksum calculado no servidor; só é comparável entre adaptadores com o mesmo valor
+    CHECKSUM_ALGORITHM: Optional[str] = None
+    
+    # Amostragem das chaves para os pontos de corte das faixas: filtro aleatório (fração em :sample_fraction)
+    # e tamanho da amostra por parte
+    SAMPLE_PREDICATE = "RANDOM() < :sample_fraction"
+    KEY_SAMPLES_PER_PART = 100
+    
     def __init__(self, engine: Engine, database_name: str):
         self.engine = engine
         self.database_name = database_name
+        # Contagens exatas: consultas em paralelo, tempo limite e validade do cache (ver configure_row_counts)
+        self.row_count_workers = 8
+        self.row_count_timeout_seconds = 30.0
+        self.row_count_cache_ttl_seconds = 300.0
+        self._row_count_cache: Dict[str, Tuple[int, float]] = {}
+        self._row_count_lock = threading.Lock()
+        # Perfis de carga em massa ativos, por tabela de destino
+        self._bulk_profiles: Dict[str, Dict[str, Any]] = {}
     
     @abstractmethod
     def test_connection(self) -> bool:
@@ -16,12 +74,12 @@ class DatabaseAdapter(ABC):
         pass
     
     @abstractmethod
-    def get_tables_info(self, sort_by_dependencies: bool = False) -> List[Dict[str, Any]]:
-        """Obtém informações das tabelas do banco"""
+    def get_tables_info(self, sort_by_dependencies: bool = False, count_strategy: str = COUNT_EXACT) -> List[Dict[str, Any]]:
+        """Obtém informações das tabelas do banco (contagem de registros conforme count_strategy)"""
         pass
     
     @abstractmethod
-    def get_database_summary(self, sort_by_dependencies: bool = False) -> Dict[str, Any]:
+    def get_database_summary(self, sort_by_dependencies: bool = False, count_strategy: str = COUNT_EXACT) -> Dict[str, Any]:
         """Obtém um resumo do banco de dados"""
         pass
     
@@ -40,6 +98,271 @@ class DatabaseAdapter(ABC):
         """Obtém os dados da tabela"""
         pass
     
+    @abstractmethod
+    def iter_table_data(self, table_name: str, batch_size: int = 1000, key_column: Optional[str] = None,
+                        lower: Any = None, upper: Any = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Lê os dados da tabela em lotes de tamanho fixo usando cursor no servidor
+        key_column/lower/upper: restringe a leitura à faixa lower <= key_column < upper (None = sem limite)
+        """
+        pass
+    
+    @abstractmethod
+    def get_primary_key_columns(self, table_name: str) -> List[str]:
+        """Obtém as colunas da chave primária da tabela, na ordem da chave"""
+        pass
+    
+    def quote_identifier(self, identifier: str) -> str:
+        """Delimita um identificador (tabela ou coluna) para uso em SQL"""
+        return '"' + identifier.replace('"', '""') + '"'
+    
+    def _build_range_filter(self, key_column: Optional[str], lower: Any = None, upper: Any = None) -> Tuple[str, Dict[str, Any]]:
+        """Monta a cláusula WHERE de uma faixa de chave (lower <= chave < upper)"""
+        if not key_column:
+            return "", {}
+        
+        conditions = []
+        params = {}
+        key = self.quote_identifier(key_column)
+        if lower is not None:
+            conditions.append(f"{key} >= :range_lower")
+            params["range_lower"] = lower
+        if upper is not None:
+            conditions.append(f"{key} < :range_upper")
+            params["range_upper"] = upper
+        
+        if not conditions:
+            return "", {}
+        return " WHERE " + " AND ".join(conditions), params
+    
+    def estimate_row_count(self, table_name: str) -> int:
+        """Obtém uma estimativa do número de registros da tabela"""
+        with self.engine.connect() as conn:
+            return int(conn.execute(text(f"SELECT COUNT(*) FROM {self.quote_identifier(table_name)}")).scalar() or 0)
+    
+    def count_rows(self, table_name: str, timeout_seconds: Optional[float] = None) -> int:
+        """Conta os registros da tabela com COUNT(*); timeout_seconds limita a consulta no servidor, quando suportado"""
+        with self.engine.connect() as conn:
+            return int(conn.execute(text(f"SELECT COUNT(*) FROM {self.quote_identifier(table_name)}")).scalar() or 0)
+    
+    def configure_row_counts(self, workers: int, timeout_seconds: float, cache_ttl_seconds: float):
+        """Define paralelismo, tempo limite e validade do cache das contagens exatas"""
+        self.row_count_workers = max(1, workers)
+        self.row_count_timeout_seconds = timeout_seconds
+        self.row_count_cache_ttl_seconds = cache_ttl_seconds
+    
+    def invalidate_row_counts(self, table_name: Optional[str] = None):
+        """Descarta contagens em cache (de uma tabela ou de todas)"""
+        with self._row_count_lock:
+            if table_name is None:
+                self._row_count_cache.clear()
+            else:
+                self._row_count_cache.pop(table_name, None)
+    
+    def apply_row_counts(self, tables_info: List[Dict[str, Any]], strategy: str) -> List[Dict[str, Any]]:
+        """
+        Preenche row_count e count_kind de cada tabela a partir da estimativa do catálogo (chave 'estimated_rows')
+        'estimated' usa só a estimativa; 'exact' executa COUNT(*) em paralelo, com tempo limite;
+        'cached' reaproveita contagens exatas mais novas que o TTL e conta as demais
+        Tabelas cuja contagem exata falha ou estoura o tempo ficam com a estimativa
+        """
+        if strategy not in COUNT_STRATEGIES:
+            raise ValueError(f"Estratégia de contagem '{strategy}' inválida. Estratégias suportadas: {', '.join(COUNT_STRATEGIES)}")
+        
+        for table in tables_info:
+            table["row_count"] = max(int(table.pop("estimated_rows", None) or 0), 0)
+            table["count_kind"] = COUNT_ESTIMATED
+            table["count_age_seconds"] = None
+        if strategy == COUNT_ESTIMATED:
+            return tables_info
+        
+        pending = tables_info
+        if strategy == COUNT_CACHED:
+            now = monotonic()
+            pending = []
+            with self._row_count_lock:
+                for table in tables_info:
+                    cached = self._row_count_cache.get(table["table_name"])
+                    if cached and now - cached[1] <= self.row_count_cache_ttl_seconds:
+                        table["row_count"] = cached[0]
+                        table["count_kind"] = COUNT_CACHED
+                        table["count_age_seconds"] = round(now - cached[1], 1)
+                    else:
+                        pending.append(table)
+        if not pending:
+            return tables_info
+        
+        timeout = self.row_count_timeout_seconds
+        workers = min(self.row_count_workers, len(pending))
+        # O limite do servidor vale por COUNT(*); com mais tabelas que workers elas contam em ondas sucessivas
+        deadline = math.ceil(len(pending) / workers) * timeout + 5 if timeout else None
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="row-count")
+        try:
+            futures = {pool.submit(self.count_rows, table["table_name"], timeout): table for table in pending}
+            # Margem sobre o limite do servidor; contagens ainda em andamento depois disso são abandonadas
+            done, not_done = wait(futures, timeout=deadline)
+            for future in done:
+                table = futures[future]
+                try:
+                    count = future.result()
+                except Exception as e:
+                    logger.warning(f"Contagem exata da tabela '{table['table_name']}' falhou; usando estimativa: {e}")
+                    continue
+                table["row_count"] = count
+                table["count_kind"] = COUNT_EXACT
+                table["count_age_seconds"] = 0.0 if strategy == COUNT_CACHED else None
+                with self._row_count_lock:
+                    self._row_count_cache[table["table_name"]] = (count, monotonic())
+            if not_done:
+                logger.warning(f"{len(not_done)} contagens exatas não terminaram em {deadline}s; usando estimativas")
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+        return tables_info
+    
+    def get_key_bounds(self, table_name: str, key_column: str, lower: Any = None, upper: Any = None) -> Tuple[Any, Any]:
+        """Obtém os valores mínimo e máximo de uma coluna de chave (opcionalmente dentro da faixa [lower, upper))"""
+        key = self.quote_identifier(key_column)
+        where, params = self._build_range_filter(key_column, lower, upper)
+        with self.engine.connect() as conn:
+            row = conn.execute(text(f"SELECT MIN({key}), MAX({key}) FROM {self.quote_identifier(table_name)}{where}"), params).fetchone()
+            return row[0], row[1]
+    
+    def get_key_boundaries(self, table_name: str, key_column: str, parts: int, lower: Any = None, upper: Any = None,
+                           total: Optional[int] = None) -> List[Any]:
+        """
+        Obtém pontos de corte amostrados que dividem a tabela (ou a faixa [lower, upper)) em partes de tamanho semelhante
+        Uma única passada ordenada pela chave, com o filtro aleatório no servidor: só a amostra é transferida
+        total: registros da faixa, se já conhecidos; sem ele, usa a estimativa do catálogo (tabela inteira)
+        ou lê todas as chaves da faixa
+        """
+        if parts < 2:
+            return []
+        if total is None and lower is None and upper is None:
+            total = self.estimate_row_count(table_name)
+        if total is not None and total < parts:
+            return []
+        
+        where, params = self._build_range_filter(key_column, lower, upper)
+        fraction = min(1.0, parts * self.KEY_SAMPLES_PER_PART / total) if total else 1.0
+        if fraction < 1.0:
+            where += (" AND " if where else " WHERE ") + self.SAMPLE_PREDICATE
+            params["sample_fraction"] = fraction
+        
+        # A ordem vem do banco (mesma collation dos filtros das faixas), não de uma ordenação no cliente
+        key = self.quote_identifier(key_column)
+        query = f"SELECT {key} FROM {self.quote_identifier(table_name)}{where} ORDER BY {key}"
+        with self.engine.connect() as conn:
+            result = conn.execution_options(stream_results=True).execute(text(query), params)
+            sample = [row[0] for row in result if row[0] is not None]
+        if len(sample) < parts:
+            return []
+        
+        boundaries = []
+        for i in range(1, parts):
+            value = sample[len(sample) * i // parts]
+            if not boundaries or value != boundaries[-1]:
+                boundaries.append(value)
+        return boundaries
+    
+    def iter_key_values(self, table_name: str, key_columns: List[str], batch_size: int = 10000,
+                        range_column: Optional[str] = None, lower: Any = None, upper: Any = None) -> Iterator[List[Tuple]]:
+        """Lê apenas as colunas de chave da tabela (opcionalmente dentro de uma faixa), em lotes de tuplas"""
+        where, params = self._build_range_filter(range_column, lower, upper)
+        columns = ", ".join(self.quote_identifier(col) for col in key_columns)
+        with self.engine.connect() as conn:
+            result = conn.execution_options(stream_results=True, max_row_buffer=batch_size).execute(
+                text(f"SELECT {columns} FROM {self.quote_identifier(table_name)}{where}"),
+                params
+            )
+            for partition in result.partitions(batch_size):
+                yield [tuple(row) for row in partition]
+    
+    def get_column_names(self, table_name: str) -> List[str]:
+        """Obtém os nomes das colunas da tabela, na ordem da tabela"""
+        with self.engine.connect() as conn:
+            result = conn.execute(text(f"SELECT * FROM {self.quote_identifier(table_name)} WHERE 1 = 0"))
+            return list(result.keys())
+    
+    def get_chunk_checksum(self, table_name: str, columns: List[str], key_column: str,
+                           lower: Any = None, upper: Any = None) -> Tuple[int, int]:
+        """
+        Calcula (quantidade de registros, checksum agregado) da faixa lower <= key_column < upper
+        Adaptadores com CHECKSUM_ALGORITHM calculam no servidor; o padrão calcula no cliente
+        """
+        return self.compute_chunk_checksum(table_name, columns, key_column, lower, upper)
+    
+    def compute_chunk_checksum(self, table_name: str, columns: List[str], key_column: str,
+                               lower: Any = None, upper: Any = None, batch_size: int = 5000) -> Tuple[int, int]:
+        """
+        Calcula o checksum da faixa no cliente (XOR do CRC32 de cada registro normalizado)
+        O resultado é comparável entre bancos de tipos diferentes
+        """
+        count = 0
+        checksum = 0
+        for batch in self.iter_table_data(table_name, batch_size=batch_size, key_column=key_column, lower=lower, upper=upper):
+            for row in batch:
+                payload = "\x1f".join(_checksum_text(row.get(col)) for col in columns)
+                checksum ^= zlib.crc32(payload.encode("utf-8"))
+                count += 1
+        return count, checksum
+    
+    def delete_range(self, table_name: str, key_column: str, lower: Any = None, upper: Any = None) -> int:
+        """Remove os registros da faixa lower <= key_column < upper e retorna quantos foram removidos"""
+        where, params = self._build_range_filter(key_column, lower, upper)
+        with self.engine.connect() as conn:
+            result = conn.execute(text(f"DELETE FROM {self.quote_identifier(table_name)}{where}"), params)
+            conn.commit()
+            return result.rowcount
+    
+    def delete_rows(self, table_name: str, key_columns: List[str], keys: List[Dict[str, Any]], chunk_size: int = 500,
+                    conn=None) -> int:
+        """
+        Remove os registros identificados pelos valores das colunas de chave e retorna quantos foram removidos
+        conn: conexão de uma transação aberta com transaction() (a confirmação fica com quem a abriu)
+        """
+        if not keys:
+            return 0
+        if conn is None:
+            with self.transaction() as conn:
+                return self.delete_rows(table_name, key_columns, keys, chunk_size, conn)
+        
+        quoted = [self.quote_identifier(col) for col in key_columns]
+        deleted = 0
+        for start in range(0, len(keys), chunk_size):
+            conditions = []
+            params = {}
+            for i, key in enumerate(keys[start:start + chunk_size]):
+                parts = []
+                for j, col in enumerate(key_columns):
+                    params[f"k{i}_{j}"] = key[col]
+                    parts.append(f"{quoted[j]} = :k{i}_{j}")
+                conditions.append("(" + " AND ".join(parts) + ")")
+            result = conn.execute(
+                text(f"DELETE FROM {self.quote_identifier(table_name)} WHERE " + " OR ".join(conditions)),
+                params
+            )
+            deleted += result.rowcount
+        return deleted
+    
+    @contextmanager
+    def transaction(self):
+        """
+        Conexão com uma única transação para várias gravações (ex: um lote da replicação)
+        Confirmada ao sair do bloco sem erro; desfeita por inteiro se houver exceção
+        """
+        with self.engine.connect() as conn:
+            self._begin_transaction(conn)
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+    
+    def _begin_transaction(self, conn):
+        """Inicia a transação na conexão (o driver abre uma implicitamente no primeiro comando)"""
+        pass
+    
     @abstractmethod
     def create_table(self, table_name: str, structure_sql: str) -> bool:
         """Cria uma tabela no banco de destino"""
@@ -50,6 +373,136 @@ class DatabaseAdapter(ABC):
         """Insere dados na tabela"""
         pass
     
+    def get_dependency_graph(self, table_names: List[str]) -> Dict[str, List[str]]:
+        """Obtém, para cada tabela, as tabelas das quais ela depende (foreign keys)"""
+        return {table_name: [] for table_name in table_names}
+    
+    def _sort_tables_by_dependencies(self, tables_info: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Ordena tabelas por dependências (tabelas pai primeiro; tabelas em ciclo ficam juntas)"""
+        try:
+            table_names = [table['table_name'] for table in tables_info]
+            plan = plan_load_order(table_names, self.get_dependency_graph(table_names))
+            if plan["cycle_groups"]:
+                logger.warning(f"Ciclos de dependências detectados: {plan['cycle_groups']}")
+            
+            table_dict = {table['table_name']: table for table in tables_info}
+            ordered_tables = [table_dict[table_name] for table_name in plan["order"]]
+            logger.info(f"Tabelas ordenadas por dependências: {len(ordered_tables)} tabelas")
+            return ordered_tables
+        except Exception as e:
+            logger.error(f"Erro ao ordenar tabelas por dependências: {e}")
+            # Em caso de erro, retorna ordem alfabética
+            return sorted(tables_info, key=lambda x: x['table_name'])
+    
+    def get_load_strategies(self) -> List[str]:
+        """Retorna as estratégias de carga suportadas pelo adaptador"""
+        return [self.LOAD_STRATEGY_INSERT]
+    
+    def load_data(self, table_name: str, data: List[Dict[str, Any]], strategy: str = LOAD_STRATEGY_INSERT) -> bool:
+        """Carrega um lote de dados na tabela usando a estratégia informada"""
+        if strategy == self.LOAD_STRATEGY_INSERT:
+            return self.insert_data(table_name, data)
+        raise ValueError(f"Estratégia de carga '{strategy}' não suportada. Estratégias suportadas: {', '.join(self.get_load_strategies())}")
+    
+    def get_bulk_load_settings(self, options: Dict[str, bool]) -> Dict[str, str]:
+        """
+        Converte as opções do perfil de carga em massa em configurações de sessão do banco
+        options: unique_checks, foreign_key_checks, binlog, synchronous_commit (True = desativar)
+        """
+        return {}
+    
+    def _get_session_setting(self, conn, name: str) -> str:
+        return str(conn.execute(text(f"SHOW {name}")).scalar())
+    
+    def _set_session_setting(self, conn, name: str, value: str):
+        conn.execute(text(f"SET {name} = {value}"))
+    
+    @contextmanager
+    def bulk_load_profile(self, table_name: str, session_settings: Dict[str, str]):
+        """
+        Ativa o perfil de carga em massa para as gravações na tabela
+        Cada conexão de carga recebe as configurações e volta aos valores anteriores antes de retornar ao pool
+        """
+        profile = {"settings": dict(session_settings), "previous": {}}
+        self._bulk_profiles[table_name] = profile
+        try:
+            yield profile
+        finally:
+            self._bulk_profiles.pop(table_name, None)
+    
+    @contextmanager
+    def _load_connection(self, table_name: str):
+        """Conexão usada para gravar na tabela, com o perfil de carga em massa aplicado se estiver ativo"""
+        profile = self._bulk_profiles.get(table_name)
+        with self.engine.connect() as conn:
+            if not profile or not profile["settings"]:
+                yield conn
+                return
+            
+            previous = {name: self._get_session_setting(conn, name) for name in profile["settings"]}
+            for name, value in profile["settings"].items():
+                self._set_session_setting(conn, name, value)
+            conn.commit()
+            for name, value in previous.items():
+                profile["previous"].setdefault(name, value)
+            
+            try:
+                yield conn
+            finally:
+                conn.rollback()
+                for name, value in previous.items():
+                    self._set_session_setting(conn, name, value)
+                conn.commit()
+    
+    @abstractmethod
+    def upsert_data(self, table_name: str, data: List[Dict[str, Any]], key_columns: List[str], conn=None) -> bool:
+        """
+        Insere ou atualiza dados na tabela, usando as colunas de chave para identificar registros existentes
+        conn: conexão de uma transação aberta com transaction(); sem ela, o lote é confirmado em transação própria
+        """
+        pass
+    
+    def rename_create_table_sql(self, create_table_sql: str, new_table_name: str) -> str:
+        """Troca o nome da tabela em um CREATE TABLE (ex: para criar uma tabela sombra)"""
+        return re.sub(
+            r"^(\s*CREATE\s+TABLE\s+)(?:`[^`]+`|\"[^\"]+\"|\S+)",
+            lambda match: match.group(1) + self.quote_identifier(new_table_name),
+            create_table_sql,
+            count=1,
+            flags=re.IGNORECASE
+        )
+    
+    def split_foreign_keys(self, create_table_sql: str) -> Tuple[str, List[str]]:
+        """Separa as foreign keys do CREATE TABLE, retornando (CREATE sem FKs, cláusulas para ALTER TABLE ADD)"""
+        return create_table_sql, []
+    
+    def split_deferred_definitions(self, create_table_sql: str) -> Tuple[str, List[str], List[str]]:
+        """
+        Separa do CREATE TABLE o que pode ser criado depois da carga (perfil de carga rápida)
+        Retorna (CREATE só com a chave primária, índices secundários, foreign keys)
+        """
+        create_table_sql, foreign_keys = self.split_foreign_keys(create_table_sql)
+        return create_table_sql, [], foreign_keys
+    
+    def add_table_definitions(self, table_name: str, clauses: List[str]):
+        """Adiciona índices e constraints a uma tabela existente em um único ALTER TABLE"""
+        if not clauses:
+            return
+        with self.engine.connect() as conn:
+            conn.execute(text(f"ALTER TABLE {self.quote_identifier(table_name)} " + ", ".join(f"ADD {clause}" for clause in clauses)))
+            conn.commit()
+    
+    def get_referencing_tables(self, table_name: str) -> List[str]:
+        """Obtém as outras tabelas com foreign keys apontando para esta tabela"""
+        return []
+    
+    def swap_tables(self, table_name: str, shadow_table: str, old_table: str):
+        """Troca a tabela pela tabela sombra em uma única transação (a atual passa a se chamar old_table)"""
+        with self.engine.connect() as conn:
+            conn.execute(text(f"ALTER TABLE {self.quote_identifier(table_name)} RENAME TO {self.quote_identifier(old_table)}"))
+            conn.execute(text(f"ALTER TABLE {self.quote_identifier(shadow_table)} RENAME TO {self.quote_identifier(table_name)}"))
+            conn.commit()
+    
     @abstractmethod
     def table_exists(self, table_name: str) -> bool:
         """Verifica se a tabela existe"""
@@ -1,15 +1,49 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterator, Optional, Tuple
 from sqlalchemy import text, create_engine
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.pool import NullPool
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time, timedelta
 import logging
-from .base_adapter import DatabaseAdapter
+import os
+import re
+import tempfile
+from .base_adapter import DatabaseAdapter, COUNT_EXACT
 
 logger = logging.getLogger(__name__)
 
+# Escapes do formato padrão do LOAD DATA (FIELDS ESCAPED BY '\\')
+_TSV_ESCAPES = {
+    ord("\\"): b"\\\\",
+    ord("\t"): b"\\t",
+    ord("\n"): b"\\n",
+    ord("\r"): b"\\r",
+    0: b"\\0",
+}
+
 
 class MySQLAdapter(DatabaseAdapter):
     """Adaptador específico para MySQL"""
     
+    # Margem reservada no pacote para o cabeçalho do protocolo
+    PACKET_HEADROOM_BYTES = 1024
+    
+    # Carga via LOAD DATA LOCAL INFILE (requer local_infile habilitado no cliente e no servidor)
+    LOAD_STRATEGY_LOAD_DATA = "load_data"
+    
+    CHECKSUM_ALGORITHM = "mysql_crc32"
+    SAMPLE_PREDICATE = "RAND() < :sample_fraction"
+    
+    # Charsets testados na primeira conexão, em ordem de preferência (utf8 é o mais compatível com bancos legados)
+    CHARSETS = ['utf8', 'utf8mb4', 'latin1']
+    DEFAULT_CHARSET = 'utf8'
+    # Erros de charset/collation recusados (ER_UNKNOWN_CHARACTER_SET, ER_UNKNOWN_COLLATION, CR_CANT_READ_CHARSET)
+    CHARSET_ERROR_CODES = (1115, 1273, 2019)
+    
+    def __init__(self, engine, database_name: str):
+        super().__init__(engine, database_name)
+        self._max_allowed_packet = None
+    
     def test_connection(self) -> bool:
         """Testa a conexão com o banco MySQL"""
         try:
@@ -20,7 +54,7 @@ class MySQLAdapter(DatabaseAdapter):
             logger.error(f"Erro ao testar conexão MySQL: {e}")
             return False
     
-    def get_tables_info(self, sort_by_dependencies: bool = False) -> List[Dict[str, Any]]:
+    def get_tables_info(self, sort_by_dependencies: bool = False, count_strategy: str = COUNT_EXACT) -> List[Dict[str, Any]]:
         """Obtém informações das tabelas do MySQL"""
         try:
             with self.engine.connect() as conn:
@@ -28,6 +62,7 @@ class MySQLAdapter(DatabaseAdapter):
                 query = """
                 SELECT 
                     t.TABLE_NAME as table_name,
+                    t.TABLE_ROWS as estimated_rows,
                     ROUND(((t.DATA_LENGTH + t.INDEX_LENGTH) / 1024 / 1024), 2) as size_mb,
                     t.DATA_LENGTH as data_length,
                     t.INDEX_LENGTH as index_length
@@ -40,32 +75,79 @@ class MySQLAdapter(DatabaseAdapter):
                 
                 tables_info = []
                 for row in result:
-                    # Obtém a contagem exata de registros para cada tabela
-                    count_query = f"SELECT COUNT(*) as row_count FROM `{row.table_name}`"
-                    count_result = conn.execute(text(count_query))
-                    exact_row_count = count_result.fetchone()[0]
-                    
                     tables_info.append({
                         "table_name": row.table_name,
-                        "row_count": exact_row_count,
+                        "estimated_rows": row.estimated_rows,
                         "size_mb": float(row.size_mb or 0),
                         "data_length": row.data_length or 0,
                         "index_length": row.index_length or 0
                     })
-                
-                # Se solicitado, ordena por dependências
-                if sort_by_dependencies:
-                    tables_info = self._sort_tables_by_dependencies(tables_info)
-                
-                return tables_info
+            
+            # Contagens (exatas em paralelo, em conexões próprias) fora da conexão do catálogo
+            tables_info = self.apply_row_counts(tables_info, count_strategy)
+            
+            # Se solicitado, ordena por dependências
+            if sort_by_dependencies:
+                tables_info = self._sort_tables_by_dependencies(tables_info)
+            
+            return tables_info
                 
         except Exception as e:
             logger.error(f"Erro ao obter informações das tabelas MySQL: {e}")
             raise
     
-    def get_database_summary(self, sort_by_dependencies: bool = False) -> Dict[str, Any]:
+    def quote_identifier(self, identifier: str) -> str:
+        """Delimita um identificador MySQL com crases"""
+        return "`" + identifier.replace("`", "``") + "`"
+    
+    def count_rows(self, table_name: str, timeout_seconds: Optional[float] = None) -> int:
+        """Conta os registros da tabela MySQL; o tempo limite é aplicado pelo servidor (MAX_EXECUTION_TIME)"""
+        hint = f"/*+ MAX_EXECUTION_TIME({int(timeout_seconds * 1000)}) */ " if timeout_seconds else ""
+        with self.engine.connect() as conn:
+            return int(conn.execute(text(f"SELECT {hint}COUNT(*) FROM {self.quote_identifier(table_name)}")).scalar() or 0)
+    
+    def estimate_row_count(self, table_name: str) -> int:
+        """Obtém a estimativa de registros do InnoDB (information_schema.TABLES.TABLE_ROWS)"""
+        with self.engine.connect() as conn:
+            result = conn.execute(
+                text("SELECT TABLE_ROWS FROM information_schema.TABLES WHERE TABLE_SCHEMA = :db AND TABLE_NAME = :table"),
+                {"db": self.database_name, "table": table_name}
+            )
+            return int(result.scalar() or 0)
+    
+    def get_primary_key_columns(self, table_name: str) -> List[str]:
+        """Obtém as colunas da chave primária da tabela MySQL"""
+        try:
+            with self.engine.connect() as conn:
+                query = """
+                SELECT COLUMN_NAME
+                FROM information_schema.KEY_COLUMN_USAGE
+                WHERE TABLE_SCHEMA = :database_name
+                AND TABLE_NAME = :table_name
+                AND CONSTRAINT_NAME = 'PRIMARY'
+                ORDER BY ORDINAL_POSITION
+                """
+                result = conn.execute(text(query), {"database_name": self.database_name, "table_name": table_name})
+                return [row[0] for row in result]
+        except Exception as e:
+            logger.error(f"Erro ao obter chave primária da tabela MySQL {table_name}: {e}")
+            raise
+    
+    def get_binlog_position(self) -> Tuple[str, int]:
+        """Arquivo e posição atuais do binlog (SHOW BINARY LOG STATUS no MySQL 8.4+, SHOW MASTER STATUS antes)"""
+        with self.engine.connect() as conn:
+            try:
+                row = conn.execute(text("SHOW BINARY LOG STATUS")).first()
+            except SQLAlchemyError:
+                conn.rollback()
+                row = conn.execute(text("SHOW MASTER STATUS")).first()
+        if row is None:
+            raise ValueError("Binlog desabilitado no MySQL de origem (log_bin=OFF)")
+        return row[0], int(row[1])
+    
+    def get_database_summary(self, sort_by_dependencies: bool = False, count_strategy: str = COUNT_EXACT) -> Dict[str, Any]:
         """Obtém um resumo do banco MySQL"""
-        tables_info = self.get_tables_info(sort_by_dependencies=sort_by_dependencies)
+        tables_info = self.get_tables_info(sort_by_dependencies=sort_by_dependencies, count_strategy=count_strategy)
         
         total_tables = len(tables_info)
         total_rows = sum(table['row_count'] for table in tables_info)
@@ -77,35 +159,64 @@ class MySQLAdapter(DatabaseAdapter):
             "total_tables": total_tables,
             "total_rows": total_rows,
             "total_size_mb": round(total_size_mb, 2),
+            "count_strategy": count_strategy,
             "tables": tables_info
         }
     
-    def get_connection_url(self, user: str, password: str, host: str, port: int, database: str) -> str:
+    def get_connection_url(self, user: str, password: str, host: str, port: int, database: str,
+                           charset: str = DEFAULT_CHARSET) -> str:
         """Retorna a URL de conexão MySQL"""
-        # Usa charset mais compatível para bancos reais
-        return f"mysql+pymysql://{user}:{password}@{host}:{port}/{database}?charset=utf8&autocommit=true"
+        return f"mysql+pymysql://{user}:{password}@{host}:{port}/{database}?charset={charset}&autocommit=true"
     
-    def get_connection_url_with_fallback(self, user: str, password: str, host: str, port: int, database: str) -> str:
-        """Retorna a URL de conexão MySQL com fallback de charset"""
-        # Lista de charsets para tentar em ordem de preferência
-        charsets = ['utf8', 'utf8mb4', 'latin1']
-        
-        for charset in charsets:
+    def negotiate_charset(self, user: str, password: str, host: str, port: int, database: str,
+                          timeout_seconds: float = 10.0) -> Optional[str]:
+        """
+        Testa os charsets em paralelo e retorna o primeiro, na ordem de preferência, que conectou (None se nenhum conectou)
+        Com o banco lento ou fora do ar, a espera é de um único connect_timeout, não de um por charset
+        """
+        def probe(charset: str):
+            test_engine = create_engine(
+                self.get_connection_url(user, password, host, port, database, charset=charset),
+                poolclass=NullPool,
+                # connect_timeout só cobre o TCP; read_timeout limita também o handshake
+                connect_args={"connect_timeout": timeout_seconds, "read_timeout": timeout_seconds},
+                echo=False
+            )
             try:
-                url = f"mysql+pymysql://{user}:{password}@{host}:{port}/{database}?charset={charset}&autocommit=true"
-                # Testa a conexão
-                test_engine = create_engine(url, pool_pre_ping=True, echo=False)
                 with test_engine.connect() as conn:
                     conn.execute(text("SELECT 1"))
-                logger.info(f"Charset {charset} funcionou para {host}:{port}/{database}")
-                return url
-            except Exception as e:
-                logger.warning(f"Charset {charset} falhou para {host}:{port}/{database}: {e}")
-                continue
+            finally:
+                test_engine.dispose()
         
-        # Se nenhum charset funcionar, usa utf8 como padrão
-        logger.warning(f"Usando charset utf8 como fallback para {host}:{port}/{database}")
-        return f"mysql+pymysql://{user}:{password}@{host}:{port}/{database}?charset=utf8&autocommit=true"
+        pool = ThreadPoolExecutor(max_workers=len(self.CHARSETS), thread_name_prefix="charset-probe")
+        try:
+            futures = [(charset, pool.submit(probe, charset)) for charset in self.CHARSETS]
+            for charset, future in futures:
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.warning(f"Charset {charset} falhou para {host}:{port}/{database}: {e}")
+                    continue
+                logger.info(f"Charset {charset} funcionou para {host}:{port}/{database}")
+                return charset
+            return None
+        finally:
+            # Testes ainda em andamento de charsets menos preferidos não são esperados
+            pool.shutdown(wait=False, cancel_futures=True)
+    
+    def is_charset_error(self, error: BaseException) -> bool:
+        """Indica se o erro do driver é de charset recusado pelo servidor (charset gravado em cache não serve mais)"""
+        args = getattr(error, "args", ())
+        return bool(args) and args[0] in self.CHARSET_ERROR_CODES
+    
+    def get_connection_url_with_fallback(self, user: str, password: str, host: str, port: int, database: str) -> str:
+        """Retorna a URL de conexão MySQL com fallback de charset"""
+        charset = self.negotiate_charset(user, password, host, port, database)
+        if charset is None:
+            # Se nenhum charset funcionar, usa utf8 como padrão
+            logger.warning(f"Usando charset {self.DEFAULT_CHARSET} como fallback para {host}:{port}/{database}")
+            charset = self.DEFAULT_CHARSET
+        return self.get_connection_url(user, password, host, port, database, charset=charset)
     
     def get_table_structure(self, table_name: str, remove_foreign_keys: bool = True) -> Dict[str, Any]:
         """Obtém a estrutura da tabela MySQL (SHOW CREATE TABLE)"""
@@ -182,96 +293,100 @@ class MySQLAdapter(DatabaseAdapter):
         logger.info("Foreign keys removidas e charset/engine ajustados do CREATE TABLE")
         return create_table_sql
     
-    def _get_table_dependencies(self, table_name: str) -> List[str]:
-        """Obtém as dependências (foreign keys) de uma tabela"""
-        try:
-            with self.engine.connect() as conn:
-                query = """
-                SELECT 
-                    REFERENCED_TABLE_NAME
-                FROM information_schema.KEY_COLUMN_USAGE 
-                WHERE TABLE_SCHEMA = :database_name 
-                AND TABLE_NAME = :table_name 
-                AND REFERENCED_TABLE_NAME IS NOT NULL
-                """
-                
-                result = conn.execute(text(query), {
-                    "database_name": self.database_name,
-                    "table_name": table_name
-                })
-                
-                dependencies = []
-                for row in result:
-                    if row[0] and row[0] not in dependencies:
-                        dependencies.append(row[0])
-                
-                return dependencies
-                
-        except Exception as e:
-            logger.error(f"Erro ao obter dependências da tabela {table_name}: {e}")
-            return []
+    def _extract_definitions(self, create_table_sql: str, predicate) -> Tuple[str, List[str]]:
+        """Remove do SHOW CREATE TABLE (uma definição por linha) as definições aceitas pelo predicado"""
+        kept = []
+        extracted = []
+        for line in create_table_sql.split("\n"):
+            definition = line.strip().rstrip(",")
+            if predicate(definition):
+                extracted.append(definition)
+            else:
+                kept.append(line)
+        
+        # A última definição antes do ")" final não pode terminar com vírgula
+        for i in range(len(kept) - 1, 0, -1):
+            if kept[i].lstrip().startswith(")"):
+                kept[i - 1] = kept[i - 1].rstrip().rstrip(",")
+                break
+        return "\n".join(kept), extracted
     
-    def _sort_tables_by_dependencies(self, tables_info: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Ordena tabelas por dependências usando topological sort"""
-        try:
-            # Cria grafo de dependências
-            dependencies = {}
-            table_names = [table['table_name'] for table in tables_info]
-            
-            for table_name in table_names:
-                deps = self._get_table_dependencies(table_name)
-                dependencies[table_name] = deps
-            
-            # Topological sort
-            sorted_tables = []
-            visited = set()
-            temp_visited = set()
-            
-            def visit(table_name):
-                if table_name in temp_visited:
-                    # Ciclo detectado - retorna tabelas em ordem alfabética
-                    logger.warning(f"Ciclo de dependências detectado para {table_name}")
-                    return sorted(table_names)
-                
-                if table_name in visited:
-                    return
-                
-                temp_visited.add(table_name)
-                
-                # Visita dependências primeiro
-                for dep in dependencies.get(table_name, []):
-                    if dep in table_names:  # Só considera dependências que existem
-                        visit(dep)
-                
-                temp_visited.remove(table_name)
-                visited.add(table_name)
-                sorted_tables.append(table_name)
-            
-            # Visita todas as tabelas
-            for table_name in table_names:
-                if table_name not in visited:
-                    visit(table_name)
-            
-            # Reorganiza tables_info na ordem ordenada
-            table_dict = {table['table_name']: table for table in tables_info}
-            ordered_tables = []
-            
-            for table_name in sorted_tables:
-                if table_name in table_dict:
-                    ordered_tables.append(table_dict[table_name])
-            
-            # Adiciona tabelas que não foram processadas (se houver)
-            for table in tables_info:
-                if table['table_name'] not in sorted_tables:
-                    ordered_tables.append(table)
-            
-            logger.info(f"Tabelas ordenadas por dependências: {len(ordered_tables)} tabelas")
-            return ordered_tables
-            
-        except Exception as e:
-            logger.error(f"Erro ao ordenar tabelas por dependências: {e}")
-            # Em caso de erro, retorna ordem alfabética
-            return sorted(tables_info, key=lambda x: x['table_name'])
+    def split_foreign_keys(self, create_table_sql: str) -> Tuple[str, List[str]]:
+        """Separa as linhas CONSTRAINT ... FOREIGN KEY do SHOW CREATE TABLE"""
+        return self._extract_definitions(
+            create_table_sql,
+            lambda definition: re.match(r"CONSTRAINT\s+`[^`]+`\s+FOREIGN\s+KEY", definition, re.IGNORECASE) is not None
+        )
+    
+    def split_deferred_definitions(self, create_table_sql: str) -> Tuple[str, List[str], List[str]]:
+        """Separa foreign keys e índices secundários (KEY, UNIQUE, FULLTEXT, SPATIAL) do SHOW CREATE TABLE"""
+        create_table_sql, foreign_keys = self.split_foreign_keys(create_table_sql)
+        
+        # Uma coluna AUTO_INCREMENT precisa ser a primeira de algum índice já no CREATE TABLE
+        auto_increment = re.search(r"^\s*`([^`]+)`[^\n]*\bAUTO_INCREMENT\b", create_table_sql, re.MULTILINE | re.IGNORECASE)
+        auto_increment_key = re.compile(r"[^(]*\(\s*`" + re.escape(auto_increment.group(1)) + "`") if auto_increment else None
+        
+        def is_deferred(definition: str) -> bool:
+            if not re.match(r"(UNIQUE\s+|FULLTEXT\s+|SPATIAL\s+)?(KEY|INDEX)\s", definition, re.IGNORECASE):
+                return False
+            return not (auto_increment_key and auto_increment_key.match(definition))
+        
+        create_table_sql, indexes = self._extract_definitions(create_table_sql, is_deferred)
+        return create_table_sql, indexes, foreign_keys
+    
+    def add_table_definitions(self, table_name: str, clauses: List[str]):
+        """Adiciona índices e foreign keys em um único ALTER TABLE, sem revalidar as FKs (dados já consistentes na origem)"""
+        if not clauses:
+            return
+        
+        # O InnoDB só cria um índice FULLTEXT por ALTER TABLE: os demais vão em comandos separados
+        fulltext = [clause for clause in clauses if clause.upper().startswith("FULLTEXT")]
+        statements = [[clause for clause in clauses if clause not in fulltext[1:]]] + [[clause] for clause in fulltext[1:]]
+        with self.engine.connect() as conn:
+            # Com FOREIGN_KEY_CHECKS = 0 o InnoDB adiciona as FKs in-place, sem copiar a tabela
+            conn.execute(text("SET FOREIGN_KEY_CHECKS = 0"))
+            try:
+                for statement in statements:
+                    conn.execute(text(f"ALTER TABLE `{table_name}` " + ", ".join(f"ADD {clause}" for clause in statement)))
+            finally:
+                conn.execute(text("SET FOREIGN_KEY_CHECKS = 1"))
+            conn.commit()
+    
+    def get_referencing_tables(self, table_name: str) -> List[str]:
+        """Obtém as tabelas MySQL com foreign keys apontando para esta tabela"""
+        with self.engine.connect() as conn:
+            query = """
+            SELECT DISTINCT TABLE_NAME
+            FROM information_schema.KEY_COLUMN_USAGE
+            WHERE REFERENCED_TABLE_SCHEMA = :database_name
+            AND REFERENCED_TABLE_NAME = :table_name
+            AND TABLE_NAME <> :table_name
+            """
+            result = conn.execute(text(query), {"database_name": self.database_name, "table_name": table_name})
+            return [row[0] for row in result]
+    
+    def swap_tables(self, table_name: str, shadow_table: str, old_table: str):
+        """Troca a tabela pela tabela sombra com um único RENAME TABLE (atômico no MySQL)"""
+        with self.engine.connect() as conn:
+            conn.execute(text(f"RENAME TABLE `{table_name}` TO `{old_table}`, `{shadow_table}` TO `{table_name}`"))
+            conn.commit()
+    
+    def get_dependency_graph(self, table_names: List[str]) -> Dict[str, List[str]]:
+        """Obtém, para cada tabela, as tabelas das quais ela depende (foreign keys), em uma única consulta"""
+        query = """
+        SELECT DISTINCT TABLE_NAME, REFERENCED_TABLE_NAME
+        FROM information_schema.KEY_COLUMN_USAGE
+        WHERE TABLE_SCHEMA = :database_name
+        AND REFERENCED_TABLE_SCHEMA = :database_name
+        AND REFERENCED_TABLE_NAME IS NOT NULL
+        ORDER BY TABLE_NAME, REFERENCED_TABLE_NAME
+        """
+        graph = {table_name: [] for table_name in table_names}
+        with self.engine.connect() as conn:
+            for row in conn.execute(text(query), {"database_name": self.database_name}):
+                if row[0] in graph and row[1] not in graph[row[0]]:
+                    graph[row[0]].append(row[1])
+        return graph
     
     def get_table_data(self, table_name: str, limit: int = None) -> List[Dict[str, Any]]:
         """Obtém os dados da tabela MySQL"""
@@ -301,6 +416,39 @@ class MySQLAdapter(DatabaseAdapter):
             logger.error(f"Erro ao obter dados da tabela MySQL {table_name}: {e}")
             raise
     
+    def iter_table_data(self, table_name: str, batch_size: int = 1000, key_column: Optional[str] = None,
+                        lower: Any = None, upper: Any = None) -> Iterator[List[Dict[str, Any]]]:
+        """Lê os dados da tabela MySQL em lotes usando SSCursor (stream_results)"""
+        try:
+            where, params = self._build_range_filter(key_column, lower, upper)
+            with self.engine.connect() as conn:
+                # stream_results faz o PyMySQL usar SSCursor, sem carregar o resultado inteiro na memória
+                result = conn.execution_options(
+                    stream_results=True,
+                    max_row_buffer=batch_size
+                ).execute(text(f"SELECT * FROM `{table_name}`{where}"), params)
+                columns = list(result.keys())
+                
+                for partition in result.partitions(batch_size):
+                    yield [dict(zip(columns, row)) for row in partition]
+                
+        except Exception as e:
+            logger.error(f"Erro ao ler dados em lotes da tabela MySQL {table_name}: {e}")
+            raise
+    
+    def get_chunk_checksum(self, table_name: str, columns: List[str], key_column: str,
+                           lower: Any = None, upper: Any = None) -> Tuple[int, int]:
+        """Calcula (registros, BIT_XOR(CRC32(...))) da faixa no servidor MySQL, sem transferir os registros"""
+        quoted = [self.quote_identifier(col) for col in columns]
+        # CONCAT_WS ignora NULLs: os marcadores ISNULL distinguem NULL de string vazia
+        null_flags = "CONCAT(" + ", ".join(f"ISNULL({col})" for col in quoted) + ")"
+        row_hash = f"CRC32(CONCAT_WS('#', {', '.join(quoted)}, {null_flags}))"
+        where, params = self._build_range_filter(key_column, lower, upper)
+        query = f"SELECT COUNT(*), COALESCE(BIT_XOR({row_hash}), 0) FROM `{table_name}`{where}"
+        with self.engine.connect() as conn:
+            row = conn.execute(text(query), params).fetchone()
+            return int(row[0]), int(row[1])
+    
     def create_table(self, table_name: str, structure_sql: str) -> bool:
         """Cria uma tabela no banco MySQL"""
         try:
@@ -314,33 +462,248 @@ class MySQLAdapter(DatabaseAdapter):
             return False
     
     def insert_data(self, table_name: str, data: List[Dict[str, Any]]) -> bool:
-        """Insere dados na tabela MySQL"""
+        """Insere dados na tabela MySQL usando INSERT multi-linha limitado pelo max_allowed_packet"""
         if not data:
             return True
         
         try:
-            with self.engine.connect() as conn:
-                # Obtém nomes das colunas do primeiro registro
-                columns = list(data[0].keys())
-                
-                # Constrói query de INSERT
-                placeholders = ", ".join([f":{col}" for col in columns])
-                columns_str = ", ".join([f"`{col}`" for col in columns])
-                query = f"INSERT INTO `{table_name}` ({columns_str}) VALUES ({placeholders})"
+            statements = self._execute_multirow_inserts(table_name, data)
+            logger.info(f"{len(data)} registros inseridos na tabela '{table_name}' em {statements} INSERT(s)")
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao inserir dados na tabela MySQL {table_name}: {e}")
+            return False
+    
+    def upsert_data(self, table_name: str, data: List[Dict[str, Any]], key_columns: List[str], conn=None) -> bool:
+        """Insere ou atualiza dados na tabela MySQL (INSERT ... ON DUPLICATE KEY UPDATE)"""
+        if not data:
+            return True
+        
+        try:
+            columns = list(data[0].keys())
+            # Se todas as colunas são chave, a atualização vira uma atribuição neutra
+            update_columns = [col for col in columns if col not in key_columns] or key_columns[:1]
+            suffix = " ON DUPLICATE KEY UPDATE " + ", ".join(
+                f"`{col}` = VALUES(`{col}`)" for col in update_columns
+            )
+            statements = self._execute_multirow_inserts(table_name, data, suffix, conn=conn)
+            logger.info(f"{len(data)} registros inseridos/atualizados na tabela '{table_name}' em {statements} INSERT(s)")
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao inserir/atualizar dados na tabela MySQL {table_name}: {e}")
+            return False
+    
+    def get_bulk_load_settings(self, options: Dict[str, bool]) -> Dict[str, str]:
+        """Configurações de sessão MySQL do perfil de carga em massa"""
+        session_settings = {}
+        if options.get("unique_checks"):
+            session_settings["unique_checks"] = "0"
+        if options.get("foreign_key_checks"):
+            session_settings["foreign_key_checks"] = "0"
+        if options.get("binlog"):
+            # Requer privilégio SYSTEM_VARIABLES_ADMIN (ou SUPER); a carga não é replicada para réplicas
+            session_settings["sql_log_bin"] = "0"
+        return session_settings
+    
+    def _get_session_setting(self, conn, name: str) -> str:
+        return str(conn.execute(text(f"SELECT @@SESSION.{name}")).scalar())
+    
+    def _set_session_setting(self, conn, name: str, value: str):
+        conn.execute(text(f"SET SESSION {name} = {value}"))
+    
+    def _begin_transaction(self, conn):
+        # BEGIN explícito: com autocommit na URL, cada comando seria confirmado separadamente
+        conn.connection.dbapi_connection.begin()
+    
+    def _execute_multirow_inserts(self, table_name: str, data: List[Dict[str, Any]], suffix: str = "", conn=None) -> int:
+        """
+        Executa o lote como INSERTs multi-linha em uma única transação e retorna o número de comandos enviados
+        Com conn (transação aberta com transaction()), os comandos entram nela sem confirmação
+        """
+        if conn is not None:
+            return self._send_multirow_inserts(conn, table_name, data, suffix)
+        
+        with self._load_connection(table_name) as conn:
+            dbapi_conn = conn.connection.dbapi_connection
+            self._begin_transaction(conn)
+            try:
+                statements = self._send_multirow_inserts(conn, table_name, data, suffix)
+                dbapi_conn.commit()
+            except Exception:
+                dbapi_conn.rollback()
+                raise
+            
+            return statements
+    
+    def _send_multirow_inserts(self, conn, table_name: str, data: List[Dict[str, Any]], suffix: str = "") -> int:
+        # Obtém nomes das colunas do primeiro registro
+        columns = list(data[0].keys())
+        columns_str = ", ".join([f"`{col}`" for col in columns])
+        prefix = f"INSERT INTO `{table_name}` ({columns_str}) VALUES "
+        
+        max_bytes = self._get_insert_packet_limit(conn)
+        dbapi_conn = conn.connection.dbapi_connection
+        
+        # Usa o cursor do driver diretamente: o SQL já vem com os valores escapados
+        cursor = dbapi_conn.cursor()
+        try:
+            statements = 0
+            for statement in self._build_multirow_inserts(dbapi_conn, prefix, columns, data, max_bytes, suffix):
+                cursor.execute(statement)
+                statements += 1
+        finally:
+            cursor.close()
+        
+        return statements
+    
+    def _get_insert_packet_limit(self, conn) -> int:
+        """Obtém o tamanho máximo (em bytes) de um INSERT, respeitando o max_allowed_packet do servidor e do cliente"""
+        if self._max_allowed_packet is None:
+            server_limit = int(conn.execute(text("SELECT @@max_allowed_packet")).scalar())
+            client_limit = getattr(conn.connection.dbapi_connection, "max_allowed_packet", server_limit)
+            self._max_allowed_packet = min(server_limit, client_limit)
+            logger.info(f"max_allowed_packet efetivo para INSERTs: {self._max_allowed_packet} bytes")
+        
+        # Reserva uma margem para o cabeçalho do pacote
+        return self._max_allowed_packet - self.PACKET_HEADROOM_BYTES
+    
+    def _build_multirow_inserts(self, dbapi_conn, prefix: str, columns: List[str], data: List[Dict[str, Any]],
+                                max_bytes: int, suffix: str = "") -> Iterator[str]:
+        """Agrupa as linhas em INSERTs multi-linha cujo tamanho codificado não ultrapassa max_bytes"""
+        encoding = dbapi_conn.encoding
+        # O sufixo (ex: ON DUPLICATE KEY UPDATE) entra no tamanho de todo comando
+        prefix_bytes = len(prefix.encode(encoding)) + len(suffix.encode(encoding))
+        
+        values = []
+        size = prefix_bytes
+        for row in data:
+            # escape() usa os mesmos conversores do driver (NULL, _binary'...', datas, decimais)
+            row_sql = "(" + ",".join(dbapi_conn.escape(row[col]) for col in columns) + ")"
+            row_bytes = len(row_sql.encode(encoding, "surrogateescape")) + 1  # +1 pela vírgula
+            
+            # Fecha o INSERT atual se a próxima linha estouraria o pacote
+            if values and size + row_bytes > max_bytes:
+                yield prefix + ",".join(values) + suffix
+                values = []
+                size = prefix_bytes
+            
+            values.append(row_sql)
+            size += row_bytes
+        
+        if values:
+            yield prefix + ",".join(values) + suffix
+    
+    def get_load_strategies(self) -> List[str]:
+        """Retorna as estratégias de carga suportadas pelo MySQL"""
+        return [self.LOAD_STRATEGY_INSERT, self.LOAD_STRATEGY_LOAD_DATA]
+    
+    def load_data(self, table_name: str, data: List[Dict[str, Any]], strategy: str = DatabaseAdapter.LOAD_STRATEGY_INSERT) -> bool:
+        """Carrega um lote de dados na tabela MySQL usando a estratégia informada"""
+        if strategy == self.LOAD_STRATEGY_LOAD_DATA:
+            return self.load_data_infile(table_name, data)
+        return super().load_data(table_name, data, strategy)
+    
+    def load_data_infile(self, table_name: str, data: List[Dict[str, Any]]) -> bool:
+        """Carrega um lote na tabela MySQL via LOAD DATA LOCAL INFILE a partir de um TSV temporário"""
+        if not data:
+            return True
+        
+        columns = list(data[0].keys())
+        # Colunas binárias vão em hexadecimal e são convertidas com UNHEX, sem passar pela conversão de charset
+        binary_columns = {col for col in columns if any(isinstance(row[col], (bytes, bytearray)) for row in data)}
+        
+        fd, path = tempfile.mkstemp(prefix=f"load_{table_name}_", suffix=".tsv")
+        try:
+            with os.fdopen(fd, "wb") as tsv_file:
+                for row in data:
+                    fields = [self._encode_tsv_value(row[col], col in binary_columns) for col in columns]
+                    tsv_file.write(b"\t".join(fields) + b"\n")
+            
+            with self._load_connection(table_name) as conn:
+                dbapi_conn = conn.connection.dbapi_connection
                 
-                # Executa INSERT em lotes
-                batch_size = 1000
-                for i in range(0, len(data), batch_size):
-                    batch = data[i:i + batch_size]
-                    conn.execute(text(query), batch)
+                targets = []
+                assignments = []
+                for col in columns:
+                    if col in binary_columns:
+                        targets.append(f"@`{col}`")
+                        assignments.append(f"`{col}` = UNHEX(@`{col}`)")
+                    else:
+                        targets.append(f"`{col}`")
                 
-                conn.commit()
-                logger.info(f"{len(data)} registros inseridos na tabela '{table_name}'")
-                return True
+                query = (
+                    f"LOAD DATA LOCAL INFILE {dbapi_conn.escape(path)} INTO TABLE `{table_name}` "
+                    f"CHARACTER SET utf8mb4 "
+                    f"FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' "
+                    f"LINES TERMINATED BY '\\n' "
+                    f"({', '.join(targets)})"
+                )
+                if assignments:
+                    query += f" SET {', '.join(assignments)}"
                 
+                # Com LOCAL, chave duplicada e erros de conversão viram warnings em vez de abortar a carga:
+                # o lote é carregado em transação e desfeito se faltar registro ou houver warning
+                dbapi_conn.autocommit(False)
+                cursor = dbapi_conn.cursor()
+                try:
+                    loaded = cursor.execute(query)
+                    problems = []
+                    if cursor.warning_count:
+                        cursor.execute("SHOW WARNINGS")
+                        problems = [row for row in cursor.fetchall() if row[0] != "Note"]
+                    if loaded != len(data) or problems:
+                        dbapi_conn.rollback()
+                        details = "; ".join(f"{row[1]}: {row[2]}" for row in problems[:5])
+                        logger.error(
+                            f"LOAD DATA na tabela '{table_name}' carregou {loaded} de {len(data)} registros "
+                            f"com {len(problems)} warnings; lote desfeito. {details}"
+                        )
+                        return False
+                    dbapi_conn.commit()
+                except Exception:
+                    dbapi_conn.rollback()
+                    raise
+                finally:
+                    cursor.close()
+                    dbapi_conn.autocommit(True)
+            
+            logger.info(f"{loaded} registros carregados via LOAD DATA na tabela '{table_name}'")
+            return True
+            
         except Exception as e:
-            logger.error(f"Erro ao inserir dados na tabela MySQL {table_name}: {e}")
+            logger.error(f"Erro ao carregar dados via LOAD DATA na tabela MySQL {table_name}: {e}")
             return False
+        finally:
+            os.remove(path)
+    
+    def _encode_tsv_value(self, value: Any, as_hex: bool = False) -> bytes:
+        """Codifica um valor no formato de campo do LOAD DATA (utf8mb4, NULL como \\N)"""
+        if value is None:
+            return b"\\N"
+        if as_hex:
+            return bytes(value).hex().encode("ascii")
+        if isinstance(value, bool):
+            return b"1" if value else b"0"
+        if isinstance(value, (bytes, bytearray)):
+            raw = bytes(value)
+        elif isinstance(value, datetime):
+            raw = value.isoformat(sep=" ").encode("ascii")
+        elif isinstance(value, (date, time)):
+            raw = value.isoformat().encode("ascii")
+        elif isinstance(value, timedelta):
+            # Colunas TIME chegam como timedelta e podem passar de 24h ou ser negativas
+            seconds = int(value.total_seconds())
+            sign = "-" if seconds < 0 else ""
+            seconds = abs(seconds)
+            raw = f"{sign}{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}".encode("ascii")
+        elif isinstance(value, (set, frozenset)):
+            raw = ",".join(sorted(value)).encode("utf-8")
+        else:
+            raw = str(value).encode("utf-8")
+        
+        if not any(byte in _TSV_ESCAPES for byte in raw):
+            return raw
+        return b"".join(_TSV_ESCAPES.get(byte, bytes((byte,))) for byte in raw)
     
     def table_exists(self, table_name: str) -> bool:
         """Verifica se a tabela existe no MySQL"""
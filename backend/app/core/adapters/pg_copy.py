@@ -0,0 +1,235 @@
+from typing import Dict, List, Any, Optional, Tuple
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+import json
+import struct
+import uuid
+
+# Época usada pelo formato binário do PostgreSQL
+PG_EPOCH_DATE = date(2000, 1, 1)
+PG_EPOCH_DATETIME = datetime(2000, 1, 1)
+PG_EPOCH_DATETIME_UTC = datetime(2000, 1, 1, tzinfo=timezone.utc)
+
+BINARY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+BINARY_TRAILER = struct.pack(">h", -1)
+
+# Escapes do formato text do COPY
+_TEXT_ESCAPES = str.maketrans({
+    "\\": "\\\\",
+    "\n": "\\n",
+    "\r": "\\r",
+    "\t": "\\t",
+})
+
+
+class CopyEncodingError(TypeError):
+    """Valor ou tipo que não pode ser representado no formato COPY escolhido"""
+    pass
+
+
+def _text_scalar(value: Any) -> str:
+    """Converte um valor Python na representação textual de entrada do PostgreSQL"""
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return "\\x" + bytes(value).hex()
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, timedelta):
+        return f"{value.days} days {value.seconds} seconds {value.microseconds} microseconds"
+    if isinstance(value, (dict,)):
+        return json.dumps(value)
+    if isinstance(value, (int, float, Decimal, str, uuid.UUID)):
+        return str(value)
+    raise CopyEncodingError(f"Tipo {type(value).__name__} não suportado pelo COPY text")
+
+
+def _text_array(values: List[Any]) -> str:
+    """Converte uma lista (possivelmente aninhada) em literal de array do PostgreSQL"""
+    elements = []
+    for item in values:
+        if item is None:
+            elements.append("NULL")
+        elif isinstance(item, (list, tuple)):
+            elements.append(_text_array(list(item)))
+        else:
+            element = _text_scalar(item)
+            elements.append('"' + element.replace("\\", "\\\\").replace('"', '\\"') + '"')
+    return "{" + ",".join(elements) + "}"
+
+
+def encode_text_value(value: Any, type_name: Optional[str] = None, element_type: Optional[str] = None) -> str:
+    """
+    Codifica um campo no formato text do COPY (NULL como \\N)
+    Com o tipo da coluna, listas viram JSON em colunas json/jsonb e literal de array só em colunas array
+    """
+    if value is None:
+        return "\\N"
+    if type_name in ("json", "jsonb") and not isinstance(value, str):
+        text_value = json.dumps(value)
+    elif isinstance(value, (list, tuple)):
+        if type_name is not None and not element_type:
+            raise CopyEncodingError(f"Lista em coluna do tipo {type_name} não suportada pelo COPY text")
+        text_value = _text_array(list(value))
+    else:
+        text_value = _text_scalar(value)
+    return text_value.translate(_TEXT_ESCAPES)
+
+
+def encode_text_rows(columns: List[str], data: List[Dict[str, Any]], encoding: str = "utf-8",
+                     column_types: Optional[Dict[str, Tuple[str, Optional[str], int]]] = None) -> bytes:
+    """Codifica um lote inteiro no formato text do COPY (column_types como em encode_binary_rows)"""
+    types = [column_types.get(col, (None, None, 0))[:2] if column_types else (None, None) for col in columns]
+    lines = []
+    for row in data:
+        lines.append("\t".join(
+            encode_text_value(row[col], type_name, element_type) for col, (type_name, element_type) in zip(columns, types)
+        ))
+    return ("\n".join(lines) + "\n").encode(encoding)
+
+
+def _binary_numeric(value: Any) -> bytes:
+    """Codifica um numeric no formato binário (dígitos em base 10000)"""
+    value = Decimal(value)
+    if value.is_nan():
+        return struct.pack(">hhHH", 0, 0, 0xC000, 0)
+    if value.is_infinite():
+        raise CopyEncodingError("numeric infinito não suportado pelo COPY binary")
+
+    sign, digits, exponent = value.as_tuple()
+    digit_str = "".join(str(d) for d in digits)
+    dscale = max(0, -exponent)
+
+    if exponent >= 0:
+        int_part, frac_part = digit_str + "0" * exponent, ""
+    else:
+        digit_str = digit_str.rjust(-exponent, "0")
+        int_part, frac_part = digit_str[:exponent], digit_str[exponent:]
+
+    int_part = int_part.lstrip("0")
+    int_part = int_part.rjust((len(int_part) + 3) // 4 * 4, "0")
+    frac_part = frac_part.ljust((len(frac_part) + 3) // 4 * 4, "0")
+
+    groups = [int(int_part[i:i + 4]) for i in range(0, len(int_part), 4)]
+    weight = len(groups) - 1
+    groups += [int(frac_part[i:i + 4]) for i in range(0, len(frac_part), 4)]
+
+    # Remove grupos zerados das pontas (o peso acompanha os zeros à esquerda)
+    while groups and groups[0] == 0:
+        groups.pop(0)
+        weight -= 1
+    while groups and groups[-1] == 0:
+        groups.pop()
+    if not groups:
+        weight = 0
+
+    header = struct.pack(">hhHH", len(groups), weight, 0x4000 if sign else 0x0000, dscale)
+    return header + b"".join(struct.pack(">H", g) for g in groups)
+
+
+def _binary_timestamp(value: datetime) -> bytes:
+    delta = value.replace(tzinfo=None) - PG_EPOCH_DATETIME
+    return struct.pack(">q", (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds)
+
+
+def _binary_timestamptz(value: datetime) -> bytes:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    delta = value - PG_EPOCH_DATETIME_UTC
+    return struct.pack(">q", (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds)
+
+
+def _binary_time(value: time) -> bytes:
+    return struct.pack(">q", ((value.hour * 60 + value.minute) * 60 + value.second) * 1000000 + value.microsecond)
+
+
+def _binary_interval(value: timedelta) -> bytes:
+    return struct.pack(">qii", value.seconds * 1000000 + value.microseconds, value.days, 0)
+
+
+# Encoders por nome de tipo (pg_type.typname); tipos textuais são tratados à parte pela codificação
+_BINARY_ENCODERS = {
+    "bool": lambda v: b"\x01" if v else b"\x00",
+    "int2": lambda v: struct.pack(">h", v),
+    "int4": lambda v: struct.pack(">i", v),
+    "int8": lambda v: struct.pack(">q", v),
+    "float4": lambda v: struct.pack(">f", v),
+    "float8": lambda v: struct.pack(">d", v),
+    "numeric": _binary_numeric,
+    "bytea": lambda v: bytes(v),
+    "date": lambda v: struct.pack(">i", (v - PG_EPOCH_DATE).days),
+    "timestamp": _binary_timestamp,
+    "timestamptz": _binary_timestamptz,
+    "time": _binary_time,
+    "interval": _binary_interval,
+    "uuid": lambda v: uuid.UUID(str(v)).bytes,
+}
+
+_BINARY_TEXT_TYPES = {"text", "varchar", "bpchar", "name", "json", "jsonb"}
+
+
+def binary_supported(type_name: str, element_type: Optional[str] = None) -> bool:
+    """Indica se o tipo (ou o elemento do array) pode ser enviado no formato binary"""
+    if element_type:
+        return element_type in _BINARY_ENCODERS or element_type in _BINARY_TEXT_TYPES
+    return type_name in _BINARY_ENCODERS or type_name in _BINARY_TEXT_TYPES
+
+
+def _binary_scalar(value: Any, type_name: str, encoding: str) -> bytes:
+    if type_name in _BINARY_TEXT_TYPES:
+        if type_name in ("json", "jsonb") and not isinstance(value, str):
+            value = json.dumps(value)
+        elif isinstance(value, (list, tuple, dict)):
+            raise CopyEncodingError(f"Valor {type(value).__name__} em coluna do tipo {type_name} não suportado pelo COPY binary")
+        payload = str(value).encode(encoding)
+        # jsonb binário é prefixado pelo número da versão do formato
+        return b"\x01" + payload if type_name == "jsonb" else payload
+    try:
+        return _BINARY_ENCODERS[type_name](value)
+    except (struct.error, TypeError, ValueError, AttributeError) as e:
+        raise CopyEncodingError(f"Valor {value!r} inválido para o tipo {type_name}: {e}")
+
+
+def _binary_array(values: Any, element_type: str, element_oid: int, encoding: str) -> bytes:
+    """Codifica um array unidimensional no formato binário"""
+    values = list(values)
+    if any(isinstance(item, (list, tuple)) for item in values):
+        raise CopyEncodingError("Arrays multidimensionais não suportados pelo COPY binary")
+
+    has_null = any(item is None for item in values)
+    parts = [struct.pack(">iiiii", 1, 1 if has_null else 0, element_oid, len(values), 1)]
+    for item in values:
+        if item is None:
+            parts.append(struct.pack(">i", -1))
+        else:
+            encoded = _binary_scalar(item, element_type, encoding)
+            parts.append(struct.pack(">i", len(encoded)) + encoded)
+    return b"".join(parts)
+
+
+def encode_binary_rows(columns: List[str], column_types: Dict[str, Tuple[str, Optional[str], int]],
+                       data: List[Dict[str, Any]], encoding: str = "utf-8") -> bytes:
+    """
+    Codifica um lote no formato binary do COPY
+
+    column_types: {coluna: (typname, typname do elemento se for array, oid do elemento)}
+    """
+    parts = [BINARY_HEADER]
+    field_count = struct.pack(">h", len(columns))
+    for row in data:
+        parts.append(field_count)
+        for col in columns:
+            value = row[col]
+            if value is None:
+                parts.append(struct.pack(">i", -1))
+                continue
+            type_name, element_type, element_oid = column_types[col]
+            if element_type:
+                encoded = _binary_array(value, element_type, element_oid, encoding)
+            else:
+                encoded = _binary_scalar(value, type_name, encoding)
+            parts.append(struct.pack(">i", len(encoded)) + encoded)
+    parts.append(BINARY_TRAILER)
+    return b"".join(parts)
@@ -1,8 +1,12 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterator, Optional, Tuple
 from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
+import io
 import logging
-from .base_adapter import DatabaseAdapter
+import psycopg2.extensions
+import psycopg2.extras
+from .base_adapter import DatabaseAdapter, COUNT_EXACT
+from .pg_copy import CopyEncodingError, binary_supported, encode_binary_rows, encode_text_rows
 
 logger = logging.getLogger(__name__)
 
@@ -10,6 +14,12 @@ logger = logging.getLogger(__name__)
 class PostgreSQLAdapter(DatabaseAdapter):
     """Adaptador específico para PostgreSQL"""
     
+    # Carga via COPY ... FROM STDIN nos formatos text e binary
+    LOAD_STRATEGY_COPY = "copy"
+    LOAD_STRATEGY_COPY_BINARY = "copy_binary"
+    
+    CHECKSUM_ALGORITHM = "postgresql_md5"
+    
     def test_connection(self) -> bool:
         """Testa a conexão com o banco PostgreSQL"""
         try:
@@ -20,7 +30,7 @@ class PostgreSQLAdapter(DatabaseAdapter):
             logger.error(f"Erro ao testar conexão PostgreSQL: {e}")
             return False
     
-    def get_tables_info(self, sort_by_dependencies: bool = False) -> List[Dict[str, Any]]:
+    def get_tables_info(self, sort_by_dependencies: bool = False, count_strategy: str = COUNT_EXACT) -> List[Dict[str, Any]]:
         """Obtém informações das tabelas do PostgreSQL"""
         try:
             with self.engine.connect() as conn:
@@ -28,6 +38,7 @@ class PostgreSQLAdapter(DatabaseAdapter):
                 query = """
                 SELECT 
                     t.table_name,
+                    c.reltuples as estimated_rows,
                     ROUND(
                         (pg_total_relation_size(c.oid) / 1024.0 / 1024.0), 2
                     ) as size_mb,
@@ -46,28 +57,68 @@ class PostgreSQLAdapter(DatabaseAdapter):
                 
                 tables_info = []
                 for row in result:
-                    # Obtém a contagem exata de registros para cada tabela
-                    count_query = f"SELECT COUNT(*) as row_count FROM \"{row.table_name}\""
-                    count_result = conn.execute(text(count_query))
-                    exact_row_count = count_result.fetchone()[0]
-                    
                     tables_info.append({
                         "table_name": row.table_name,
-                        "row_count": exact_row_count,
+                        # reltuples é -1 em tabelas nunca analisadas (PostgreSQL 14+)
+                        "estimated_rows": row.estimated_rows,
                         "size_mb": float(row.size_mb or 0),
                         "data_length": row.data_length or 0,
                         "index_length": row.index_length or 0
                     })
-                
-                return tables_info
+            
+            # Contagens (exatas em paralelo, em conexões próprias) fora da conexão do catálogo
+            tables_info = self.apply_row_counts(tables_info, count_strategy)
+            
+            # Se solicitado, ordena por dependências
+            if sort_by_dependencies:
+                tables_info = self._sort_tables_by_dependencies(tables_info)
+            
+            return tables_info
                 
         except Exception as e:
             logger.error(f"Erro ao obter informações das tabelas PostgreSQL: {e}")
             raise
     
-    def get_database_summary(self, sort_by_dependencies: bool = False) -> Dict[str, Any]:
+    def count_rows(self, table_name: str, timeout_seconds: Optional[float] = None) -> int:
+        """Conta os registros da tabela PostgreSQL; o tempo limite é aplicado pelo servidor (statement_timeout)"""
+        with self.engine.connect() as conn:
+            if timeout_seconds:
+                # SET LOCAL vale só para a transação atual, descartada ao devolver a conexão ao pool
+                conn.execute(text(f"SET LOCAL statement_timeout = {int(timeout_seconds * 1000)}"))
+            return int(conn.execute(text(f"SELECT COUNT(*) FROM {self.quote_identifier(table_name)}")).scalar() or 0)
+    
+    def estimate_row_count(self, table_name: str) -> int:
+        """Obtém a estimativa de registros do planner (pg_class.reltuples)"""
+        with self.engine.connect() as conn:
+            result = conn.execute(
+                text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:table_name)"),
+                {"table_name": f'public."{table_name}"'}
+            )
+            # reltuples é -1 em tabelas nunca analisadas (PostgreSQL 14+)
+            return max(int(result.scalar() or 0), 0)
+    
+    def get_primary_key_columns(self, table_name: str) -> List[str]:
+        """Obtém as colunas da chave primária da tabela PostgreSQL"""
+        try:
+            with self.engine.connect() as conn:
+                query = """
+                SELECT a.attname
+                FROM pg_index i
+                JOIN LATERAL unnest(i.indkey) WITH ORDINALITY AS k(attnum, position) ON true
+                JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = k.attnum
+                WHERE i.indrelid = to_regclass(:table_name)
+                AND i.indisprimary
+                ORDER BY k.position
+                """
+                result = conn.execute(text(query), {"table_name": f'public."{table_name}"'})
+                return [row[0] for row in result]
+        except Exception as e:
+            logger.error(f"Erro ao obter chave primária da tabela PostgreSQL {table_name}: {e}")
+            raise
+    
+    def get_database_summary(self, sort_by_dependencies: bool = False, count_strategy: str = COUNT_EXACT) -> Dict[str, Any]:
         """Obtém um resumo do banco PostgreSQL"""
-        tables_info = self.get_tables_info()
+        tables_info = self.get_tables_info(sort_by_dependencies=sort_by_dependencies, count_strategy=count_strategy)
         
         total_tables = len(tables_info)
         total_rows = sum(table['row_count'] for table in tables_info)
@@ -79,6 +130,7 @@ class PostgreSQLAdapter(DatabaseAdapter):
             "total_tables": total_tables,
             "total_rows": total_rows,
             "total_size_mb": round(total_size_mb, 2),
+            "count_strategy": count_strategy,
             "tables": tables_info
         }
     
@@ -129,6 +181,11 @@ class PostgreSQLAdapter(DatabaseAdapter):
                         col_def += f" DEFAULT {col['column_default']}"
                     column_definitions.append(col_def)
                 
+                # Mantém a chave primária: necessária para ON CONFLICT nos modos de upsert
+                primary_key = self.get_primary_key_columns(table_name)
+                if primary_key:
+                    column_definitions.append(f"    PRIMARY KEY ({', '.join(primary_key)})")
+                
                 create_table_sql += ",\n".join(column_definitions)
                 create_table_sql += "\n);"
                 
@@ -170,6 +227,39 @@ class PostgreSQLAdapter(DatabaseAdapter):
             logger.error(f"Erro ao obter dados da tabela PostgreSQL {table_name}: {e}")
             raise
     
+    def iter_table_data(self, table_name: str, batch_size: int = 1000, key_column: Optional[str] = None,
+                        lower: Any = None, upper: Any = None) -> Iterator[List[Dict[str, Any]]]:
+        """Lê os dados da tabela PostgreSQL em lotes usando cursor nomeado (stream_results)"""
+        try:
+            where, params = self._build_range_filter(key_column, lower, upper)
+            with self.engine.connect() as conn:
+                # stream_results faz o psycopg2 usar um cursor nomeado (server-side)
+                result = conn.execution_options(
+                    stream_results=True,
+                    max_row_buffer=batch_size
+                ).execute(text(f'SELECT * FROM "{table_name}"{where}'), params)
+                columns = list(result.keys())
+                
+                for partition in result.partitions(batch_size):
+                    yield [dict(zip(columns, row)) for row in partition]
+                
+        except Exception as e:
+            logger.error(f"Erro ao ler dados em lotes da tabela PostgreSQL {table_name}: {e}")
+            raise
+    
+    def get_chunk_checksum(self, table_name: str, columns: List[str], key_column: str,
+                           lower: Any = None, upper: Any = None) -> Tuple[int, int]:
+        """Calcula (registros, soma dos 32 bits iniciais do MD5 de cada registro) da faixa no servidor PostgreSQL"""
+        quoted = [self.quote_identifier(col) for col in columns]
+        # CONCAT_WS ignora NULLs: os marcadores distinguem NULL de string vazia
+        null_flags = "CONCAT(" + ", ".join(f"({col} IS NULL)::int" for col in quoted) + ")"
+        row_hash = f"('x' || LEFT(MD5(CONCAT_WS('#', {', '.join(quoted)}, {null_flags})), 8))::bit(32)::bigint"
+        where, params = self._build_range_filter(key_column, lower, upper)
+        query = f'SELECT COUNT(*), COALESCE(SUM({row_hash}), 0) FROM "{table_name}"{where}'
+        with self.engine.connect() as conn:
+            row = conn.execute(text(query), params).fetchone()
+            return int(row[0]), int(row[1])
+    
     def create_table(self, table_name: str, structure_sql: str) -> bool:
         """Cria uma tabela no banco PostgreSQL"""
         try:
@@ -188,7 +278,7 @@ class PostgreSQLAdapter(DatabaseAdapter):
             return True
         
         try:
-            with self.engine.connect() as conn:
+            with self._load_connection(table_name) as conn:
                 # Obtém nomes das colunas do primeiro registro
                 columns = list(data[0].keys())
                 
@@ -211,6 +301,183 @@ class PostgreSQLAdapter(DatabaseAdapter):
             logger.error(f"Erro ao inserir dados na tabela PostgreSQL {table_name}: {e}")
             return False
     
+    def get_load_strategies(self) -> List[str]:
+        """Retorna as estratégias de carga suportadas pelo PostgreSQL"""
+        return [self.LOAD_STRATEGY_INSERT, self.LOAD_STRATEGY_COPY, self.LOAD_STRATEGY_COPY_BINARY]
+    
+    def load_data(self, table_name: str, data: List[Dict[str, Any]], strategy: str = DatabaseAdapter.LOAD_STRATEGY_INSERT) -> bool:
+        """Carrega um lote de dados na tabela PostgreSQL usando a estratégia informada"""
+        if strategy == self.LOAD_STRATEGY_COPY:
+            return self.copy_data(table_name, data, binary=False)
+        if strategy == self.LOAD_STRATEGY_COPY_BINARY:
+            return self.copy_data(table_name, data, binary=True)
+        return super().load_data(table_name, data, strategy)
+    
+    def copy_data(self, table_name: str, data: List[Dict[str, Any]], binary: bool = False) -> bool:
+        """
+        Carrega um lote na tabela PostgreSQL via COPY ... FROM STDIN (copy_expert)
+        Lotes que o COPY não representa ou que o servidor recusa são refeitos via INSERT, depois de devolver a conexão
+        do COPY ao pool (cada worker usa uma única conexão de carga por vez)
+        """
+        if not data:
+            return True
+        
+        columns = list(data[0].keys())
+        copy_format = "binary" if binary else "text"
+        fallback = None
+        
+        try:
+            with self._load_connection(table_name) as conn:
+                dbapi_conn = conn.connection.dbapi_connection
+                encoding = psycopg2.extensions.encodings.get(dbapi_conn.encoding, "utf-8")
+                
+                payload = None
+                try:
+                    # Tipos das colunas: json/jsonb e arrays são codificados conforme o destino
+                    column_types = self._get_copy_column_types(conn, table_name)
+                    if binary:
+                        unsupported = [
+                            col for col in columns
+                            if col not in column_types or not binary_supported(column_types[col][0], column_types[col][1])
+                        ]
+                        if unsupported:
+                            raise CopyEncodingError(f"Colunas com tipos não suportados pelo COPY binary: {', '.join(unsupported)}")
+                        payload = encode_binary_rows(columns, column_types, data, encoding)
+                    else:
+                        payload = encode_text_rows(columns, data, encoding, column_types)
+                except CopyEncodingError as e:
+                    # Tipos que o COPY não consegue representar seguem pelo caminho de INSERT
+                    fallback = f"COPY {copy_format} indisponível para a tabela '{table_name}', usando INSERT: {e}"
+                
+                if payload is not None:
+                    columns_str = ", ".join(self.quote_identifier(col) for col in columns)
+                    query = f"COPY {self.quote_identifier(table_name)} ({columns_str}) FROM STDIN WITH (FORMAT {copy_format})"
+                    
+                    cursor = dbapi_conn.cursor()
+                    try:
+                        cursor.copy_expert(query, io.BytesIO(payload))
+                        # Confirma na conexão do driver: o COPY não passa pelo controle de transação do SQLAlchemy
+                        dbapi_conn.commit()
+                    except psycopg2.DataError as e:
+                        # Valor recusado pelo servidor na conversão do COPY: o lote é refeito via INSERT (tipos pelo driver)
+                        dbapi_conn.rollback()
+                        fallback = f"COPY {copy_format} recusado na tabela '{table_name}', repetindo o lote via INSERT: {e}"
+                    finally:
+                        cursor.close()
+                
+        except Exception as e:
+            logger.error(f"Erro ao carregar dados via COPY na tabela PostgreSQL {table_name}: {e}")
+            return False
+        
+        if fallback is not None:
+            logger.warning(fallback)
+            return self.insert_data(table_name, data)
+        
+        logger.info(f"{len(data)} registros carregados via COPY {copy_format} na tabela '{table_name}'")
+        return True
+    
+    def _get_copy_column_types(self, conn, table_name: str) -> Dict[str, tuple]:
+        """Obtém (tipo, tipo do elemento, oid do elemento) de cada coluna para o COPY"""
+        query = """
+        SELECT 
+            a.attname,
+            t.typname,
+            et.typname AS element_type,
+            COALESCE(et.oid, 0) AS element_oid
+        FROM pg_attribute a
+        JOIN pg_type t ON t.oid = a.atttypid
+        LEFT JOIN pg_type et ON et.oid = t.typelem AND t.typcategory = 'A'
+        WHERE a.attrelid = to_regclass(:table_name)
+        AND a.attnum > 0
+        AND NOT a.attisdropped
+        """
+        result = conn.execute(text(query), {"table_name": f"public.{self.quote_identifier(table_name)}"})
+        return {row[0]: (row[1], row[2], int(row[3])) for row in result}
+    
+    def upsert_data(self, table_name: str, data: List[Dict[str, Any]], key_columns: List[str], conn=None) -> bool:
+        """Insere ou atualiza dados na tabela PostgreSQL (INSERT ... ON CONFLICT DO UPDATE)"""
+        if not data:
+            return True
+        
+        try:
+            if conn is not None:
+                # Transação aberta com transaction(): a confirmação fica com quem a abriu
+                self._execute_upsert(conn, table_name, data, key_columns)
+            else:
+                with self._load_connection(table_name) as conn:
+                    self._execute_upsert(conn, table_name, data, key_columns)
+                    conn.connection.dbapi_connection.commit()
+            logger.info(f"{len(data)} registros inseridos/atualizados na tabela '{table_name}'")
+            return True
+                
+        except Exception as e:
+            logger.error(f"Erro ao inserir/atualizar dados na tabela PostgreSQL {table_name}: {e}")
+            return False
+    
+    def _execute_upsert(self, conn, table_name: str, data: List[Dict[str, Any]], key_columns: List[str]):
+        columns = list(data[0].keys())
+        columns_str = ", ".join([f'"{col}"' for col in columns])
+        keys_str = ", ".join([f'"{col}"' for col in key_columns])
+        update_columns = [col for col in columns if col not in key_columns]
+        
+        query = f'INSERT INTO "{table_name}" ({columns_str}) VALUES %s ON CONFLICT ({keys_str}) '
+        if update_columns:
+            query += "DO UPDATE SET " + ", ".join(f'"{col}" = EXCLUDED."{col}"' for col in update_columns)
+        else:
+            query += "DO NOTHING"
+        
+        # execute_values envia INSERTs multi-linha em páginas, em vez de um comando por linha
+        cursor = conn.connection.dbapi_connection.cursor()
+        try:
+            psycopg2.extras.execute_values(
+                cursor,
+                query,
+                [tuple(row[col] for col in columns) for row in data],
+                page_size=1000
+            )
+        finally:
+            cursor.close()
+    
+    def get_bulk_load_settings(self, options: Dict[str, bool]) -> Dict[str, str]:
+        """Configurações de sessão PostgreSQL do perfil de carga em massa"""
+        session_settings = {}
+        if options.get("synchronous_commit"):
+            # O commit não espera o flush do WAL; uma queda pode perder só as últimas transações, sem corromper dados
+            session_settings["synchronous_commit"] = "off"
+        return session_settings
+    
+    def get_dependency_graph(self, table_names: List[str]) -> Dict[str, List[str]]:
+        """Obtém, para cada tabela, as tabelas das quais ela depende (foreign keys), em uma única consulta"""
+        query = """
+        SELECT DISTINCT child.relname, parent.relname
+        FROM pg_constraint c
+        JOIN pg_class child ON child.oid = c.conrelid
+        JOIN pg_class parent ON parent.oid = c.confrelid
+        JOIN pg_namespace n ON n.oid = child.relnamespace
+        WHERE c.contype = 'f'
+        AND n.nspname = 'public'
+        ORDER BY child.relname, parent.relname
+        """
+        graph = {table_name: [] for table_name in table_names}
+        with self.engine.connect() as conn:
+            for row in conn.execute(text(query)):
+                if row[0] in graph and row[1] not in graph[row[0]]:
+                    graph[row[0]].append(row[1])
+        return graph
+    
+    def get_referencing_tables(self, table_name: str) -> List[str]:
+        """Obtém as tabelas PostgreSQL com foreign keys apontando para esta tabela"""
+        with self.engine.connect() as conn:
+            query = """
+            SELECT DISTINCT c.conrelid::regclass::text
+            FROM pg_constraint c
+            WHERE c.contype = 'f'
+            AND c.confrelid = CAST(:table_name AS regclass)
+            AND c.conrelid <> c.confrelid
+            """
+            result = conn.execute(text(query), {"table_name": f'public."{table_name}"'})
+            return [row[0] for row in result]
+    
     def table_exists(self, table_name: str) -> bool:
         """Verifica se a tabela existe no PostgreSQL"""
         try:
@@ -0,0 +1,523 @@
+from typing import Dict, List, Any, Iterator, Optional, Tuple
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+import logging
+import re
+import sqlite3
+from decimal import Decimal
+from .base_adapter import DatabaseAdapter, COUNT_EXACT
+
+logger = logging.getLogger(__name__)
+
+# Identificador SQLite: "aspas duplas", `crases`, [colchetes] ou sem delimitador
+_IDENTIFIER = r'(?:"(?:[^"]|"")+"|`[^`]+`|\[[^\]]+\]|[^\s(]+)'
+_CREATE_INDEX = re.compile(
+    rf"^\s*CREATE\s+(UNIQUE\s+)?INDEX\s+(?:IF\s+NOT\s+EXISTS\s+)?({_IDENTIFIER})\s+ON\s+({_IDENTIFIER})\s*(\(.*)$",
+    re.IGNORECASE | re.DOTALL
+)
+# Cláusula REFERENCES de uma coluna, com ações e DEFERRABLE opcionais
+_COLUMN_REFERENCES = re.compile(
+    rf"\s+REFERENCES\s+{_IDENTIFIER}\s*(?:\([^)]*\))?"
+    r"(?:\s+ON\s+(?:DELETE|UPDATE)\s+(?:SET\s+NULL|SET\s+DEFAULT|CASCADE|RESTRICT|NO\s+ACTION))*"
+    r"(?:\s+MATCH\s+\w+)?(?:\s+(?:NOT\s+)?DEFERRABLE(?:\s+INITIALLY\s+(?:DEFERRED|IMMEDIATE))?)?",
+    re.IGNORECASE
+)
+
+
+def _to_sqlite_value(value: Any) -> Any:
+    """Decimal não tem adaptador no sqlite3: gravado como texto, sem perder precisão (colunas NUMERIC convertem)"""
+    return str(value) if isinstance(value, Decimal) else value
+
+
+def _unquote(identifier: str) -> str:
+    if identifier[:1] in ('"', '`', '[') and len(identifier) > 1:
+        return identifier[1:-1].replace('""', '"') if identifier[0] == '"' else identifier[1:-1]
+    return identifier
+
+
+def split_statements(sql: str) -> List[str]:
+    """Separa um script SQLite em comandos (ponto e vírgula dentro de strings e identificadores não separa)"""
+    statements = []
+    current = ""
+    for part in sql.split(";"):
+        current += part + ";"
+        if sqlite3.complete_statement(current):
+            statement = current.strip().rstrip(";").strip()
+            if statement:
+                statements.append(statement)
+            current = ""
+    if current.strip(" \n\t;"):
+        statements.append(current.strip().rstrip(";").strip())
+    return statements
+
+
+class SQLiteAdapter(DatabaseAdapter):
+    """
+    Adaptador para bancos SQLite em arquivo (sem servidor): origem ou destino leve, caches de borda e benchmarks locais
+    SOURCE_DB / DESTINATION_DB são os caminhos dos arquivos; usuário, senha, host e porta são ignorados
+    """
+    
+    # Espera pelo lock de escrita: escritores concorrentes (workers, faixas paralelas) se revezam em vez de falhar
+    BUSY_TIMEOUT_MS = 30000
+    
+    # RANDOM() do SQLite é um inteiro de 64 bits: normalizado para [0, 1)
+    SAMPLE_PREDICATE = "(RANDOM() / 18446744073709551616.0 + 0.5) < :sample_fraction"
+    
+    def __init__(self, engine: Engine, database_name: str):
+        super().__init__(engine, database_name)
+        if engine is not None:
+            event.listen(engine, "connect", self._configure_connection)
+    
+    @classmethod
+    def _configure_connection(cls, dbapi_connection, connection_record):
+        """Configura cada conexão nova do pool"""
+        cursor = dbapi_connection.cursor()
+        try:
+            # WAL: leituras continuam enquanto outra conexão grava
+            cursor.execute("PRAGMA journal_mode = WAL")
+            cursor.execute(f"PRAGMA busy_timeout = {cls.BUSY_TIMEOUT_MS}")
+            # Foreign keys declaradas, mas não verificadas durante a carga (padrão do SQLite): a ordem de carga não importa
+            cursor.execute("PRAGMA foreign_keys = OFF")
+        finally:
+            cursor.close()
+    
+    def test_connection(self) -> bool:
+        """Testa a conexão com o banco SQLite"""
+        try:
+            with self.engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                return True
+        except Exception as e:
+            logger.error(f"Erro ao testar conexão SQLite: {e}")
+            return False
+    
+    def _get_table_names(self, conn) -> List[str]:
+        result = conn.execute(text(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name"
+        ))
+        return [row[0] for row in result]
+    
+    def _get_page_usage(self, conn) -> Dict[str, int]:
+        """Bytes ocupados por tabela e por índice (tabela virtual dbstat; vazio se o SQLite foi compilado sem ela)"""
+        try:
+            return {row[0]: int(row[1] or 0) for row in conn.execute(text("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name"))}
+        except Exception:
+            return {}
+    
+    def get_tables_info(self, sort_by_dependencies: bool = False, count_strategy: str = COUNT_EXACT) -> List[Dict[str, Any]]:
+        """Obtém informações das tabelas do SQLite"""
+        try:
+            with self.engine.connect() as conn:
+                usage = self._get_page_usage(conn)
+                index_tables = {
+                    row[0]: row[1]
+                    for row in conn.execute(text("SELECT name, tbl_name FROM sqlite_master WHERE type = 'index'"))
+                }
+                
+                tables_info = []
+                for table_name in self._get_table_names(conn):
+                    data_length = usage.get(table_name, 0)
+                    index_length = sum(size for name, size in usage.items() if index_tables.get(name) == table_name)
+                    tables_info.append({
+                        "table_name": table_name,
+                        "estimated_rows": self._estimate_row_count(conn, table_name),
+                        "size_mb": round((data_length + index_length) / 1024 / 1024, 2),
+                        "data_length": data_length,
+                        "index_length": index_length
+                    })
+            
+            # Contagens (exatas em paralelo, em conexões próprias) fora da conexão do catálogo
+            tables_info = self.apply_row_counts(tables_info, count_strategy)
+            
+            # Se solicitado, ordena por dependências
+            if sort_by_dependencies:
+                tables_info = self._sort_tables_by_dependencies(tables_info)
+            
+            return tables_info
+        
+        except Exception as e:
+            logger.error(f"Erro ao obter informações das tabelas SQLite: {e}")
+            raise
+    
+    def _estimate_row_count(self, conn, table_name: str) -> int:
+        """
+        Estimativa sem varrer a tabela: sqlite_stat1 (gerada pelo ANALYZE) ou o maior rowid
+        O maior rowid é um limite superior (ignora registros removidos); tabelas WITHOUT ROWID sem estatísticas ficam com 0
+        """
+        try:
+            stat = conn.execute(
+                text("SELECT stat FROM sqlite_stat1 WHERE tbl = :table_name AND idx IS NULL"),
+                {"table_name": table_name}
+            ).scalar()
+            if stat:
+                return int(str(stat).split()[0])
+        except Exception:
+            # sqlite_stat1 só existe depois do primeiro ANALYZE
+            pass
+        try:
+            return int(conn.execute(text(f"SELECT MAX(rowid) FROM {self.quote_identifier(table_name)}")).scalar() or 0)
+        except Exception:
+            return 0
+    
+    def estimate_row_count(self, table_name: str) -> int:
+        """Obtém uma estimativa de registros da tabela SQLite (sqlite_stat1 ou maior rowid)"""
+        with self.engine.connect() as conn:
+            return self._estimate_row_count(conn, table_name)
+    
+    def get_primary_key_columns(self, table_name: str) -> List[str]:
+        """Obtém as colunas da chave primária da tabela SQLite"""
+        try:
+            with self.engine.connect() as conn:
+                rows = conn.execute(text(f"PRAGMA table_info({self.quote_identifier(table_name)})")).fetchall()
+                # Coluna pk: posição na chave primária (0 = fora da chave)
+                return [row[1] for row in sorted((row for row in rows if row[5]), key=lambda row: row[5])]
+        except Exception as e:
+            logger.error(f"Erro ao obter chave primária da tabela SQLite {table_name}: {e}")
+            raise
+    
+    def get_database_summary(self, sort_by_dependencies: bool = False, count_strategy: str = COUNT_EXACT) -> Dict[str, Any]:
+        """Obtém um resumo do banco SQLite"""
+        tables_info = self.get_tables_info(sort_by_dependencies=sort_by_dependencies, count_strategy=count_strategy)
+        
+        total_tables = len(tables_info)
+        total_rows = sum(table['row_count'] for table in tables_info)
+        total_size_mb = sum(table['size_mb'] for table in tables_info)
+        
+        return {
+            "database_type": "sqlite",
+            "database_name": self.database_name,
+            "total_tables": total_tables,
+            "total_rows": total_rows,
+            "total_size_mb": round(total_size_mb, 2),
+            "count_strategy": count_strategy,
+            "tables": tables_info
+        }
+    
+    def get_connection_url(self, user: str, password: str, host: str, port: int, database: str) -> str:
+        """Retorna a URL de conexão SQLite (database é o caminho do arquivo)"""
+        return f"sqlite:///{database}"
+    
+    def get_table_structure(self, table_name: str, remove_foreign_keys: bool = False) -> Dict[str, Any]:
+        """
+        Obtém a estrutura da tabela SQLite: o CREATE TABLE original seguido dos CREATE INDEX dos índices secundários
+        (no SQLite os índices são objetos separados da tabela)
+        """
+        try:
+            with self.engine.connect() as conn:
+                create_table_sql = conn.execute(
+                    text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :table_name"),
+                    {"table_name": table_name}
+                ).scalar()
+                if not create_table_sql:
+                    raise ValueError(f"Tabela '{table_name}' não encontrada")
+                
+                # Índices implícitos (PRIMARY KEY, UNIQUE) não têm sql: são recriados pelo próprio CREATE TABLE
+                indexes = [
+                    row[0] for row in conn.execute(
+                        text("SELECT sql FROM sqlite_master WHERE type = 'index' AND tbl_name = :table_name AND sql IS NOT NULL ORDER BY name"),
+                        {"table_name": table_name}
+                    )
+                ]
+                
+                columns = []
+                for row in conn.execute(text(f"PRAGMA table_info({self.quote_identifier(table_name)})")):
+                    columns.append({
+                        "column_name": row[1],
+                        "data_type": row[2],
+                        "is_nullable": "NO" if row[3] else "YES",
+                        "column_default": row[4],
+                        "primary_key": bool(row[5])
+                    })
+            
+            if remove_foreign_keys:
+                create_table_sql = self._remove_foreign_keys(create_table_sql)
+            
+            return {
+                "table_name": table_name,
+                "create_table_sql": ";\n".join([create_table_sql] + indexes) + ";",
+                "columns": columns
+            }
+        
+        except Exception as e:
+            logger.error(f"Erro ao obter estrutura da tabela SQLite {table_name}: {e}")
+            raise
+    
+    def _split_table_definitions(self, create_table_sql: str) -> Tuple[str, List[str], str]:
+        """Separa um CREATE TABLE em (início até o parêntese, definições de colunas e constraints, final)"""
+        start = create_table_sql.index("(")
+        definitions = []
+        depth = 0
+        quote = None
+        current_start = start + 1
+        for position in range(start, len(create_table_sql)):
+            char = create_table_sql[position]
+            if quote:
+                if char == quote:
+                    quote = None
+            elif char in ("'", '"', '`'):
+                quote = char
+            elif char == "[":
+                quote = "]"
+            elif char == "(":
+                depth += 1
+            elif char == ")":
+                depth -= 1
+                if depth == 0:
+                    definitions.append(create_table_sql[current_start:position].strip())
+                    return create_table_sql[:start + 1], definitions, create_table_sql[position:]
+            elif char == "," and depth == 1:
+                definitions.append(create_table_sql[current_start:position].strip())
+                current_start = position + 1
+        raise ValueError("CREATE TABLE sem parêntese de fechamento")
+    
+    def _remove_foreign_keys(self, create_table_sql: str) -> str:
+        """Remove foreign keys (constraints FOREIGN KEY e cláusulas REFERENCES das colunas) do CREATE TABLE"""
+        head, definitions, tail = self._split_table_definitions(create_table_sql)
+        kept = [
+            _COLUMN_REFERENCES.sub("", definition)
+            for definition in definitions
+            if not re.match(rf"(CONSTRAINT\s+{_IDENTIFIER}\s+)?FOREIGN\s+KEY", definition, re.IGNORECASE)
+        ]
+        return head + "\n    " + ",\n    ".join(kept) + "\n" + tail
+    
+    def _retarget_index(self, statement: str, table_name: str, existing: set) -> str:
+        """
+        Recria o CREATE INDEX para a tabela informada (ex: tabela sombra)
+        Nomes de índices são únicos por banco no SQLite: um nome já usado por outra tabela recebe um sufixo numérico
+        """
+        match = _CREATE_INDEX.match(statement)
+        if not match:
+            return statement
+        base_name = _unquote(match.group(2))
+        index_name = base_name
+        suffix = 1
+        while index_name in existing:
+            index_name = f"{base_name}_{suffix}"
+            suffix += 1
+        existing.add(index_name)
+        return (
+            f"CREATE {match.group(1) or ''}INDEX {self.quote_identifier(index_name)} "
+            f"ON {self.quote_identifier(table_name)} {match.group(4)}"
+        )
+    
+    def _execute_ddl(self, table_name: str, statements: List[str]):
+        """
+        Executa os comandos em uma única transação: no SQLite o DDL é transacional, mas o driver sqlite3
+        só abre transação implícita antes de INSERT/UPDATE/DELETE (BEGIN explícito)
+        Comandos CREATE INDEX são direcionados à tabela informada
+        """
+        with self.engine.connect() as conn:
+            existing = {row[0] for row in conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'index'"))}
+            conn.commit()
+            dbapi_conn = conn.connection.dbapi_connection
+            cursor = dbapi_conn.cursor()
+            try:
+                cursor.execute("BEGIN IMMEDIATE")
+                for statement in statements:
+                    if _CREATE_INDEX.match(statement):
+                        statement = self._retarget_index(statement, table_name, existing)
+                    cursor.execute(statement)
+                dbapi_conn.commit()
+            except Exception:
+                dbapi_conn.rollback()
+                raise
+            finally:
+                cursor.close()
+    
+    def create_table(self, table_name: str, structure_sql: str) -> bool:
+        """Cria uma tabela (e os índices que acompanham a estrutura) no banco SQLite"""
+        try:
+            self._execute_ddl(table_name, split_statements(structure_sql))
+            logger.info(f"Tabela '{table_name}' criada com sucesso")
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao criar tabela SQLite {table_name}: {e}")
+            return False
+    
+    def split_foreign_keys(self, create_table_sql: str) -> Tuple[str, List[str]]:
+        """
+        O SQLite não adiciona foreign keys a tabelas existentes (sem ALTER TABLE ADD CONSTRAINT): elas ficam no
+        CREATE TABLE, que aceita tabelas referenciadas ainda inexistentes, e não são verificadas durante a carga
+        """
+        return create_table_sql, []
+    
+    def split_deferred_definitions(self, create_table_sql: str) -> Tuple[str, List[str], List[str]]:
+        """Separa os CREATE INDEX da estrutura: os índices secundários são criados depois da carga"""
+        statements = split_statements(create_table_sql)
+        indexes = [statement for statement in statements if _CREATE_INDEX.match(statement)]
+        tables = [statement for statement in statements if statement not in indexes]
+        return ";\n".join(tables) + ";", indexes, []
+    
+    def add_table_definitions(self, table_name: str, clauses: List[str]):
+        """Cria os índices adiados (comandos CREATE INDEX) na tabela, em uma única transação"""
+        if not clauses:
+            return
+        self._execute_ddl(table_name, clauses)
+    
+    def get_table_data(self, table_name: str, limit: int = None) -> List[Dict[str, Any]]:
+        """Obtém os dados da tabela SQLite"""
+        try:
+            query = f"SELECT * FROM {self.quote_identifier(table_name)}"
+            if limit:
+                query += f" LIMIT {int(limit)}"
+            with self.engine.connect() as conn:
+                result = conn.execute(text(query))
+                columns = list(result.keys())
+                return [dict(zip(columns, row)) for row in result]
+        except Exception as e:
+            logger.error(f"Erro ao obter dados da tabela SQLite {table_name}: {e}")
+            raise
+    
+    def iter_table_data(self, table_name: str, batch_size: int = 1000, key_column: Optional[str] = None,
+                        lower: Any = None, upper: Any = None) -> Iterator[List[Dict[str, Any]]]:
+        """Lê os dados da tabela SQLite em lotes (o cursor do sqlite3 avança sob demanda, sem carregar a tabela)"""
+        try:
+            where, params = self._build_range_filter(key_column, lower, upper)
+            with self.engine.connect() as conn:
+                result = conn.execute(text(f"SELECT * FROM {self.quote_identifier(table_name)}{where}"), params)
+                columns = list(result.keys())
+                
+                for partition in result.partitions(batch_size):
+                    yield [dict(zip(columns, row)) for row in partition]
+        
+        except Exception as e:
+            logger.error(f"Erro ao ler dados em lotes da tabela SQLite {table_name}: {e}")
+            raise
+    
+    def _build_insert(self, table_name: str, columns: List[str]) -> str:
+        columns_str = ", ".join(self.quote_identifier(col) for col in columns)
+        placeholders = ", ".join(["?"] * len(columns))
+        return f"INSERT INTO {self.quote_identifier(table_name)} ({columns_str}) VALUES ({placeholders})"
+    
+    def _execute_many(self, table_name: str, query: str, columns: List[str], data: List[Dict[str, Any]], conn=None):
+        """
+        Grava o lote com executemany do driver em uma única transação (parâmetros posicionais, sem compilar SQL por lote)
+        Com conn (transação aberta com transaction()), o lote entra nela sem confirmação
+        """
+        params = [tuple(_to_sqlite_value(row[col]) for col in columns) for row in data]
+        if conn is not None:
+            conn.exec_driver_sql(query, params)
+            return
+        
+        with self._load_connection(table_name) as conn:
+            dbapi_conn = conn.connection.dbapi_connection
+            cursor = dbapi_conn.cursor()
+            try:
+                cursor.executemany(query, params)
+                dbapi_conn.commit()
+            except Exception:
+                dbapi_conn.rollback()
+                raise
+            finally:
+                cursor.close()
+    
+    def insert_data(self, table_name: str, data: List[Dict[str, Any]]) -> bool:
+        """Insere dados na tabela SQLite"""
+        if not data:
+            return True
+        
+        try:
+            columns = list(data[0].keys())
+            self._execute_many(table_name, self._build_insert(table_name, columns), columns, data)
+            logger.info(f"{len(data)} registros inseridos na tabela '{table_name}'")
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao inserir dados na tabela SQLite {table_name}: {e}")
+            return False
+    
+    def upsert_data(self, table_name: str, data: List[Dict[str, Any]], key_columns: List[str], conn=None) -> bool:
+        """Insere ou atualiza dados na tabela SQLite (INSERT ... ON CONFLICT DO UPDATE)"""
+        if not data:
+            return True
+        
+        try:
+            columns = list(data[0].keys())
+            update_columns = [col for col in columns if col not in key_columns]
+            query = self._build_insert(table_name, columns)
+            query += f" ON CONFLICT ({', '.join(self.quote_identifier(col) for col in key_columns)}) "
+            if update_columns:
+                query += "DO UPDATE SET " + ", ".join(
+                    f"{self.quote_identifier(col)} = excluded.{self.quote_identifier(col)}" for col in update_columns
+                )
+            else:
+                query += "DO NOTHING"
+            
+            self._execute_many(table_name, query, columns, data, conn=conn)
+            logger.info(f"{len(data)} registros inseridos/atualizados na tabela '{table_name}'")
+            return True
+        except Exception as e:
+            logger.error(f"Erro ao inserir/atualizar dados na tabela SQLite {table_name}: {e}")
+            return False
+    
+    def get_bulk_load_settings(self, options: Dict[str, bool]) -> Dict[str, str]:
+        """Configurações (PRAGMAs por conexão) do perfil de carga em massa no SQLite"""
+        session_settings = {}
+        if options.get("synchronous_commit"):
+            # Sem fsync a cada commit; no modo WAL uma queda pode perder só as últimas transações, sem corromper o arquivo
+            session_settings["synchronous"] = "OFF"
+        return session_settings
+    
+    def _get_session_setting(self, conn, name: str) -> str:
+        return str(conn.execute(text(f"PRAGMA {name}")).scalar())
+    
+    def _set_session_setting(self, conn, name: str, value: str):
+        conn.execute(text(f"PRAGMA {name} = {value}"))
+    
+    def get_dependency_graph(self, table_names: List[str]) -> Dict[str, List[str]]:
+        """Obtém, para cada tabela, as tabelas das quais ela depende (foreign keys), em uma única consulta"""
+        graph = {table_name: [] for table_name in table_names}
+        with self.engine.connect() as conn:
+            result = conn.execute(text("""
+            SELECT DISTINCT m.name, fk."table"
+            FROM sqlite_master m, pragma_foreign_key_list(m.name) fk
+            WHERE m.type = 'table'
+            ORDER BY m.name, fk."table"
+            """))
+            for row in result:
+                if row[0] in graph and row[1] not in graph[row[0]]:
+                    graph[row[0]].append(row[1])
+        return graph
+    
+    def get_referencing_tables(self, table_name: str) -> List[str]:
+        """Obtém as tabelas SQLite com foreign keys apontando para esta tabela"""
+        with self.engine.connect() as conn:
+            result = conn.execute(text("""
+            SELECT DISTINCT m.name
+            FROM sqlite_master m, pragma_foreign_key_list(m.name) fk
+            WHERE m.type = 'table'
+            AND fk."table" = :table_name
+            AND m.name <> :table_name
+            """), {"table_name": table_name})
+            return [row[0] for row in result]
+    
+    def swap_tables(self, table_name: str, shadow_table: str, old_table: str):
+        """Troca a tabela pela tabela sombra com os dois RENAME em uma única transação"""
+        self._execute_ddl(table_name, [
+            f"ALTER TABLE {self.quote_identifier(table_name)} RENAME TO {self.quote_identifier(old_table)}",
+            f"ALTER TABLE {self.quote_identifier(shadow_table)} RENAME TO {self.quote_identifier(table_name)}"
+        ])
+    
+    def table_exists(self, table_name: str) -> bool:
+        """Verifica se a tabela existe no SQLite"""
+        try:
+            with self.engine.connect() as conn:
+                result = conn.execute(
+                    text("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = :table_name"),
+                    {"table_name": table_name}
+                )
+                return result.scalar() > 0
+        except Exception as e:
+            logger.error(f"Erro ao verificar existência da tabela SQLite {table_name}: {e}")
+            return False
+    
+    def drop_table(self, table_name: str) -> bool:
+        """Remove a tabela se existir no SQLite"""
+        try:
+            with self.engine.connect() as conn:
+                conn.execute(text(f"DROP TABLE IF EXISTS {self.quote_identifier(table_name)}"))
+                conn.commit()
+                logger.info(f"Tabela '{table_name}' removida com sucesso")
+                return True
+        except Exception as e:
+            logger.error(f"Erro ao remover tabela SQLite {table_name}: {e}")
+            return False
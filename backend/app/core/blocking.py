@@ -0,0 +1,90 @@
+import asyncio
+import contextvars
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Callable
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# Pools de threads para código bloqueante (SQLAlchemy síncrono) chamado a partir do event loop
+POOL_API = "api"
+POOL_MIGRATION = "migration"
+
+
+class BlockingExecutor:
+    """
+    Executa funções bloqueantes em pools de threads limitados, sem travar o event loop do uvicorn
+    Consultas rápidas (metadados, health) e migrações usam pools separados: migrações longas
+    ocupam no máximo o pool de migração e nunca deixam as consultas rápidas sem thread
+    """
+
+    def __init__(self):
+        self._pools: Dict[str, ThreadPoolExecutor] = {}
+        self._sizes = {
+            POOL_API: settings.api_thread_pool_size,
+            POOL_MIGRATION: settings.migration_thread_pool_size
+        }
+        self._active = {name: 0 for name in self._sizes}
+        self._queued = {name: 0 for name in self._sizes}
+        self._lock = threading.Lock()
+
+    def _get_pool(self, name: str) -> ThreadPoolExecutor:
+        with self._lock:
+            if name not in self._pools:
+                if name not in self._sizes:
+                    raise ValueError(f"Pool de threads '{name}' desconhecido")
+                self._pools[name] = ThreadPoolExecutor(max_workers=self._sizes[name], thread_name_prefix=f"{name}-pool")
+            return self._pools[name]
+
+    def _track(self, name: str, func: Callable[[], Any]) -> Any:
+        with self._lock:
+            self._queued[name] -= 1
+            self._active[name] += 1
+        try:
+            return func()
+        finally:
+            with self._lock:
+                self._active[name] -= 1
+
+    async def run(self, func: Callable[..., Any], *args: Any, pool: str = POOL_API, **kwargs: Any) -> Any:
+        """Executa func(*args, **kwargs) no pool informado e aguarda o resultado sem bloquear o event loop"""
+        executor = self._get_pool(pool)
+        # Preserva as variáveis de contexto da requisição (ex: rastreamento) na thread
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, func, *args, **kwargs)
+        with self._lock:
+            self._queued[pool] += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, self._track, pool, call)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Tamanho, threads ocupadas e chamadas aguardando thread de cada pool"""
+        with self._lock:
+            return {
+                name: {"max_workers": size, "active": self._active[name], "queued": self._queued[name]}
+                for name, size in self._sizes.items()
+            }
+
+    def shutdown(self, wait: bool = False):
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools.clear()
+        for pool in pools:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+
+# Instância global
+blocking_executor = BlockingExecutor()
+
+
+async def run_blocking(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Executa uma chamada bloqueante curta (metadados, health, configurações) no pool da API"""
+    return await blocking_executor.run(func, *args, pool=POOL_API, **kwargs)
+
+
+async def run_migration(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Executa uma migração, comparação ou reparo no pool de migrações"""
+    return await blocking_executor.run(func, *args, pool=POOL_MIGRATION, **kwargs)
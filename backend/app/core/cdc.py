@@ -0,0 +1,196 @@
+import json
+import logging
+import time
+from typing import Dict, List, Any, Callable, Iterable, Iterator, Optional, Tuple
+from .adapters.base_adapter import DatabaseAdapter
+from .sync_state import encode_state_value, decode_state_value
+
+logger = logging.getLogger(__name__)
+
+# Tipos de registro de evento do binlog (formato independente da biblioteca de replicação)
+EVENT_WRITE = "write"
+EVENT_UPDATE = "update"
+EVENT_DELETE = "delete"
+EVENT_COMMIT = "commit"
+
+_ROW_EVENT_TYPES = {
+    "WriteRowsEvent": EVENT_WRITE,
+    "UpdateRowsEvent": EVENT_UPDATE,
+    "DeleteRowsEvent": EVENT_DELETE,
+}
+
+# Operações aplicadas no destino
+OP_UPSERT = "upsert"
+OP_DELETE = "delete"
+
+
+def event_to_record(event: Any, log_file: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Converte um evento do BinLogStreamReader (python-mysql-replication) em um registro simples
+    Retorna None para eventos que não alteram dados nem fecham transações
+    """
+    event_name = type(event).__name__
+    position = {
+        "log_file": log_file,
+        "log_pos": getattr(event.packet, "log_pos", None) if hasattr(event, "packet") else None,
+        "timestamp": getattr(event, "timestamp", None)
+    }
+
+    if event_name in _ROW_EVENT_TYPES:
+        return {
+            "event": _ROW_EVENT_TYPES[event_name],
+            "schema": event.schema,
+            "table": event.table,
+            "rows": event.rows,
+            **position
+        }
+    # XID fecha transações InnoDB; tabelas não transacionais terminam com um QueryEvent "COMMIT"
+    if event_name == "XidEvent" or (event_name == "QueryEvent" and str(event.query).strip().upper() == "COMMIT"):
+        return {"event": EVENT_COMMIT, **position}
+    return None
+
+
+def committed_batches(records: Iterable[Dict[str, Any]], batch_size: int
+                      ) -> Iterator[Tuple[List[Dict[str, Any]], int, Tuple[Optional[str], Optional[int]]]]:
+    """
+    Agrupa registros em lotes de transações completas: (registros, transações, posição do último commit)
+    Um lote fecha ao atingir batch_size registros ou no fim da entrada; eventos após o último commit não são emitidos
+    """
+    committed: List[Dict[str, Any]] = []
+    transaction: List[Dict[str, Any]] = []
+    transactions = 0
+    position = None
+    for record in records:
+        if record["event"] != EVENT_COMMIT:
+            transaction.append(record)
+            continue
+
+        committed.extend(transaction)
+        transaction = []
+        transactions += 1
+        position = (record["log_file"], record["log_pos"])
+        if len(committed) >= batch_size:
+            yield committed, transactions, position
+            committed, transactions = [], 0
+
+    if transactions:
+        yield committed, transactions, position
+
+
+def dump_records(records: Iterable[Dict[str, Any]], path: str):
+    """Grava registros de eventos em JSON Lines, preservando os tipos dos valores (fixtures para replay offline)"""
+    with open(path, "a", encoding="utf-8") as fixture_file:
+        for record in records:
+            encoded = dict(record)
+            if "rows" in record:
+                encoded["rows"] = [
+                    {part: {col: encode_state_value(value) for col, value in values.items()} for part, values in row.items()}
+                    for row in record["rows"]
+                ]
+            fixture_file.write(json.dumps(encoded) + "\n")
+
+
+def load_records(path: str) -> List[Dict[str, Any]]:
+    """Lê registros gravados por dump_records"""
+    records = []
+    with open(path, "r", encoding="utf-8") as fixture_file:
+        for line in fixture_file:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if "rows" in record:
+                record["rows"] = [
+                    {part: {col: decode_state_value(value) for col, value in values.items()} for part, values in row.items()}
+                    for row in record["rows"]
+                ]
+            records.append(record)
+    return records
+
+
+def decode_records(records: Iterable[Dict[str, Any]], key_columns_for: Callable[[str], List[str]]) -> List[Dict[str, Any]]:
+    """
+    Converte registros de eventos em operações ordenadas sobre o destino
+    Atualizações que alteram a chave primária viram remoção da chave antiga seguida de upsert
+    """
+    changes = []
+    for record in records:
+        event_type = record["event"]
+        if event_type == EVENT_COMMIT:
+            continue
+
+        table = record["table"]
+        key_columns = key_columns_for(table)
+        for row in record["rows"]:
+            if event_type == EVENT_WRITE:
+                changes.append({"table": table, "op": OP_UPSERT, "row": row["values"]})
+            elif event_type == EVENT_DELETE:
+                changes.append({"table": table, "op": OP_DELETE, "row": {col: row["values"][col] for col in key_columns}})
+            elif event_type == EVENT_UPDATE:
+                before = {col: row["before_values"][col] for col in key_columns}
+                after = row["after_values"]
+                if any(before[col] != after[col] for col in key_columns):
+                    changes.append({"table": table, "op": OP_DELETE, "row": before})
+                changes.append({"table": table, "op": OP_UPSERT, "row": after})
+    return changes
+
+
+def group_changes(changes: List[Dict[str, Any]], key_columns_for: Callable[[str], List[str]]) -> List[Dict[str, Any]]:
+    """
+    Agrupa operações consecutivas da mesma tabela e tipo, mantendo a ordem entre os grupos
+    Dentro de um grupo só a última versão de cada chave é mantida (um comando não pode afetar a mesma linha duas vezes)
+    """
+    groups: List[Dict[str, Any]] = []
+    for change in changes:
+        if not groups or groups[-1]["table"] != change["table"] or groups[-1]["op"] != change["op"]:
+            groups.append({"table": change["table"], "op": change["op"], "rows": {}})
+        key_columns = key_columns_for(change["table"])
+        key = tuple(change["row"][col] for col in key_columns)
+        rows = groups[-1]["rows"]
+        rows.pop(key, None)
+        rows[key] = change["row"]
+
+    return [{"table": g["table"], "op": g["op"], "rows": list(g["rows"].values())} for g in groups]
+
+
+class ChangeApplier:
+    """Aplica, em ordem, as alterações decodificadas do binlog no banco de destino"""
+
+    def __init__(self, destination: DatabaseAdapter, key_columns_for: Callable[[str], List[str]],
+                 table_filter: Optional[Callable[[str], bool]] = None):
+        self.destination = destination
+        self.key_columns_for = key_columns_for
+        # Tabelas recusadas pelo filtro (ex: inexistentes no destino) são ignoradas
+        self.table_filter = table_filter or (lambda table: True)
+
+    def apply(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Aplica um lote de registros de eventos em uma única transação do destino, confirmada uma vez no fim
+        Leitores nunca veem parte de uma transação da origem; uma falha desfaz o lote inteiro (o checkpoint
+        só avança depois da confirmação, então a releitura reaplica o lote a partir do commit anterior)
+        """
+        started = time.perf_counter()
+        records = [r for r in records if r["event"] == EVENT_COMMIT or self.table_filter(r["table"])]
+        groups = group_changes(decode_records(records, self.key_columns_for), self.key_columns_for)
+
+        upserted = 0
+        deleted = 0
+        with self.destination.transaction() as conn:
+            for group in groups:
+                table = group["table"]
+                key_columns = self.key_columns_for(table)
+                if not key_columns:
+                    raise ValueError(f"Replicação da tabela '{table}' requer chave primária")
+                if group["op"] == OP_UPSERT:
+                    if not self.destination.upsert_data(table, group["rows"], key_columns, conn=conn):
+                        raise Exception(f"Falha ao aplicar alterações na tabela '{table}' do destino")
+                    upserted += len(group["rows"])
+                else:
+                    deleted += self.destination.delete_rows(table, key_columns, group["rows"], conn=conn)
+
+        return {
+            "events": sum(len(r.get("rows", [])) for r in records),
+            "statements": len(groups),
+            "rows_upserted": upserted,
+            "rows_deleted": deleted,
+            "seconds": round(time.perf_counter() - started, 3)
+        }
@@ -0,0 +1,153 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, List, Any, Optional, Tuple
+from .adapters.base_adapter import DatabaseAdapter
+from .range_copy import _linear_boundaries, plan_key_ranges
+
+logger = logging.getLogger(__name__)
+
+
+def _merge_ranges(ranges: List[Tuple[Any, Any]]) -> List[Tuple[Any, Any]]:
+    """Junta faixas contíguas (upper de uma == lower da seguinte) para reduzir comandos na recópia"""
+    merged: List[Tuple[Any, Any]] = []
+    for lower, upper in ranges:
+        if merged and merged[-1][1] is not None and merged[-1][1] == lower:
+            merged[-1] = (merged[-1][0], upper)
+        else:
+            merged.append((lower, upper))
+    return merged
+
+
+class ChunkedChecksumDiff:
+    """
+    Compara uma tabela entre origem e destino por checksums de faixas da chave primária,
+    bissectando as faixas divergentes até isolar os trechos que precisam ser copiados novamente
+    """
+
+    def __init__(self, source: DatabaseAdapter, destination: DatabaseAdapter, table_name: str, key_column: str,
+                 columns: List[str], chunks: int = 16, min_chunk_rows: int = 1000, max_depth: int = 20):
+        self.source = source
+        self.destination = destination
+        self.table_name = table_name
+        self.key_column = key_column
+        self.columns = columns
+        self.chunks = chunks
+        self.min_chunk_rows = min_chunk_rows
+        self.max_depth = max_depth
+
+        # Checksum no servidor só quando os dois lados usam o mesmo algoritmo; senão, calcula no cliente
+        algorithm = source.CHECKSUM_ALGORITHM
+        self.server_side = algorithm is not None and algorithm == destination.CHECKSUM_ALGORITHM
+        self.checksum_queries = 0
+
+    def _checksum(self, adapter: DatabaseAdapter, lower: Any, upper: Any) -> Tuple[int, int]:
+        if self.server_side:
+            return adapter.get_chunk_checksum(self.table_name, self.columns, self.key_column, lower, upper)
+        return adapter.compute_chunk_checksum(self.table_name, self.columns, self.key_column, lower, upper)
+
+    def _compare(self, pool: ThreadPoolExecutor, lower: Any, upper: Any) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+        """Calcula o checksum da faixa na origem e no destino ao mesmo tempo"""
+        source_future = pool.submit(self._checksum, self.source, lower, upper)
+        destination_future = pool.submit(self._checksum, self.destination, lower, upper)
+        self.checksum_queries += 2
+        return source_future.result(), destination_future.result()
+
+    def _split(self, lower: Any, upper: Any, source_rows: Optional[int] = None) -> Optional[Any]:
+        """
+        Escolhe um ponto de corte dentro da faixa, considerando as chaves dos dois lados
+        source_rows: registros da faixa na origem (do checksum), para dimensionar a amostra de chaves
+        """
+        bounds = [
+            adapter.get_key_bounds(self.table_name, self.key_column, lower, upper)
+            for adapter in (self.source, self.destination)
+        ]
+        lows = [low for low, _ in bounds if low is not None]
+        highs = [high for _, high in bounds if high is not None]
+        if not lows:
+            return None
+        low, high = min(lows), max(highs)
+        if low == high:
+            return None
+
+        if isinstance(low, (int, float, Decimal, datetime, date)) and not isinstance(low, bool):
+            candidates = _linear_boundaries(low, high, 2)
+        else:
+            candidates = self.source.get_key_boundaries(self.table_name, self.key_column, 2, lower, upper, total=source_rows)
+        for candidate in candidates:
+            if low < candidate <= high:
+                return candidate
+        # Faixa numérica estreita demais para a divisão linear: corta na chave máxima
+        return high
+
+    def find_divergent_ranges(self) -> Dict[str, Any]:
+        """Retorna as faixas [lower, upper) cujos registros diferem entre origem e destino"""
+        started = time.perf_counter()
+        initial = plan_key_ranges(self.source, self.table_name, self.key_column, self.chunks)
+        stack = [(lower, upper, 0) for lower, upper in reversed(initial)]
+        divergent = []
+        compared = 0
+
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix=f"checksum-{self.table_name}") as pool:
+            while stack:
+                lower, upper, depth = stack.pop()
+                (source_rows, source_hash), (dest_rows, dest_hash) = self._compare(pool, lower, upper)
+                compared += 1
+                if source_rows == dest_rows and source_hash == dest_hash:
+                    continue
+
+                split = None
+                if max(source_rows, dest_rows) > self.min_chunk_rows and depth < self.max_depth:
+                    split = self._split(lower, upper, source_rows)
+                if split is None:
+                    divergent.append({
+                        "lower": lower,
+                        "upper": upper,
+                        "source_rows": source_rows,
+                        "destination_rows": dest_rows
+                    })
+                else:
+                    # Empilha a metade superior primeiro para processar as faixas em ordem crescente
+                    stack.append((split, upper, depth + 1))
+                    stack.append((lower, split, depth + 1))
+
+        return {
+            "table_name": self.table_name,
+            "key_column": self.key_column,
+            "checksum": "server" if self.server_side else "client",
+            "initial_chunks": len(initial),
+            "chunks_compared": compared,
+            "checksum_queries": self.checksum_queries,
+            "divergent_ranges": divergent,
+            "elapsed_seconds": round(time.perf_counter() - started, 3)
+        }
+
+    def repair(self, divergent_ranges: List[Dict[str, Any]], batch_size: int, load_strategy: str = "insert") -> Dict[str, Any]:
+        """Copia novamente só as faixas divergentes: remove a faixa no destino e recarrega da origem"""
+        started = time.perf_counter()
+        ranges = _merge_ranges([(r["lower"], r["upper"]) for r in divergent_ranges])
+        deleted = 0
+        copied = 0
+        for lower, upper in ranges:
+            deleted += self.destination.delete_range(self.table_name, self.key_column, lower, upper)
+            batches = self.source.iter_table_data(
+                self.table_name,
+                batch_size=batch_size,
+                key_column=self.key_column,
+                lower=lower,
+                upper=upper
+            )
+            for batch in batches:
+                if not self.destination.load_data(self.table_name, batch, load_strategy):
+                    raise Exception(f"Falha ao recopiar a faixa [{lower}, {upper}) da tabela '{self.table_name}'")
+                copied += len(batch)
+
+        logger.info(f"Tabela '{self.table_name}': {len(ranges)} faixas recopiadas ({deleted} removidos, {copied} copiados)")
+        return {
+            "ranges_repaired": len(ranges),
+            "rows_deleted": deleted,
+            "rows_copied": copied,
+            "elapsed_seconds": round(time.perf_counter() - started, 3)
+        }
@@ -20,6 +20,64 @@ class Settings(BaseSettings):
     destination_host: str = "mysql_destination"
     destination_port: int = 3306
     
+    # Configurações de migração
+    migration_batch_size: int = 5000
+    migration_pipeline_queue_size: int = 4
+    # Tabelas migradas em paralelo nas migrações em lote e cron jobs
+    migration_workers: int = 4
+    # Limite de workers (tabelas em paralelo) e de faixas paralelas por migração; o pool de conexões comporta esse máximo
+    max_migration_workers: int = 8
+    # Arquivo com o estado da sincronização incremental (colunas e marcas d'água por tabela)
+    sync_state_path: str = "data/sync_state.json"
+    # Charset negociado com cada banco MySQL, reutilizado nas inicializações seguintes (apagar o arquivo força nova negociação)
+    connection_cache_path: str = "data/connection_cache.json"
+    # Tempo limite de cada conexão de teste da negociação de charset
+    connection_probe_timeout_seconds: float = 5.0
+    # Faixas iniciais da comparação por checksum e tamanho mínimo de faixa para continuar a bissecção
+    diff_chunk_count: int = 16
+    diff_min_chunk_rows: int = 1000
+    # Contagem de registros do inventário de tabelas: 'estimated' (catálogo), 'exact' (COUNT(*) em paralelo) ou 'cached'
+    row_count_strategy: str = "exact"
+    row_count_workers: int = 8
+    # Tempo limite de cada COUNT(*); tabelas que excedem ficam com a estimativa
+    row_count_timeout_seconds: float = 30.0
+    # Validade das contagens exatas na estratégia 'cached'
+    row_count_cache_ttl_seconds: float = 300.0
+    # Threads para chamadas bloqueantes da API: consultas rápidas e migrações (requisições além disso aguardam na fila)
+    api_thread_pool_size: int = 16
+    migration_thread_pool_size: int = 4
+    # Validade dos metadados em cache (resumos e estruturas de tabelas)
+    metadata_cache_ttl_seconds: float = 60.0
+    # Validade do grafo de foreign keys e da ordem de carga calculados (reutilizados por API, lotes e cron jobs)
+    dependency_graph_ttl_seconds: float = 300.0
+    # Jobs de migração concluídos mantidos para consulta (os mais antigos são descartados)
+    job_history_size: int = 200
+    # Execuções dos cron jobs: simultâneas e conexões de cópia por banco (cada worker usa uma na origem e uma no destino)
+    cron_max_concurrent_runs: int = 2
+    cron_source_connection_budget: int = 8
+    cron_destination_connection_budget: int = 8
+    # Rastreamento por etapas (spans OpenTelemetry): 'none', 'console' ou 'file' (JSON, um span por linha)
+    tracing_exporter: str = "none"
+    tracing_file_path: str = "data/traces.jsonl"
+    # Replicação contínua por binlog (MySQL com binlog_format=ROW)
+    cdc_enabled: bool = False
+    cdc_server_id: int = 1001
+    cdc_batch_size: int = 1000
+    cdc_poll_seconds: float = 1.0
+    # Se definido, grava os eventos lidos em JSON Lines (fixtures para reprocessamento offline)
+    cdc_record_path: Optional[str] = None
+    # Habilita LOAD DATA LOCAL INFILE no cliente MySQL de destino
+    mysql_local_infile: bool = False
+    # Perfil de carga em massa (bulk_load=true): ajustes de sessão aplicados só nas conexões de carga do destino
+    bulk_load_disable_unique_checks: bool = True
+    bulk_load_disable_foreign_key_checks: bool = True
+    # Não grava a carga no binlog do destino (requer SUPER/SYSTEM_VARIABLES_ADMIN; réplicas do destino não recebem os dados)
+    bulk_load_disable_binlog: bool = False
+    # PostgreSQL: synchronous_commit=off (uma queda pode perder os últimos commits, mas não corrompe dados)
+    bulk_load_async_commit: bool = True
+    # Registros por lote (e por transação) com o perfil ativo
+    bulk_load_batch_size: int = 20000
+    
     # Configurações da aplicação
     debug: bool = True
     app_name: str = "Database Sync API"
@@ -0,0 +1,70 @@
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Any, Optional
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionCache:
+    """
+    Parâmetros de conexão negociados (charset do MySQL) por banco, em arquivo JSON
+    Inicializações seguintes usam o valor gravado em vez de testar os candidatos com conexões reais
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._charsets: Dict[str, Dict[str, Any]] = {}
+        self._load()
+
+    def _load(self):
+        """Carrega o cache do disco, se existir"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as cache_file:
+                self._charsets = json.load(cache_file).get("charsets", {})
+        except Exception as e:
+            logger.error(f"Erro ao carregar cache de conexões de {self.path}: {e}")
+
+    def _save(self):
+        """Grava o cache de forma atômica (arquivo temporário + rename)"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as cache_file:
+            json.dump({"charsets": self._charsets}, cache_file, indent=2, sort_keys=True)
+        os.replace(temp_path, self.path)
+
+    def get_charset(self, key: str) -> Optional[str]:
+        """Charset negociado para o banco (chave 'tipo://host:porta/banco'), se já conhecido"""
+        with self._lock:
+            entry = self._charsets.get(key)
+            return entry["charset"] if entry else None
+
+    def set_charset(self, key: str, charset: str):
+        """Grava o charset negociado para o banco"""
+        with self._lock:
+            self._charsets[key] = {"charset": charset, "negotiated_at": datetime.now().isoformat()}
+            try:
+                self._save()
+            except Exception as e:
+                # Sem o arquivo a próxima inicialização apenas volta a negociar
+                logger.warning(f"Erro ao gravar cache de conexões em {self.path}: {e}")
+
+    def invalidate(self, key: Optional[str] = None) -> int:
+        """Descarta o charset de um banco (ou de todos); a próxima criação da engine volta a negociar"""
+        with self._lock:
+            keys = [key] if key is not None else list(self._charsets)
+            removed = [name for name in keys if self._charsets.pop(name, None) is not None]
+            if removed:
+                self._save()
+            return len(removed)
+
+
+# Instância global do cache de conexões
+connection_cache = ConnectionCache(settings.connection_cache_path)
@@ -0,0 +1,151 @@
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+from typing import Dict, List, Any, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class DependencyDagExecutor:
+    """
+    Executa uma tarefa por tabela em paralelo, iniciando cada tabela assim que todas as tabelas pai terminam
+    Tabelas cuja tabela pai falhou (direta ou indiretamente) não são executadas: o resultado delas é de falha,
+    com skipped=True e o erro indicando a tabela pai
+    """
+
+    def __init__(self, tables: List[str], dependencies: Dict[str, List[str]], max_workers: int = 4):
+        if max_workers < 1:
+            raise ValueError("max_workers deve ser maior ou igual a 1")
+
+        # A ordem da lista é usada como prioridade entre tabelas prontas
+        self.tables = list(tables)
+        self._order = {table: index for index, table in enumerate(self.tables)}
+        self.max_workers = max_workers
+
+        table_set = set(self.tables)
+        # Só considera dependências entre as tabelas selecionadas (e ignora auto-referências)
+        self.parents: Dict[str, set] = {
+            table: {dep for dep in dependencies.get(table, []) if dep in table_set and dep != table}
+            for table in self.tables
+        }
+        self.children: Dict[str, List[str]] = {table: [] for table in self.tables}
+        for table, parents in self.parents.items():
+            for parent in parents:
+                self.children[parent].append(table)
+
+        self._lock = threading.Lock()
+        self._running = 0
+        self._max_concurrency = 0
+
+    def _run_task(self, task: Callable[[str], Dict[str, Any]], table: str) -> Dict[str, Any]:
+        """Executa a tarefa de uma tabela registrando início, fim e concorrência"""
+        with self._lock:
+            self._running += 1
+            self._max_concurrency = max(self._max_concurrency, self._running)
+
+        started_at = datetime.now()
+        started = time.perf_counter()
+        try:
+            result = task(table)
+        except Exception as e:
+            logger.error(f"Erro ao executar tarefa da tabela {table}: {e}")
+            result = {
+                "success": False,
+                "table_name": table,
+                "error": str(e),
+                "message": f"Erro na migração da tabela {table}"
+            }
+        finally:
+            with self._lock:
+                self._running -= 1
+
+        result["started_at"] = started_at.isoformat()
+        result["finished_at"] = datetime.now().isoformat()
+        result["duration_seconds"] = round(time.perf_counter() - started, 3)
+        result["worker"] = threading.current_thread().name
+        return result
+
+    def _skip_descendants(self, failed_table: str, waiting: set, results: Dict[str, Dict[str, Any]]):
+        """Marca como ignoradas as tabelas em espera que dependem (direta ou indiretamente) da tabela que falhou"""
+        stack = [failed_table]
+        while stack:
+            parent = stack.pop()
+            for child in self.children[parent]:
+                if child not in waiting:
+                    continue
+                waiting.discard(child)
+                if parent == failed_table:
+                    error = f"Tabela pai '{failed_table}' falhou"
+                else:
+                    error = f"Tabela pai '{parent}' não foi migrada (falha em '{failed_table}')"
+                logger.warning(f"Tabela {child} ignorada: {error}")
+                results[child] = {
+                    "success": False,
+                    "skipped": True,
+                    "table_name": child,
+                    "error": error,
+                    "message": f"Migração da tabela {child} ignorada: {error}",
+                    "started_at": None,
+                    "finished_at": None,
+                    "duration_seconds": 0.0,
+                    "worker": None
+                }
+                stack.append(child)
+
+    def run(self, task: Callable[[str], Dict[str, Any]]) -> Dict[str, Any]:
+        """Executa a tarefa para todas as tabelas e retorna os resultados na ordem original"""
+        started = time.perf_counter()
+        remaining_parents = {table: set(parents) for table, parents in self.parents.items()}
+        pending = [table for table in self.tables if not remaining_parents[table]]
+        waiting = {table for table in self.tables if remaining_parents[table]}
+        results: Dict[str, Dict[str, Any]] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="migration-worker") as pool:
+            futures = {}
+
+            while pending or futures or waiting:
+                # Ciclo de dependências: nada rodando e nenhuma tabela pronta, libera a primeira que sobrou
+                if not pending and not futures and waiting:
+                    table = next(t for t in self.tables if t in waiting)
+                    logger.warning(f"Ciclo de dependências detectado envolvendo {table}, iniciando sem aguardar as tabelas pai")
+                    waiting.discard(table)
+                    pending.append(table)
+
+                while pending and len(futures) < self.max_workers:
+                    table = pending.pop(0)
+                    # Cada tabela herda o contexto de quem iniciou o lote (ex: span da migração em lote)
+                    futures[pool.submit(contextvars.copy_context().run, self._run_task, task, table)] = table
+
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    table = futures.pop(future)
+                    results[table] = future.result()
+
+                    # Filhas de uma tabela que falhou apontariam para uma tabela pai ausente ou incompleta
+                    if not results[table].get("success"):
+                        self._skip_descendants(table, waiting, results)
+
+                    # Libera as tabelas filhas cujas dependências foram todas concluídas
+                    for child in self.children[table]:
+                        remaining_parents[child].discard(table)
+                        if child in waiting and not remaining_parents[child]:
+                            waiting.discard(child)
+                            pending.append(child)
+
+                # Mantém a prioridade pela ordem original (ex: ordem topológica)
+                pending.sort(key=self._order.get)
+
+        elapsed = time.perf_counter() - started
+        busy = sum(result["duration_seconds"] for result in results.values())
+        return {
+            "results": [results[table] for table in self.tables],
+            "skipped_count": sum(1 for result in results.values() if result.get("skipped")),
+            "elapsed_seconds": round(elapsed, 3),
+            "max_workers": self.max_workers,
+            "max_concurrency": self._max_concurrency,
+            # Soma das durações / tempo total: 1.0 significa execução sequencial
+            "effective_parallelism": round(busy / elapsed, 2) if elapsed > 0 else 0.0
+        }
@@ -1,116 +1,261 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import SQLAlchemyError
-from typing import Dict, List, Optional, Any
+from sqlalchemy.engine import Engine
+from typing import Dict, List, Optional, Any, Callable, Tuple
+from concurrent.futures import ThreadPoolExecutor
 import logging
+import threading
+import time
+from datetime import datetime
 from .config import settings
 from .adapters.adapter_factory import DatabaseAdapterFactory
+from .adapters.base_adapter import DatabaseAdapter, COUNT_ESTIMATED
+from .connection_cache import connection_cache
+from .pipeline import PipelinedCopy
+from .range_copy import RangeParallelCopy, plan_key_ranges
+from .checksum_diff import ChunkedChecksumDiff
+from .dependency_graph import plan_load_order
+from .metadata_cache import MetadataCache
+from .metrics import instrumented_pool_class, state_collector, timed_batches, record_batch_written, record_startup_phase
+from .tracing import stage, migration_trace, annotate, current_timings, current_counters, record_batch
+from .progress import MigrationProgress
+from .sync_state import sync_state, encode_state_value
 
 logger = logging.getLogger(__name__)
 
 
 class DatabaseManager:
+    # Modos de sincronização de uma tabela
+    SYNC_MODE_FULL = "full"
+    SYNC_MODE_INCREMENTAL = "incremental"
+    SYNC_MODE_MERGE = "merge"
+    SYNC_MODE_SHADOW = "shadow"
+    SYNC_MODES = [SYNC_MODE_FULL, SYNC_MODE_INCREMENTAL, SYNC_MODE_MERGE, SYNC_MODE_SHADOW]
+    
+    # Sufixos da tabela sombra (carga) e da tabela substituída (removida após a troca)
+    SHADOW_SUFFIX = "__sync_new"
+    OLD_SUFFIX = "__sync_old"
+    
+    # Registros por faixa de chave na remoção de registros ausentes na origem (modo merge)
+    MERGE_DELETE_RANGE_ROWS = 100000
+    
+    # Bancos da sincronização; engine e adaptador de cada um são criados no primeiro uso
+    DATABASE_TYPES = ("source", "destination")
+    
+    # Engine criada com o charset de fallback (banco inacessível) é provisória: reutilizada por este tempo
+    # e depois recriada, negociando o charset de novo
+    FALLBACK_RETRY_SECONDS = 30.0
+    
     def __init__(self):
-        self.source_engine = None
-        self.destination_engine = None
-        self.source_adapter = None
-        self.destination_adapter = None
-        self._create_engines()
-        self._create_adapters()
-    
-    def _create_engines(self):
-        """Cria as conexões com os bancos de dados source e destination"""
-        try:
-            # Cria adaptadores para obter URLs de conexão
-            temp_source_adapter = DatabaseAdapterFactory.create_adapter(
-                settings.database_type, 
-                None, 
-                settings.source_db
-            )
-            temp_dest_adapter = DatabaseAdapterFactory.create_adapter(
-                settings.database_type, 
-                None, 
-                settings.destination_db
+        # Importar o módulo não conecta: engines e adaptadores nascem no primeiro acesso ou no warm_up da inicialização
+        self._sides: Dict[str, Tuple[Engine, DatabaseAdapter]] = {}
+        self._provisional: Dict[str, Tuple[Engine, DatabaseAdapter, float]] = {}
+        self._side_locks = {database_type: threading.Lock() for database_type in self.DATABASE_TYPES}
+        # Resumos, estruturas e grafos de dependências compartilhados entre API, lotes e cron jobs
+        self.metadata_cache = MetadataCache(settings.metadata_cache_ttl_seconds)
+        # Tempos da inicialização (time-to-ready), preenchidos pelo warm_up
+        self.startup: Dict[str, Any] = {"ready": False, "databases": {}}
+        
+        # Ocupação dos pools exposta em /metrics (pools ainda não criados não aparecem)
+        for database_type in self.DATABASE_TYPES:
+            state_collector.register_pool(
+                database_type,
+                lambda database_type=database_type: getattr(self._current_engine(database_type), "pool", None)
             )
-            
-            # Engine para banco de origem
-            if hasattr(temp_source_adapter, 'get_connection_url_with_fallback'):
-                source_url = temp_source_adapter.get_connection_url_with_fallback(
-                    settings.source_user,
-                    settings.source_password,
-                    settings.source_host,
-                    settings.source_port,
-                    settings.source_db
-                )
+    
+    @property
+    def source_engine(self) -> Engine:
+        return self._get_side('source')[0]
+    
+    @property
+    def destination_engine(self) -> Engine:
+        return self._get_side('destination')[0]
+    
+    @property
+    def source_adapter(self) -> DatabaseAdapter:
+        return self._get_side('source')[1]
+    
+    @property
+    def destination_adapter(self) -> DatabaseAdapter:
+        return self._get_side('destination')[1]
+    
+    def _get_side(self, database_type: str) -> Tuple[Engine, DatabaseAdapter]:
+        """Engine e adaptador do banco, criados na primeira chamada (chamadas concorrentes esperam a mesma criação)"""
+        side = self._sides.get(database_type)
+        if side is None:
+            with self._side_locks[database_type]:
+                side = self._sides.get(database_type)
+                if side is None:
+                    side = self._reusable_provisional(database_type) or self._create_side(database_type)
+        return side
+    
+    def _reusable_provisional(self, database_type: str) -> Optional[Tuple[Engine, DatabaseAdapter]]:
+        provisional = self._provisional.get(database_type)
+        if provisional is None or time.monotonic() - provisional[2] > self.FALLBACK_RETRY_SECONDS:
+            return None
+        return provisional[0], provisional[1]
+    
+    def _current_engine(self, database_type: str) -> Optional[Engine]:
+        side = self._sides.get(database_type) or self._provisional.get(database_type)
+        return side[0] if side else None
+    
+    def _discard_side(self, database_type: str, engine: Engine):
+        """Descarta engine e adaptador do banco (se ainda forem os atuais); o próximo acesso os recria"""
+        side = self._sides.get(database_type)
+        if side is not None and side[0] is engine:
+            self._sides.pop(database_type, None)
+            logger.warning(f"Engine do banco {database_type} descartada; será recriada no próximo acesso")
+    
+    def _connection_params(self, database_type: str) -> Dict[str, Any]:
+        prefix = "source" if database_type == 'source' else "destination"
+        return {
+            "user": getattr(settings, f"{prefix}_user"),
+            "password": getattr(settings, f"{prefix}_password"),
+            "host": getattr(settings, f"{prefix}_host"),
+            "port": getattr(settings, f"{prefix}_port"),
+            "database": getattr(settings, f"{prefix}_db")
+        }
+    
+    @staticmethod
+    def _charset_cache_key(params: Dict[str, Any]) -> str:
+        return f"{settings.database_type.lower()}://{params['host']}:{params['port']}/{params['database']}"
+    
+    def _connection_url(self, url_adapter: DatabaseAdapter, params: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """
+        Monta a URL de conexão; com negociação de charset (MySQL), usa o charset gravado em disco
+        e só testa os candidatos com conexões reais quando o banco ainda não é conhecido
+        """
+        if not hasattr(url_adapter, 'negotiate_charset'):
+            return url_adapter.get_connection_url(**params), {}
+        
+        key = self._charset_cache_key(params)
+        charset = connection_cache.get_charset(key)
+        charset_source = "cache"
+        if charset is None:
+            charset = url_adapter.negotiate_charset(**params, timeout_seconds=settings.connection_probe_timeout_seconds)
+            charset_source = "negotiated"
+            if charset is not None:
+                connection_cache.set_charset(key, charset)
             else:
-                source_url = temp_source_adapter.get_connection_url(
-                    settings.source_user,
-                    settings.source_password,
-                    settings.source_host,
-                    settings.source_port,
-                    settings.source_db
-                )
-            self.source_engine = create_engine(
-                source_url,
-                pool_pre_ping=True,
-                pool_recycle=300,
-                pool_timeout=30,
-                max_overflow=10,
-                echo=settings.debug
-            )
+                # Banco inacessível: nada é gravado e a engine é provisória (nova negociação depois de FALLBACK_RETRY_SECONDS)
+                logger.warning(f"Usando charset {url_adapter.DEFAULT_CHARSET} como fallback para {key}")
+                charset = url_adapter.DEFAULT_CHARSET
+                charset_source = "fallback"
+        return url_adapter.get_connection_url(**params, charset=charset), {"charset": charset, "charset_source": charset_source}
+    
+    def _invalidate_charset_on_error(self, engine: Engine, database_type: str, url_adapter: DatabaseAdapter, key: str):
+        """Charset do cache recusado pelo servidor: descarta o valor gravado e a engine, para negociar de novo"""
+        @event.listens_for(engine, "handle_error")
+        def handle_error(context):
+            if url_adapter.is_charset_error(context.original_exception):
+                logger.warning(f"Charset recusado pelo banco {database_type} ({key}); cache invalidado")
+                connection_cache.invalidate(key)
+                self._discard_side(database_type, engine)
+    
+    @staticmethod
+    def _pool_limits() -> Tuple[int, int]:
+        """
+        pool_size e max_overflow do pool de cada banco
+        Cada worker ou faixa paralela usa uma conexão própria: o limite comporta todas as migrações simultâneas
+        (MIGRATION_THREAD_POOL_SIZE) com o máximo de workers (MAX_MIGRATION_WORKERS), mais as contagens do inventário
+        """
+        pool_size = max(5, settings.migration_workers + 1)
+        max_connections = settings.migration_thread_pool_size * settings.max_migration_workers + settings.row_count_workers
+        return pool_size, max(10, max_connections - pool_size)
+    
+    def _create_side(self, database_type: str) -> Tuple[Engine, DatabaseAdapter]:
+        """Cria a engine (pool de conexões) e o adaptador de um banco"""
+        started = time.perf_counter()
+        try:
+            params = self._connection_params(database_type)
+            # Adaptador sem engine, só para montar a URL de conexão
+            url_adapter = DatabaseAdapterFactory.create_adapter(settings.database_type, None, params["database"])
+            url, negotiation = self._connection_url(url_adapter, params)
             
-            # Engine para banco de destino
-            if hasattr(temp_dest_adapter, 'get_connection_url_with_fallback'):
-                destination_url = temp_dest_adapter.get_connection_url_with_fallback(
-                    settings.destination_user,
-                    settings.destination_password,
-                    settings.destination_host,
-                    settings.destination_port,
-                    settings.destination_db
-                )
-            else:
-                destination_url = temp_dest_adapter.get_connection_url(
-                    settings.destination_user,
-                    settings.destination_password,
-                    settings.destination_host,
-                    settings.destination_port,
-                    settings.destination_db
-                )
-            self.destination_engine = create_engine(
-                destination_url,
+            # LOAD DATA LOCAL INFILE só é liberado no cliente quando habilitado explicitamente
+            connect_args = {}
+            if database_type == 'destination' and settings.database_type.lower() == "mysql" and settings.mysql_local_infile:
+                connect_args["local_infile"] = True
+            
+            pool_size, max_overflow = self._pool_limits()
+            engine = create_engine(
+                url,
+                poolclass=instrumented_pool_class(database_type),
+                pool_size=pool_size,
                 pool_pre_ping=True,
                 pool_recycle=300,
                 pool_timeout=30,
-                max_overflow=10,
+                max_overflow=max_overflow,
+                connect_args=connect_args,
                 echo=settings.debug
             )
             
-            logger.info("Conexões com bancos de dados criadas com sucesso")
-            
+            adapter = DatabaseAdapterFactory.create_adapter(settings.database_type, engine, params["database"])
+            adapter.configure_row_counts(
+                settings.row_count_workers,
+                settings.row_count_timeout_seconds,
+                settings.row_count_cache_ttl_seconds
+            )
+            if negotiation:
+                self._invalidate_charset_on_error(engine, database_type, url_adapter, self._charset_cache_key(params))
         except Exception as e:
-            logger.error(f"Erro ao criar conexões com bancos de dados: {e}")
+            logger.error(f"Erro ao criar conexão com banco {database_type}: {e}")
             raise
+        
+        previous = self._provisional.pop(database_type, None)
+        if previous is not None:
+            previous[0].dispose()
+        if negotiation.get("charset_source") == "fallback":
+            self._provisional[database_type] = (engine, adapter, time.monotonic())
+        else:
+            self._sides[database_type] = (engine, adapter)
+        seconds = time.perf_counter() - started
+        self.startup["databases"].setdefault(database_type, {}).update(engine_seconds=round(seconds, 3), **negotiation)
+        record_startup_phase(f"{database_type}.engine", seconds)
+        logger.info(f"Engine e adaptador do banco {database_type} criados em {seconds:.3f}s")
+        return engine, adapter
     
-    def _create_adapters(self):
-        """Cria os adaptadores para os bancos de dados"""
+    def warm_up(self, process_started: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Cria engines e adaptadores dos dois bancos em paralelo e abre a primeira conexão de cada pool
+        process_started (time.perf_counter do início do processo) permite calcular o time-to-ready
+        """
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(self.DATABASE_TYPES), thread_name_prefix="db-warm-up") as pool:
+            connected = dict(zip(self.DATABASE_TYPES, pool.map(self._warm_up_side, self.DATABASE_TYPES)))
+        seconds = time.perf_counter() - started
+        
+        self.startup["warm_up_seconds"] = round(seconds, 3)
+        record_startup_phase("warm_up", seconds)
+        if all(connected.values()) and not self.startup["ready"]:
+            self.startup["ready"] = True
+            self.startup["ready_at"] = datetime.now().isoformat()
+            if process_started is not None:
+                time_to_ready = time.perf_counter() - process_started
+                self.startup["time_to_ready_seconds"] = round(time_to_ready, 3)
+                record_startup_phase("ready", time_to_ready)
+        return self.startup_status()
+    
+    def _warm_up_side(self, database_type: str) -> bool:
+        started = time.perf_counter()
         try:
-            self.source_adapter = DatabaseAdapterFactory.create_adapter(
-                settings.database_type,
-                self.source_engine,
-                settings.source_db
-            )
-            
-            self.destination_adapter = DatabaseAdapterFactory.create_adapter(
-                settings.database_type,
-                self.destination_engine,
-                settings.destination_db
-            )
-            
-            logger.info("Adaptadores de banco de dados criados com sucesso")
-            
+            connected = self._get_side(database_type)[1].test_connection()
         except Exception as e:
-            logger.error(f"Erro ao criar adaptadores de banco de dados: {e}")
-            raise
+            logger.error(f"Erro ao preparar banco {database_type}: {e}")
+            connected = False
+        self.startup["databases"].setdefault(database_type, {}).update(
+            connected=connected,
+            connect_seconds=round(time.perf_counter() - started, 3)
+        )
+        return connected
+    
+    def startup_status(self) -> Dict[str, Any]:
+        """Prontidão e tempos da inicialização (criação das engines, negociação de charset, primeira conexão)"""
+        return {
+            **self.startup,
+            "databases": {name: dict(values) for name, values in self.startup["databases"].items()}
+        }
     
     def test_connections(self) -> Dict[str, bool]:
         """Testa as conexões com os bancos de dados"""
@@ -132,11 +277,13 @@ class DatabaseManager:
         
         return results
     
-    def get_tables_info(self, database_type: str, sort_by_dependencies: bool = False) -> List[Dict]:
+    def get_tables_info(self, database_type: str, sort_by_dependencies: bool = False,
+                        count_strategy: Optional[str] = None) -> List[Dict]:
         """
         Obtém informações das tabelas do banco especificado
         database_type: 'source' ou 'destination'
         sort_by_dependencies: Se True, ordena por dependências de foreign keys
+        count_strategy: 'estimated', 'exact' ou 'cached' (padrão: ROW_COUNT_STRATEGY)
         """
         if database_type not in ['source', 'destination']:
             raise ValueError("database_type deve ser 'source' ou 'destination'")
@@ -144,56 +291,428 @@ class DatabaseManager:
         adapter = self.source_adapter if database_type == 'source' else self.destination_adapter
         
         try:
-            return adapter.get_tables_info(sort_by_dependencies=sort_by_dependencies)
+            return adapter.get_tables_info(
+                sort_by_dependencies=sort_by_dependencies,
+                count_strategy=count_strategy or settings.row_count_strategy
+            )
         except Exception as e:
             logger.error(f"Erro ao obter informações das tabelas do banco {database_type}: {e}")
             raise
     
-    def get_database_summary(self, database_type: str, sort_by_dependencies: bool = False) -> Dict:
+    def get_database_summary(self, database_type: str, sort_by_dependencies: bool = False,
+                             count_strategy: Optional[str] = None, refresh: bool = False) -> Dict:
         """
-        Obtém um resumo do banco de dados especificado
+        Obtém um resumo do banco de dados especificado (guardado no cache de metadados)
         sort_by_dependencies: Se True, ordena por dependências de foreign keys
+        count_strategy: 'estimated', 'exact' ou 'cached' (padrão: ROW_COUNT_STRATEGY)
+        refresh: Se True, ignora o resumo guardado e consulta o banco novamente
         """
         adapter = self.source_adapter if database_type == 'source' else self.destination_adapter
+        count_strategy = count_strategy or settings.row_count_strategy
         
         try:
-            return adapter.get_database_summary(sort_by_dependencies=sort_by_dependencies)
+            return self.metadata_cache.get(
+                ("summary", database_type, sort_by_dependencies, count_strategy),
+                lambda: adapter.get_database_summary(
+                    sort_by_dependencies=sort_by_dependencies,
+                    count_strategy=count_strategy
+                ),
+                refresh=refresh
+            )
         except Exception as e:
             logger.error(f"Erro ao obter resumo do banco {database_type}: {e}")
             raise
     
-    def migrate_table(self, table_name: str, overwrite: bool = False) -> Dict[str, Any]:
+    def get_dependency_graph(self, database_type: str, table_names: List[str]) -> Dict[str, List[str]]:
+        """
+        Obtém o grafo de dependências (foreign keys) entre as tabelas informadas
+        database_type: 'source' ou 'destination'
+        """
+        adapter = self.source_adapter if database_type == 'source' else self.destination_adapter
+        
+        try:
+            return adapter.get_dependency_graph(table_names)
+        except Exception as e:
+            logger.error(f"Erro ao obter dependências do banco {database_type}: {e}")
+            raise
+    
+    def get_dependency_plan(self, database_type: str, refresh: bool = False) -> Dict[str, Any]:
+        """
+        Obtém o grafo de foreign keys de todas as tabelas do banco e a ordem de carga calculada sobre ele
+        O plano fica guardado por DEPENDENCY_GRAPH_TTL_SECONDS para ser reutilizado (API, lotes e cron jobs)
+        """
+        if database_type not in ['source', 'destination']:
+            raise ValueError("database_type deve ser 'source' ou 'destination'")
+        
+        adapter = self.source_adapter if database_type == 'source' else self.destination_adapter
+        
+        def load() -> Dict[str, Any]:
+            started = time.perf_counter()
+            tables = [table["table_name"] for table in adapter.get_tables_info(count_strategy="estimated")]
+            plan = plan_load_order(tables, adapter.get_dependency_graph(tables))
+            plan.update({
+                "database_type": database_type,
+                "tables": tables,
+                "computed_at": datetime.now(),
+                "elapsed_seconds": round(time.perf_counter() - started, 3)
+            })
+            if plan["cycle_groups"]:
+                logger.warning(f"Ciclos de foreign keys no banco {database_type}: {plan['cycle_groups']}")
+            return plan
+        
+        return self.metadata_cache.get(
+            ("dependencies", database_type),
+            load,
+            ttl_seconds=settings.dependency_graph_ttl_seconds,
+            refresh=refresh
+        )
+    
+    def get_table_structure(self, database_type: str, table_name: str, refresh: bool = False) -> Dict[str, Any]:
+        """Obtém a estrutura (CREATE TABLE com foreign keys) de uma tabela, guardada no cache de metadados"""
+        adapter = self.source_adapter if database_type == 'source' else self.destination_adapter
+        with stage(f"{database_type}.get_table_structure", **{"db.table": table_name}):
+            return self.metadata_cache.get(
+                ("structure", database_type, table_name),
+                lambda: adapter.get_table_structure(table_name, remove_foreign_keys=False),
+                refresh=refresh
+            )
+    
+    def invalidate_metadata(self, database_type: Optional[str] = None, table_name: Optional[str] = None) -> int:
+        """
+        Descarta metadados em cache: de um banco (resumos, grafo e, se informada, a estrutura da tabela) ou de tudo
+        Chamado após migrações e reparos, que alteram tabelas e contagens do destino
+        """
+        if database_type is None:
+            for adapter in (self.source_adapter, self.destination_adapter):
+                adapter.invalidate_row_counts()
+            return self.metadata_cache.invalidate()
+        
+        adapter = self.source_adapter if database_type == 'source' else self.destination_adapter
+        adapter.invalidate_row_counts(table_name)
+        removed = self.metadata_cache.invalidate("summary", database_type)
+        removed += self.metadata_cache.invalidate("dependencies", database_type)
+        if table_name is None:
+            removed += self.metadata_cache.invalidate("structure", database_type)
+        else:
+            removed += self.metadata_cache.invalidate("structure", database_type, table_name)
+        return removed
+    
+    def _bulk_load_options(self) -> Dict[str, bool]:
+        """Opções do perfil de carga em massa configuradas (True = desativar o recurso durante a carga)"""
+        return {
+            "unique_checks": settings.bulk_load_disable_unique_checks,
+            "foreign_key_checks": settings.bulk_load_disable_foreign_key_checks,
+            "binlog": settings.bulk_load_disable_binlog,
+            "synchronous_commit": settings.bulk_load_async_commit
+        }
+    
+    def _record_throughput(self, table_name: str, signature: str, rows_per_second: float) -> Dict[str, float]:
+        """Guarda o throughput da cópia por combinação de configurações, para comparar execuções com e sem o perfil"""
+        history = dict(sync_state.get_table_state(table_name).get("throughput", {}))
+        history[signature] = rows_per_second
+        sync_state.update_table_state(table_name, throughput=history)
+        return history
+    
+    def _copy_table_data(self, table_name: str, load_strategy: str = "insert", pipelined: bool = False,
+                         queue_size: Optional[int] = None, parallel_ranges: int = 1,
+                         upsert_keys: Optional[List[str]] = None, target_table: Optional[str] = None,
+                         bulk_load: bool = False, progress: Optional[MigrationProgress] = None) -> Dict[str, Any]:
+        """
+        Copia os dados da tabela da origem para o destino, em lotes
+        Com upsert_keys, grava por upsert na tabela existente em vez de usar a estratégia de carga
+        target_table: tabela gravada no destino (ex: tabela sombra); por padrão, a mesma da origem
+        bulk_load: aplica o perfil de carga em massa às conexões de carga e usa lotes (transações) maiores
+        progress: recebe os registros gravados a cada lote e interrompe a cópia se o job for cancelado
+        Retorna o total de registros e as estatísticas do modo de cópia usado
+        """
+        target_table = target_table or table_name
+        session_settings = self.destination_adapter.get_bulk_load_settings(self._bulk_load_options()) if bulk_load else {}
+        batch_size = settings.bulk_load_batch_size if bulk_load else settings.migration_batch_size
+        
+        started = time.perf_counter()
+        strategy = "upsert" if upsert_keys else load_strategy
+        copy_attributes = {
+            "db.table": table_name,
+            "db.target_table": target_table,
+            "sync.load_strategy": strategy,
+            "sync.batch_size": batch_size,
+            "sync.pipelined": pipelined,
+            "sync.parallel_ranges": parallel_ranges,
+            "sync.bulk_load": bulk_load
+        }
+        with stage("copy", **copy_attributes):
+            with self.destination_adapter.bulk_load_profile(target_table, session_settings) as profile:
+                copy_stats = self._copy_batches(
+                    table_name, target_table, batch_size, load_strategy, pipelined, queue_size, parallel_ranges, upsert_keys,
+                    progress
+                )
+        seconds = time.perf_counter() - started
+        rows_per_second = round(copy_stats["records"] / seconds, 2) if seconds > 0 else 0.0
+        
+        # Histórico por estratégia e configurações: "antes" é a última cópia sem o perfil, "depois" a atual
+        baseline_signature = f"{strategy}|default"
+        signature = baseline_signature
+        if bulk_load:
+            knobs = [f"{name}={value}" for name, value in sorted(session_settings.items())] + [f"batch_size={batch_size}"]
+            signature = f"{strategy}|" + ",".join(knobs)
+        history = self._record_throughput(table_name, signature, rows_per_second)
+        
+        if bulk_load:
+            baseline = history.get(baseline_signature)
+            copy_stats["bulk_load"] = {
+                "settings": {
+                    name: {"before": profile["previous"].get(name), "applied": value}
+                    for name, value in session_settings.items()
+                },
+                "batch_size": batch_size,
+                "profile": signature,
+                "rows_per_second": rows_per_second,
+                "baseline_rows_per_second": baseline,
+                "speedup": round(rows_per_second / baseline, 2) if baseline else None,
+                "history": history
+            }
+        return copy_stats
+    
+    def _copy_batches(self, table_name: str, target_table: str, batch_size: int, load_strategy: str, pipelined: bool,
+                      queue_size: Optional[int], parallel_ranges: int, upsert_keys: Optional[List[str]],
+                      progress: Optional[MigrationProgress] = None) -> Dict[str, Any]:
+        """Executa a cópia em lotes (sequencial, em pipeline ou por faixas da chave)"""
+        if upsert_keys:
+            write_batch = lambda batch: self.destination_adapter.upsert_data(target_table, batch, upsert_keys)
+        else:
+            write_batch = lambda batch: self.destination_adapter.load_data(target_table, batch, load_strategy)
+        write_batch = self._instrument_writes(write_batch, table_name, progress)
+        
+        # Cópia paralela por faixas da chave primária (uma tabela grande dividida em K partes)
+        if parallel_ranges > 1:
+            primary_key = self.source_adapter.get_primary_key_columns(table_name)
+            if primary_key:
+                if pipelined:
+                    logger.warning(f"Tabela '{table_name}': pipeline desativado na cópia por faixas (cada faixa já usa uma thread própria)")
+                ranges = plan_key_ranges(self.source_adapter, table_name, primary_key[0], parallel_ranges)
+                range_stats = RangeParallelCopy(
+                    self.source_adapter,
+                    self.destination_adapter,
+                    table_name,
+                    primary_key[0],
+                    ranges,
+                    batch_size,
+                    load_strategy,
+                    upsert_keys=upsert_keys,
+                    target_table=target_table,
+                    write_batch=write_batch
+                ).run()
+                return {"records": range_stats["records"], "ranges": range_stats}
+            logger.warning(f"Tabela '{table_name}' não possui chave primária; copiando sem divisão em faixas")
+        
+        logger.info(f"Copiando dados da tabela '{table_name}' em lotes de {batch_size} registros")
+        batches = timed_batches(self.source_adapter.iter_table_data(table_name, batch_size=batch_size), table_name)
+        
+        if pipelined:
+            pipeline_stats = PipelinedCopy(
+                batches,
+                write_batch,
+                queue_size=queue_size or settings.migration_pipeline_queue_size
+            ).run()
+            return {"records": pipeline_stats["records"], "pipeline": pipeline_stats}
+        
+        records = 0
+        for batch in batches:
+            if not write_batch(batch):
+                raise Exception(f"Falha ao inserir dados na tabela '{target_table}' do destino")
+            records += len(batch)
+        return {"records": records}
+    
+    def _instrument_writes(self, write_batch: Callable[[List[Dict[str, Any]]], bool], table_name: str,
+                           progress: Optional[MigrationProgress] = None) -> Callable[[List[Dict[str, Any]]], bool]:
+        """
+        Envolve a gravação de um lote: mede a latência e registra registros e bytes gravados (métricas e progresso)
+        Com progress, verifica o cancelamento do job antes de cada lote
+        """
+        try:
+            row_bytes = self.get_table_estimates([table_name])[table_name]["row_bytes"]
+        except Exception as e:
+            logger.warning(f"Tamanho médio dos registros da tabela '{table_name}' indisponível: {e}")
+            row_bytes = 0
+        # Etapa e span da cópia capturados aqui: os lotes podem ser gravados em outras threads (pipeline, faixas)
+        timings, counters = current_timings(), current_counters()
+        
+        def write(batch: List[Dict[str, Any]]) -> bool:
+            if progress is not None:
+                progress.check_cancelled()
+            started = time.perf_counter()
+            if not write_batch(batch):
+                return False
+            seconds = time.perf_counter() - started
+            record_batch_written(table_name, len(batch), row_bytes, seconds)
+            record_batch("copy.write", seconds, timings, counters, rows=len(batch), bytes_=int(len(batch) * row_bytes))
+            if progress is not None:
+                progress.add_rows(table_name, len(batch))
+            return True
+        return write
+    
+    def get_table_estimates(self, table_names: List[str]) -> Dict[str, Dict[str, float]]:
+        """
+        Registros estimados e tamanho médio de registro (bytes) das tabelas da origem, para o progresso de jobs
+        Usa o resumo estimado do cache de metadados: não conta registros na origem
+        """
+        summary = self.get_database_summary('source', count_strategy=COUNT_ESTIMATED)
+        tables = {table["table_name"]: table for table in summary.get("tables", [])}
+        estimates = {}
+        for table_name in table_names:
+            table = tables.get(table_name, {})
+            rows = table.get("row_count") or 0
+            data_length = table.get("data_length") or 0
+            estimates[table_name] = {"rows": rows, "row_bytes": data_length / rows if rows else 0}
+        return estimates
+    
+    def migrate_table(self, table_name: str, overwrite: bool = False, pipelined: bool = False,
+                      queue_size: Optional[int] = None, load_strategy: str = "insert",
+                      parallel_ranges: int = 1, mode: str = SYNC_MODE_FULL,
+                      watermark_column: Optional[str] = None, delete_missing: bool = False,
+                      fast_load: bool = False, defer_definitions: bool = False,
+                      bulk_load: bool = False, defer_foreign_keys: bool = False,
+                      progress: Optional[MigrationProgress] = None) -> Dict[str, Any]:
         """
         Migra uma tabela do banco de origem para o banco de destino
         
         Args:
             table_name: Nome da tabela a ser migrada
             overwrite: Se True, sobrescreve a tabela se ela existir no destino
+            pipelined: Se True, lê o próximo lote da origem enquanto o atual é gravado no destino
+            queue_size: Número máximo de lotes em espera entre leitor e escritor (modo pipeline)
+            load_strategy: Estratégia de carga no destino (ex: 'insert', 'load_data', 'copy')
+            parallel_ranges: Se maior que 1, divide a tabela em faixas da chave primária copiadas em paralelo
+            mode: 'full' recria a tabela e copia tudo; 'incremental' copia só os registros após a marca d'água;
+                  'merge' faz upsert de todos os registros na tabela existente, sem recriá-la;
+                  'shadow' carrega uma tabela sombra e a troca pela atual com um RENAME atômico
+            watermark_column: Coluna monotônica usada como marca d'água (padrão: a configurada para a tabela)
+            delete_missing: No modo merge, remove do destino os registros que não existem mais na origem
+            fast_load: Cria a tabela só com a chave primária e adiciona índices secundários e foreign keys após a carga
+            defer_definitions: Com fast_load, não aplica os índices/FKs e os devolve no resultado (aplicados pelo lote ao final)
+            bulk_load: Aplica o perfil de sessão de carga em massa nas conexões de carga do destino (ex: unique_checks=0)
+            defer_foreign_keys: Cria a tabela sem foreign keys e as devolve no resultado, para serem criadas
+                                depois da carga de todo o grupo (tabelas em ciclo de dependências)
+            progress: Progresso do job que executa a migração (registros copiados e pedido de cancelamento)
         
         Returns:
-            Dict com informações sobre a migração
+            Dict com informações sobre a migração, incluindo o tempo por etapa (stages) e o trace_id dos spans
         """
+        with migration_trace("migrate_table", **{"db.table": table_name, "sync.mode": mode, "sync.load_strategy": load_strategy}) as timings:
+            result = self._migrate_table(
+                table_name,
+                overwrite,
+                pipelined=pipelined,
+                queue_size=queue_size,
+                load_strategy=load_strategy,
+                parallel_ranges=parallel_ranges,
+                mode=mode,
+                watermark_column=watermark_column,
+                delete_missing=delete_missing,
+                fast_load=fast_load,
+                defer_definitions=defer_definitions,
+                bulk_load=bulk_load,
+                defer_foreign_keys=defer_foreign_keys,
+                progress=progress
+            )
+            annotate(**{"sync.success": bool(result.get("success"))})
+        result["stages"] = timings.breakdown()
+        result["trace_id"] = timings.trace_id
+        return result
+    
+    def _migrate_table(self, table_name: str, overwrite: bool = False, pipelined: bool = False,
+                       queue_size: Optional[int] = None, load_strategy: str = "insert",
+                       parallel_ranges: int = 1, mode: str = SYNC_MODE_FULL,
+                       watermark_column: Optional[str] = None, delete_missing: bool = False,
+                       fast_load: bool = False, defer_definitions: bool = False,
+                       bulk_load: bool = False, defer_foreign_keys: bool = False,
+                       progress: Optional[MigrationProgress] = None) -> Dict[str, Any]:
+        """Executa a migração de migrate_table (tempos de cada etapa registrados em spans)"""
         try:
-            logger.info(f"Iniciando migração da tabela '{table_name}' com overwrite={overwrite}")
+            logger.info(f"Iniciando migração da tabela '{table_name}' com mode={mode}, overwrite={overwrite}, pipelined={pipelined}, load_strategy={load_strategy}")
+            
+            if mode not in self.SYNC_MODES:
+                raise ValueError(f"Modo de sincronização '{mode}' inválido. Modos suportados: {', '.join(self.SYNC_MODES)}")
+            
+            # Valida a estratégia antes de alterar qualquer coisa no destino
+            if load_strategy not in self.destination_adapter.get_load_strategies():
+                supported = ", ".join(self.destination_adapter.get_load_strategies())
+                raise ValueError(f"Estratégia de carga '{load_strategy}' não suportada pelo destino. Estratégias suportadas: {supported}")
             
             # Verifica se a tabela existe no source
-            if not self.source_adapter.table_exists(table_name):
+            with stage("source.table_exists", **{"db.table": table_name}):
+                table_exists_source = self.source_adapter.table_exists(table_name)
+            if not table_exists_source:
                 raise ValueError(f"Tabela '{table_name}' não existe no banco de origem")
             
             # Verifica se a tabela existe no destination
-            table_exists_dest = self.destination_adapter.table_exists(table_name)
+            with stage("destination.table_exists", **{"db.table": table_name}):
+                table_exists_dest = self.destination_adapter.table_exists(table_name)
             logger.info(f"Tabela '{table_name}' existe no destino: {table_exists_dest}")
             
-
+            # Coluna de marca d'água: informada na chamada ou configurada para a tabela
+            watermark_column = watermark_column or sync_state.get_table_state(table_name).get("watermark_column")
+            if mode == self.SYNC_MODE_INCREMENTAL:
+                if not watermark_column:
+                    logger.warning(f"Tabela '{table_name}' sem coluna de marca d'água configurada; usando sincronização completa")
+                    mode = self.SYNC_MODE_FULL
+                elif table_exists_dest:
+                    return self._migrate_table_incremental(table_name, watermark_column, progress=progress)
+                else:
+                    logger.info(f"Tabela '{table_name}' não existe no destino; primeira sincronização incremental será completa")
+            elif mode == self.SYNC_MODE_MERGE:
+                if table_exists_dest:
+                    return self._migrate_table_merge(
+                        table_name,
+                        pipelined=pipelined,
+                        queue_size=queue_size,
+                        parallel_ranges=parallel_ranges,
+                        delete_missing=delete_missing,
+                        bulk_load=bulk_load,
+                        progress=progress
+                    )
+                logger.info(f"Tabela '{table_name}' não existe no destino; primeira sincronização merge será completa")
+                mode = self.SYNC_MODE_FULL
+            elif mode == self.SYNC_MODE_SHADOW:
+                if table_exists_dest:
+                    return self._migrate_table_shadow(
+                        table_name,
+                        load_strategy=load_strategy,
+                        pipelined=pipelined,
+                        queue_size=queue_size,
+                        parallel_ranges=parallel_ranges,
+                        fast_load=fast_load,
+                        bulk_load=bulk_load,
+                        progress=progress
+                    )
+                mode = self.SYNC_MODE_FULL
+            
+            # Lê a marca d'água antes da cópia: o que mudar durante a cópia entra na próxima execução
+            new_watermark = None
+            if watermark_column:
+                with stage("source.get_key_bounds", **{"db.table": table_name, "db.column": watermark_column}):
+                    new_watermark = self.source_adapter.get_key_bounds(table_name, watermark_column)[1]
             
             # Obtém estrutura da tabela do source (preservando foreign keys)
-            structure_info = self.source_adapter.get_table_structure(table_name, remove_foreign_keys=False)
+            structure_info = self.get_table_structure('source', table_name)
             create_table_sql = structure_info["create_table_sql"]
             
+            # Perfil de carga rápida: cada registro não paga manutenção de índices nem checagem de FKs
+            deferred_definitions = []
+            if fast_load:
+                create_table_sql, indexes, foreign_keys = self.destination_adapter.split_deferred_definitions(create_table_sql)
+                deferred_definitions = indexes + foreign_keys
+                logger.info(f"Tabela '{table_name}': {len(indexes)} índices e {len(foreign_keys)} foreign keys criados após a carga")
+            elif defer_foreign_keys:
+                create_table_sql, deferred_definitions = self.destination_adapter.split_foreign_keys(create_table_sql)
+                logger.info(f"Tabela '{table_name}' em ciclo de dependências: {len(deferred_definitions)} foreign keys criadas após a carga do grupo")
+            
             # Remove tabela do destination se existir e overwrite=True
             if table_exists_dest and overwrite:
                 logger.info(f"Removendo tabela existente '{table_name}' do destino (overwrite={overwrite})")
-                if not self.destination_adapter.drop_table(table_name):
+                with stage("destination.drop_table", **{"db.table": table_name}):
+                    dropped = self.destination_adapter.drop_table(table_name)
+                if not dropped:
                     raise Exception(f"Falha ao remover tabela existente '{table_name}' do destino")
                 logger.info(f"Tabela '{table_name}' removida com sucesso")
             elif table_exists_dest and not overwrite:
@@ -202,26 +721,56 @@ class DatabaseManager:
             
             # Cria tabela no destination
             logger.info(f"Criando tabela '{table_name}' no destino")
-            if not self.destination_adapter.create_table(table_name, create_table_sql):
+            with stage("destination.create_table", **{"db.table": table_name}):
+                created = self.destination_adapter.create_table(table_name, create_table_sql)
+            if not created:
                 raise Exception(f"Falha ao criar tabela '{table_name}' no destino")
             
-            # Obtém dados da tabela do source
-            logger.info(f"Obtendo dados da tabela '{table_name}' do source")
-            data = self.source_adapter.get_table_data(table_name)
+            # Copia os dados em lotes: a memória fica limitada ao tamanho do lote, não da tabela
+            copy_started = time.perf_counter()
+            copy_stats = self._copy_table_data(
+                table_name,
+                load_strategy=load_strategy,
+                pipelined=pipelined,
+                queue_size=queue_size,
+                parallel_ranges=parallel_ranges,
+                bulk_load=bulk_load,
+                progress=progress
+            )
+            records_migrated = copy_stats["records"]
             
-            # Insere dados no destination
-            if data:
-                logger.info(f"Inserindo {len(data)} registros na tabela '{table_name}' do destino")
-                if not self.destination_adapter.insert_data(table_name, data):
-                    raise Exception(f"Falha ao inserir dados na tabela '{table_name}' do destino")
+            copy_seconds = time.perf_counter() - copy_started
+            rows_per_second = round(records_migrated / copy_seconds, 2) if copy_seconds > 0 else 0.0
+            logger.info(f"Tabela '{table_name}': {records_migrated} registros em {copy_seconds:.2f}s ({rows_per_second} registros/s, {load_strategy})")
+            
+            deferred = None
+            if fast_load or defer_foreign_keys:
+                deferred = {"definitions": deferred_definitions, "applied": False}
+                if fast_load and not defer_definitions:
+                    deferred = self.apply_deferred_definitions(table_name, deferred_definitions)
+            
+            if watermark_column and new_watermark is not None:
+                sync_state.update_table_state(
+                    table_name,
+                    watermark_column=watermark_column,
+                    watermark=encode_state_value(new_watermark)
+                )
             
             logger.info(f"Migração da tabela '{table_name}' concluída com sucesso")
             
             return {
                 "success": True,
                 "table_name": table_name,
-                "records_migrated": len(data),
+                "records_migrated": records_migrated,
                 "overwritten": table_exists_dest and overwrite,
+                "mode": mode,
+                "load_strategy": load_strategy,
+                "copy_seconds": round(copy_seconds, 3),
+                "rows_per_second": rows_per_second,
+                "pipeline": copy_stats.get("pipeline"),
+                "ranges": copy_stats.get("ranges"),
+                "bulk_load": copy_stats.get("bulk_load"),
+                "deferred": deferred,
                 "message": f"Tabela '{table_name}' migrada com sucesso"
             }
             
@@ -235,5 +784,334 @@ class DatabaseManager:
             }
 
 
+    def apply_deferred_definitions(self, table_name: str, definitions: List[str]) -> Dict[str, Any]:
+        """Cria os índices secundários e foreign keys adiados pelo perfil de carga rápida"""
+        started = time.perf_counter()
+        with stage("destination.add_table_definitions", **{"db.table": table_name, "db.definitions": len(definitions)}):
+            self.destination_adapter.add_table_definitions(table_name, definitions)
+        seconds = time.perf_counter() - started
+        logger.info(f"Tabela '{table_name}': {len(definitions)} índices/foreign keys criados em {seconds:.2f}s")
+        return {"definitions": definitions, "applied": True, "seconds": round(seconds, 3)}
+    
+    def _migrate_table_shadow(self, table_name: str, load_strategy: str = "insert", pipelined: bool = False,
+                              queue_size: Optional[int] = None, parallel_ranges: int = 1,
+                              fast_load: bool = False, bulk_load: bool = False,
+                              progress: Optional[MigrationProgress] = None) -> Dict[str, Any]:
+        """
+        Carrega os dados em uma tabela sombra e a troca pela tabela atual com um RENAME atômico
+        Leitores continuam vendo a tabela antiga completa até a troca
+        """
+        shadow_table = f"{table_name}{self.SHADOW_SUFFIX}"
+        old_table = f"{table_name}{self.OLD_SUFFIX}"
+        
+        # RENAME leva junto as foreign keys de outras tabelas, que passariam a apontar para a tabela antiga
+        with stage("destination.get_referencing_tables", **{"db.table": table_name}):
+            referencing = self.destination_adapter.get_referencing_tables(table_name)
+        if referencing:
+            raise ValueError(
+                f"Tabela '{table_name}' é referenciada por foreign keys de {', '.join(referencing)}; "
+                f"use o modo 'merge' ou overwrite"
+            )
+        
+        # Restos de execuções interrompidas
+        for leftover in (shadow_table, old_table):
+            if self.destination_adapter.table_exists(leftover):
+                self.destination_adapter.drop_table(leftover)
+        
+        # Nomes de foreign keys são únicos por banco no MySQL: são criadas só depois da troca
+        structure_info = self.get_table_structure('source', table_name)
+        if fast_load:
+            create_table_sql, indexes, foreign_keys = self.destination_adapter.split_deferred_definitions(structure_info["create_table_sql"])
+        else:
+            create_table_sql, foreign_keys = self.destination_adapter.split_foreign_keys(structure_info["create_table_sql"])
+            indexes = []
+        create_table_sql = self.destination_adapter.rename_create_table_sql(create_table_sql, shadow_table)
+        
+        logger.info(f"Criando tabela sombra '{shadow_table}' no destino")
+        with stage("destination.create_table", **{"db.table": shadow_table}):
+            created = self.destination_adapter.create_table(shadow_table, create_table_sql)
+        if not created:
+            raise Exception(f"Falha ao criar tabela sombra '{shadow_table}' no destino")
+        
+        try:
+            copy_started = time.perf_counter()
+            copy_stats = self._copy_table_data(
+                table_name,
+                load_strategy=load_strategy,
+                pipelined=pipelined,
+                queue_size=queue_size,
+                parallel_ranges=parallel_ranges,
+                target_table=shadow_table,
+                bulk_load=bulk_load,
+                progress=progress
+            )
+            copy_seconds = time.perf_counter() - copy_started
+            
+            # Índices adiados entram na sombra antes da troca: leitores nunca veem a tabela sem índices
+            if indexes:
+                self.apply_deferred_definitions(shadow_table, indexes)
+            
+            swap_started = time.perf_counter()
+            with stage("destination.swap_tables", **{"db.table": table_name}):
+                self.destination_adapter.swap_tables(table_name, shadow_table, old_table)
+            swap_seconds = time.perf_counter() - swap_started
+        except Exception:
+            self.destination_adapter.drop_table(shadow_table)
+            raise
+        
+        logger.info(f"Tabela sombra '{shadow_table}' trocada por '{table_name}' em {swap_seconds:.3f}s")
+        
+        # Após a troca os dados novos já estão visíveis: falhas daqui em diante não desfazem a migração
+        try:
+            with stage("destination.drop_table", **{"db.table": old_table}):
+                dropped = self.destination_adapter.drop_table(old_table)
+        except Exception as e:
+            logger.warning(f"Erro ao remover a tabela substituída '{old_table}' do destino: {e}")
+            dropped = False
+        if not dropped:
+            logger.warning(f"Falha ao remover a tabela substituída '{old_table}' do destino")
+        
+        foreign_keys_error = None
+        if foreign_keys:
+            try:
+                with stage("destination.add_table_definitions", **{"db.table": table_name, "db.definitions": len(foreign_keys)}):
+                    self.destination_adapter.add_table_definitions(table_name, foreign_keys)
+            except Exception as e:
+                foreign_keys_error = str(e)
+                logger.error(f"Tabela '{table_name}' trocada, mas as foreign keys não foram recriadas: {e}")
+        
+        records_migrated = copy_stats["records"]
+        rows_per_second = round(records_migrated / copy_seconds, 2) if copy_seconds > 0 else 0.0
+        return {
+            "success": True,
+            "table_name": table_name,
+            "records_migrated": records_migrated,
+            "overwritten": True,
+            "mode": self.SYNC_MODE_SHADOW,
+            "load_strategy": load_strategy,
+            "copy_seconds": round(copy_seconds, 3),
+            "rows_per_second": rows_per_second,
+            "pipeline": copy_stats.get("pipeline"),
+            "ranges": copy_stats.get("ranges"),
+            "bulk_load": copy_stats.get("bulk_load"),
+            "shadow": {
+                "shadow_table": shadow_table,
+                "swap_seconds": round(swap_seconds, 3),
+                "old_table_dropped": dropped,
+                "foreign_keys_added": 0 if foreign_keys_error else len(foreign_keys),
+                "deferred_indexes": len(indexes)
+            },
+            "foreign_keys_error": foreign_keys_error,
+            "message": (
+                f"Tabela '{table_name}' recarregada em tabela sombra e trocada atomicamente"
+                + (f"; foreign keys não recriadas: {foreign_keys_error}" if foreign_keys_error else "")
+            )
+        }
+    
+    def _migrate_table_merge(self, table_name: str, pipelined: bool = False, queue_size: Optional[int] = None,
+                             parallel_ranges: int = 1, delete_missing: bool = False,
+                             bulk_load: bool = False, progress: Optional[MigrationProgress] = None) -> Dict[str, Any]:
+        """
+        Sincroniza a tabela existente no destino por upsert em lotes (sem DROP/CREATE),
+        preservando a tabela, seus índices e o cache do destino entre sincronizações
+        """
+        key_columns = self.source_adapter.get_primary_key_columns(table_name)
+        if not key_columns:
+            raise ValueError(f"Sincronização merge da tabela '{table_name}' requer chave primária")
+        
+        copy_started = time.perf_counter()
+        copy_stats = self._copy_table_data(
+            table_name,
+            pipelined=pipelined,
+            queue_size=queue_size,
+            parallel_ranges=parallel_ranges,
+            upsert_keys=key_columns,
+            bulk_load=bulk_load,
+            progress=progress
+        )
+        records_migrated = copy_stats["records"]
+        copy_seconds = time.perf_counter() - copy_started
+        rows_per_second = round(records_migrated / copy_seconds, 2) if copy_seconds > 0 else 0.0
+        
+        deleted = None
+        if delete_missing:
+            with stage("delete_missing_rows", **{"db.table": table_name}):
+                deleted = self._delete_missing_rows(table_name, key_columns)
+        
+        logger.info(f"Merge da tabela '{table_name}' concluído: {records_migrated} registros em {copy_seconds:.2f}s, {deleted or 0} removidos")
+        
+        return {
+            "success": True,
+            "table_name": table_name,
+            "records_migrated": records_migrated,
+            "records_deleted": deleted,
+            "overwritten": False,
+            "mode": self.SYNC_MODE_MERGE,
+            "load_strategy": "upsert",
+            "copy_seconds": round(copy_seconds, 3),
+            "rows_per_second": rows_per_second,
+            "pipeline": copy_stats.get("pipeline"),
+            "ranges": copy_stats.get("ranges"),
+            "bulk_load": copy_stats.get("bulk_load"),
+            "message": f"Tabela '{table_name}' sincronizada por merge"
+        }
+    
+    def _delete_missing_rows(self, table_name: str, key_columns: List[str]) -> int:
+        """
+        Remove do destino os registros cujas chaves não existem na origem
+        Compara as chaves por faixas, para limitar a memória ao tamanho de uma faixa
+        """
+        batch_size = settings.migration_batch_size
+        parts = self.destination_adapter.estimate_row_count(table_name) // self.MERGE_DELETE_RANGE_ROWS + 1
+        ranges = plan_key_ranges(self.destination_adapter, table_name, key_columns[0], parts)
+        
+        deleted = 0
+        for lower, upper in ranges:
+            source_keys = set()
+            for batch in self.source_adapter.iter_key_values(table_name, key_columns, batch_size, key_columns[0], lower, upper):
+                source_keys.update(batch)
+            
+            missing = []
+            for batch in self.destination_adapter.iter_key_values(table_name, key_columns, batch_size, key_columns[0], lower, upper):
+                missing.extend(dict(zip(key_columns, key)) for key in batch if key not in source_keys)
+            
+            deleted += self.destination_adapter.delete_rows(table_name, key_columns, missing)
+        
+        logger.info(f"Tabela '{table_name}': {deleted} registros ausentes na origem removidos do destino")
+        return deleted
+    
+    def _migrate_table_incremental(self, table_name: str, watermark_column: str,
+                                   progress: Optional[MigrationProgress] = None) -> Dict[str, Any]:
+        """
+        Sincroniza apenas os registros com watermark_column >= última marca d'água,
+        fazendo upsert pela chave primária na tabela existente do destino
+        """
+        key_columns = self.source_adapter.get_primary_key_columns(table_name)
+        if not key_columns:
+            raise ValueError(f"Sincronização incremental da tabela '{table_name}' requer chave primária")
+        
+        # Se a coluna configurada mudou, a marca d'água anterior não vale mais
+        state = sync_state.get_table_state(table_name)
+        previous_watermark = sync_state.get_watermark(table_name) if state.get("watermark_column") == watermark_column else None
+        
+        # Lê a nova marca antes da cópia; >= na próxima execução cobre registros alterados no mesmo instante
+        with stage("source.get_key_bounds", **{"db.table": table_name, "db.column": watermark_column}):
+            new_watermark = self.source_adapter.get_key_bounds(table_name, watermark_column)[1]
+        logger.info(f"Sincronização incremental da tabela '{table_name}' por '{watermark_column}': {previous_watermark} -> {new_watermark}")
+        
+        copy_started = time.perf_counter()
+        records_migrated = 0
+        with stage("copy", **{"db.table": table_name, "sync.load_strategy": "upsert"}):
+            write_batch = self._instrument_writes(
+                lambda batch: self.destination_adapter.upsert_data(table_name, batch, key_columns),
+                table_name,
+                progress
+            )
+            batches = timed_batches(
+                self.source_adapter.iter_table_data(
+                    table_name,
+                    batch_size=settings.migration_batch_size,
+                    key_column=watermark_column,
+                    lower=previous_watermark
+                ),
+                table_name
+            )
+            for batch in batches:
+                if not write_batch(batch):
+                    raise Exception(f"Falha ao atualizar dados na tabela '{table_name}' do destino")
+                records_migrated += len(batch)
+        
+        copy_seconds = time.perf_counter() - copy_started
+        rows_per_second = round(records_migrated / copy_seconds, 2) if copy_seconds > 0 else 0.0
+        
+        if new_watermark is not None:
+            sync_state.update_table_state(
+                table_name,
+                watermark_column=watermark_column,
+                watermark=encode_state_value(new_watermark)
+            )
+        
+        logger.info(f"Sincronização incremental da tabela '{table_name}' concluída: {records_migrated} registros em {copy_seconds:.2f}s")
+        
+        return {
+            "success": True,
+            "table_name": table_name,
+            "records_migrated": records_migrated,
+            "overwritten": False,
+            "mode": self.SYNC_MODE_INCREMENTAL,
+            "load_strategy": "upsert",
+            "copy_seconds": round(copy_seconds, 3),
+            "rows_per_second": rows_per_second,
+            "incremental": {
+                "watermark_column": watermark_column,
+                "key_columns": key_columns,
+                "previous_watermark": None if previous_watermark is None else str(previous_watermark),
+                "watermark": None if new_watermark is None else str(new_watermark)
+            },
+            "message": f"Tabela '{table_name}' sincronizada incrementalmente"
+        }
+
+    def diff_table(self, table_name: str, repair: bool = False, chunks: Optional[int] = None,
+                   min_chunk_rows: Optional[int] = None, load_strategy: str = "insert") -> Dict[str, Any]:
+        """
+        Compara uma tabela entre origem e destino por checksums de faixas da chave primária
+        
+        Args:
+            table_name: Nome da tabela
+            repair: Se True, copia novamente apenas as faixas divergentes
+            chunks: Número de faixas iniciais (padrão: DIFF_CHUNK_COUNT)
+            min_chunk_rows: Faixas com até esse número de registros não são mais bissectadas (padrão: DIFF_MIN_CHUNK_ROWS)
+            load_strategy: Estratégia de carga usada na recópia
+        
+        Returns:
+            Dict com as faixas divergentes e, se repair=True, o resultado da recópia
+        """
+        if load_strategy not in self.destination_adapter.get_load_strategies():
+            raise ValueError(
+                f"Estratégia de carga '{load_strategy}' não suportada pelo destino. "
+                f"Estratégias suportadas: {', '.join(self.destination_adapter.get_load_strategies())}"
+            )
+        if not self.destination_adapter.table_exists(table_name):
+            raise ValueError(f"Tabela '{table_name}' não existe no destino")
+        
+        key_columns = self.source_adapter.get_primary_key_columns(table_name)
+        if not key_columns:
+            raise ValueError(f"Comparação por checksum da tabela '{table_name}' requer chave primária")
+        
+        columns = self.source_adapter.get_column_names(table_name)
+        missing = [col for col in columns if col not in self.destination_adapter.get_column_names(table_name)]
+        if missing:
+            raise ValueError(f"Colunas ausentes na tabela '{table_name}' do destino: {', '.join(missing)}")
+        
+        # Faixas pela primeira coluna da chave: também particiona chaves compostas
+        diff = ChunkedChecksumDiff(
+            self.source_adapter,
+            self.destination_adapter,
+            table_name,
+            key_columns[0],
+            columns,
+            chunks=chunks or settings.diff_chunk_count,
+            min_chunk_rows=min_chunk_rows if min_chunk_rows is not None else settings.diff_min_chunk_rows
+        )
+        result = diff.find_divergent_ranges()
+        divergent = result["divergent_ranges"]
+        logger.info(f"Tabela '{table_name}': {len(divergent)} faixas divergentes em {result['chunks_compared']} comparadas ({result['checksum']})")
+        
+        result["repair"] = None
+        if repair and divergent:
+            result["repair"] = diff.repair(divergent, settings.migration_batch_size, load_strategy)
+        
+        result["in_sync"] = not divergent
+        result["divergent_ranges"] = [
+            {
+                **r,
+                "lower": None if r["lower"] is None else str(r["lower"]),
+                "upper": None if r["upper"] is None else str(r["upper"])
+            }
+            for r in divergent
+        ]
+        return result
+
+
 # Instância global do gerenciador de banco de dados
 db_manager = DatabaseManager() 
\ No newline at end of file
@@ -0,0 +1,133 @@
+from typing import Dict, List, Any
+
+
+def _restrict(tables: List[str], dependencies: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """Mantém só as dependências entre as tabelas informadas, sem repetições"""
+    table_set = set(tables)
+    restricted = {}
+    for table in tables:
+        parents = []
+        for parent in dependencies.get(table, []):
+            if parent in table_set and parent not in parents:
+                parents.append(parent)
+        restricted[table] = parents
+    return restricted
+
+
+def strongly_connected_components(tables: List[str], dependencies: Dict[str, List[str]]) -> List[List[str]]:
+    """
+    Componentes fortemente conexos do grafo de foreign keys (algoritmo de Tarjan, iterativo)
+    Tabelas de um mesmo componente dependem umas das outras em ciclo
+    """
+    graph = _restrict(tables, dependencies)
+    index: Dict[str, int] = {}
+    lowlink: Dict[str, int] = {}
+    on_stack = set()
+    stack: List[str] = []
+    components: List[List[str]] = []
+    counter = 0
+
+    for root in tables:
+        if root in index:
+            continue
+        # Pilha explícita (tabela, próximo pai a visitar) para não depender do limite de recursão
+        work = [(root, 0)]
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+
+        while work:
+            table, position = work[-1]
+            parents = graph[table]
+            if position < len(parents):
+                work[-1] = (table, position + 1)
+                parent = parents[position]
+                if parent not in index:
+                    index[parent] = lowlink[parent] = counter
+                    counter += 1
+                    stack.append(parent)
+                    on_stack.add(parent)
+                    work.append((parent, 0))
+                elif parent in on_stack:
+                    lowlink[table] = min(lowlink[table], index[parent])
+                continue
+
+            work.pop()
+            if work:
+                caller = work[-1][0]
+                lowlink[caller] = min(lowlink[caller], lowlink[table])
+            if lowlink[table] == index[table]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == table:
+                        break
+                components.append(component)
+
+    return components
+
+
+def plan_load_order(tables: List[str], dependencies: Dict[str, List[str]]) -> Dict[str, Any]:
+    """
+    Ordena as tabelas para carga: tabelas pai antes das filhas (algoritmo de Kahn sobre os componentes)
+    Ciclos viram grupos carregados juntos, com as foreign keys criadas só depois da carga do grupo
+
+    Retorna:
+        order: todas as tabelas em ordem de carga (empates resolvidos pela ordem de entrada)
+        levels: camadas de tabelas que podem ser carregadas em paralelo
+        cycle_groups: tabelas em ciclo (inclui tabelas com auto-referência)
+        dependencies: dependências restritas às tabelas informadas
+    """
+    graph = _restrict(tables, dependencies)
+    position = {table: i for i, table in enumerate(tables)}
+
+    components = strongly_connected_components(tables, graph)
+    component_of = {}
+    for number, component in enumerate(components):
+        component.sort(key=position.get)
+        for table in component:
+            component_of[table] = number
+
+    # Grafo entre componentes: a condensação é sempre acíclica
+    in_degree = [0] * len(components)
+    children: List[set] = [set() for _ in components]
+    for table, parents in graph.items():
+        child = component_of[table]
+        for parent in parents:
+            parent_component = component_of[parent]
+            if parent_component != child and child not in children[parent_component]:
+                children[parent_component].add(child)
+                in_degree[child] += 1
+
+    first_position = [position[component[0]] for component in components]
+    ready = sorted((c for c in range(len(components)) if in_degree[c] == 0), key=first_position.__getitem__)
+    levels: List[List[str]] = []
+    order: List[str] = []
+    while ready:
+        level = [table for c in ready for table in components[c]]
+        levels.append(level)
+        order.extend(level)
+
+        next_ready = []
+        for c in ready:
+            for child in children[c]:
+                in_degree[child] -= 1
+                if in_degree[child] == 0:
+                    next_ready.append(child)
+        ready = sorted(next_ready, key=first_position.__getitem__)
+
+    cycle_groups = [
+        component for component in components
+        if len(component) > 1 or component[0] in graph[component[0]]
+    ]
+    cycle_groups.sort(key=lambda component: position[component[0]])
+
+    return {
+        "order": order,
+        "levels": levels,
+        "cycle_groups": cycle_groups,
+        "dependencies": graph
+    }
@@ -0,0 +1,122 @@
+import logging
+import threading
+import time
+from typing import Dict, Any, Callable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class _Flight:
+    """Carga em andamento de uma chave; chamadas concorrentes esperam por ela em vez de repetir a consulta"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class MetadataCache:
+    """
+    Cache em memória de metadados dos bancos (resumos, estruturas de tabelas, grafos de dependências)
+    Chaves são tuplas (tipo, banco, ...); cada entrada expira pelo TTL ou por invalidação explícita
+    Requisições concorrentes da mesma chave compartilham uma única carga (single-flight)
+    """
+
+    def __init__(self, default_ttl_seconds: float = 60.0):
+        self.default_ttl_seconds = default_ttl_seconds
+        self._entries: Dict[Tuple, Tuple[Any, float]] = {}
+        self._in_flight: Dict[Tuple, _Flight] = {}
+        self._lock = threading.Lock()
+        # Incrementado a cada invalidação: cargas iniciadas antes dela não são guardadas
+        self._generation = 0
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, kind: str, event: str):
+        counters = self._stats.setdefault(kind, {"hits": 0, "misses": 0, "shared": 0, "errors": 0, "invalidations": 0})
+        counters[event] += 1
+
+    def get(self, key: Tuple, loader: Callable[[], Any], ttl_seconds: Optional[float] = None, refresh: bool = False) -> Any:
+        """
+        Retorna o valor da chave, carregando-o com loader se não estiver no cache ou tiver expirado
+        refresh: ignora a entrada guardada e carrega novamente
+        """
+        kind = key[0]
+        with self._lock:
+            entry = None if refresh else self._entries.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                self._count(kind, "hits")
+                return entry[0]
+
+            flight = None if refresh else self._in_flight.get(key)
+            if flight is not None:
+                self._count(kind, "shared")
+                leader = False
+            else:
+                self._count(kind, "misses")
+                flight = _Flight()
+                self._in_flight[key] = flight
+                generation = self._generation
+                leader = True
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = loader()
+        except BaseException as e:
+            flight.error = e
+            with self._lock:
+                self._count(kind, "errors")
+            raise
+        finally:
+            ttl = self.default_ttl_seconds if ttl_seconds is None else ttl_seconds
+            with self._lock:
+                if self._in_flight.get(key) is flight:
+                    del self._in_flight[key]
+                if flight.error is None and generation == self._generation and ttl > 0:
+                    self._entries[key] = (flight.value, time.monotonic() + ttl)
+            flight.done.set()
+        return flight.value
+
+    def invalidate(self, *prefix: Any) -> int:
+        """Remove as entradas cuja chave começa com prefix (sem prefixo, remove todas); retorna quantas foram removidas"""
+        with self._lock:
+            self._generation += 1
+            keys = [key for key in self._entries if key[:len(prefix)] == prefix]
+            for key in keys:
+                del self._entries[key]
+            self._count(prefix[0] if prefix else "*", "invalidations")
+        if keys:
+            logger.debug(f"Cache de metadados: {len(keys)} entradas invalidadas ({prefix or 'todas'})")
+        return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        """Estatísticas de acertos, faltas, cargas compartilhadas e invalidações, no total e por tipo de metadado"""
+        with self._lock:
+            now = time.monotonic()
+            by_kind = {kind: dict(counters) for kind, counters in self._stats.items()}
+            entries: Dict[str, int] = {}
+            for key, (_, expires_at) in self._entries.items():
+                if expires_at > now:
+                    entries[key[0]] = entries.get(key[0], 0) + 1
+            in_flight = len(self._in_flight)
+
+        totals = {"hits": 0, "misses": 0, "shared": 0, "errors": 0, "invalidations": 0}
+        for counters in by_kind.values():
+            for name in totals:
+                totals[name] += counters[name]
+        lookups = totals["hits"] + totals["misses"] + totals["shared"]
+        for kind, counters in by_kind.items():
+            counters["entries"] = entries.get(kind, 0)
+        return {
+            **totals,
+            # Cargas compartilhadas também evitam uma consulta ao banco
+            "hit_ratio": round((totals["hits"] + totals["shared"]) / lookups, 3) if lookups else None,
+            "entries": sum(entries.values()),
+            "in_flight": in_flight,
+            "default_ttl_seconds": self.default_ttl_seconds,
+            "by_kind": by_kind
+        }
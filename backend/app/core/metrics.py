@@ -0,0 +1,180 @@
+import time
+from typing import Dict, List, Any, Callable, Iterable, Iterator, Type
+from prometheus_client import Counter, Gauge, Histogram, REGISTRY
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import Pool, QueuePool
+from .blocking import blocking_executor
+from .tracing import current_timings, record_batch, record_connection_acquire
+
+# Latências de lote e de checkout: de milissegundos a minutos
+BATCH_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+CHECKOUT_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 10.0, 30.0)
+DURATION_BUCKETS = (1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0, 3600.0, 7200.0)
+
+# Rótulo "status" comum às métricas de duração de migrações e de execuções dos cron jobs
+OUTCOME_SUCCESS = "success"
+OUTCOME_FAILURE = "failure"
+OUTCOME_CANCELLED = "cancelled"
+JOB_STATUS_OUTCOMES = {"completed": OUTCOME_SUCCESS, "failed": OUTCOME_FAILURE, "cancelled": OUTCOME_CANCELLED}
+
+ROWS_COPIED = Counter("dbsync_rows_copied_total", "Registros gravados no destino", ["table"])
+BYTES_COPIED = Counter(
+    "dbsync_bytes_copied_total",
+    "Bytes gravados no destino (estimados pelo tamanho médio dos registros no catálogo da origem)",
+    ["table"]
+)
+BATCH_READ_SECONDS = Histogram(
+    "dbsync_batch_read_seconds", "Tempo de leitura de um lote na origem", ["table"], buckets=BATCH_BUCKETS
+)
+BATCH_WRITE_SECONDS = Histogram(
+    "dbsync_batch_write_seconds", "Tempo de gravação de um lote no destino", ["table"], buckets=BATCH_BUCKETS
+)
+MIGRATION_SECONDS = Histogram(
+    "dbsync_migration_duration_seconds", "Duração da migração de uma tabela", ["mode", "status"], buckets=DURATION_BUCKETS
+)
+MIGRATION_ROWS_PER_SECOND = Gauge(
+    "dbsync_migration_rows_per_second", "Throughput da última migração concluída de cada tabela", ["table"]
+)
+MIGRATION_FAILURES = Counter("dbsync_migration_failures_total", "Migrações de tabela com falha", ["table"])
+CRON_RUN_SECONDS = Histogram(
+    "dbsync_cron_run_duration_seconds", "Duração das execuções dos cron jobs", ["status"], buckets=DURATION_BUCKETS
+)
+JOB_QUEUE_WAIT_SECONDS = Histogram(
+    "dbsync_job_queue_wait_seconds",
+    "Espera de um job entre o pedido (ou disparo do cron) e o início da execução",
+    ["source"],
+    buckets=(0.01, 0.1, 0.5) + DURATION_BUCKETS
+)
+CRON_RUNS_COALESCED = Counter(
+    "dbsync_cron_runs_coalesced_total", "Disparos de cron jobs incorporados a uma execução já na fila"
+)
+SYNC_RUNS_RUNNING = Gauge("dbsync_cron_runs_running", "Execuções de cron jobs em andamento")
+SYNC_RUNS_PENDING = Gauge("dbsync_cron_runs_pending", "Execuções de cron jobs aguardando capacidade na fila")
+SYNC_CONNECTIONS_IN_USE = Gauge(
+    "dbsync_cron_connections_in_use", "Conexões do orçamento dos cron jobs em uso por banco", ["database"]
+)
+POOL_CHECKOUT_WAIT_SECONDS = Histogram(
+    "dbsync_pool_checkout_wait_seconds",
+    "Espera por uma conexão do pool (inclui abrir a conexão quando o pool cresce)",
+    ["database"],
+    buckets=CHECKOUT_BUCKETS
+)
+POOL_CHECKOUT_TIMEOUTS = Counter(
+    "dbsync_pool_checkout_timeouts_total", "Checkouts que excederam o pool_timeout (pool esgotado)", ["database"]
+)
+STARTUP_SECONDS = Gauge(
+    "dbsync_startup_seconds",
+    "Tempos da inicialização: imports, criação das engines, warm-up dos bancos e time-to-ready",
+    ["phase"]
+)
+
+
+def instrumented_pool_class(database_type: str) -> Type[QueuePool]:
+    """
+    QueuePool que mede a espera no checkout de conexões do banco informado
+    O rótulo fica na classe: pools recriados (ex: engine.dispose()) continuam instrumentados
+    """
+    class InstrumentedQueuePool(QueuePool):
+        def _do_get(self):
+            started = time.perf_counter()
+            try:
+                return super()._do_get()
+            except PoolTimeoutError:
+                POOL_CHECKOUT_TIMEOUTS.labels(database_type).inc()
+                raise
+            finally:
+                seconds = time.perf_counter() - started
+                POOL_CHECKOUT_WAIT_SECONDS.labels(database_type).observe(seconds)
+                record_connection_acquire(seconds)
+
+    InstrumentedQueuePool.__name__ = f"InstrumentedQueuePool[{database_type}]"
+    return InstrumentedQueuePool
+
+
+def timed_batches(batches: Iterable[List[Dict[str, Any]]], table_name: str) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Repassa os lotes lidos da origem medindo o tempo de leitura de cada um (métrica e etapa 'copy.read')
+    A migração em andamento é capturada aqui: os lotes podem ser consumidos em outra thread (pipeline)
+    """
+    return _timed_batches(iter(batches), BATCH_READ_SECONDS.labels(table_name), current_timings())
+
+
+def _timed_batches(iterator: Iterator[List[Dict[str, Any]]], histogram, timings) -> Iterator[List[Dict[str, Any]]]:
+    try:
+        while True:
+            started = time.perf_counter()
+            try:
+                batch = next(iterator)
+            except StopIteration:
+                return
+            seconds = time.perf_counter() - started
+            histogram.observe(seconds)
+            record_batch("copy.read", seconds, timings, None, rows=len(batch))
+            yield batch
+    finally:
+        # Cópia interrompida: libera a conexão de leitura da origem
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            close()
+
+
+def record_batch_written(table_name: str, rows: int, row_bytes: float, seconds: float):
+    BATCH_WRITE_SECONDS.labels(table_name).observe(seconds)
+    ROWS_COPIED.labels(table_name).inc(rows)
+    BYTES_COPIED.labels(table_name).inc(int(rows * row_bytes))
+
+
+def record_migration(table_name: str, mode: str, status: str, seconds: float, rows_per_second: float = None):
+    MIGRATION_SECONDS.labels(mode, status).observe(seconds)
+    if status == OUTCOME_FAILURE:
+        MIGRATION_FAILURES.labels(table_name).inc()
+    elif status == OUTCOME_SUCCESS and rows_per_second is not None:
+        MIGRATION_ROWS_PER_SECOND.labels(table_name).set(rows_per_second)
+
+
+def record_startup_phase(phase: str, seconds: float):
+    STARTUP_SECONDS.labels(phase).set(seconds)
+
+
+class StateCollector:
+    """Ocupação dos pools de conexões e dos pools de threads, lida no momento da coleta"""
+
+    def __init__(self):
+        self._pools: Dict[str, Callable[[], Pool]] = {}
+
+    def register_pool(self, database_type: str, get_pool: Callable[[], Pool]):
+        self._pools[database_type] = get_pool
+
+    def collect(self):
+        size = GaugeMetricFamily("dbsync_pool_size", "Conexões permanentes do pool", labels=["database"])
+        max_connections = GaugeMetricFamily(
+            "dbsync_pool_max_connections", "Limite de conexões do pool (pool_size + max_overflow)", labels=["database"]
+        )
+        checked_out = GaugeMetricFamily("dbsync_pool_checked_out", "Conexões em uso", labels=["database"])
+        idle = GaugeMetricFamily("dbsync_pool_idle", "Conexões livres no pool", labels=["database"])
+        overflow = GaugeMetricFamily("dbsync_pool_overflow", "Conexões abertas além do pool_size", labels=["database"])
+        for database_type, get_pool in self._pools.items():
+            pool = get_pool()
+            if not isinstance(pool, QueuePool):
+                continue
+            size.add_metric([database_type], pool.size())
+            max_connections.add_metric([database_type], pool.size() + pool._max_overflow)
+            checked_out.add_metric([database_type], pool.checkedout())
+            idle.add_metric([database_type], pool.checkedin())
+            overflow.add_metric([database_type], max(pool.overflow(), 0))
+        yield from (size, max_connections, checked_out, idle, overflow)
+
+        workers = GaugeMetricFamily("dbsync_thread_pool_max_workers", "Threads do pool", labels=["pool"])
+        active = GaugeMetricFamily("dbsync_thread_pool_active", "Threads executando chamadas", labels=["pool"])
+        queued = GaugeMetricFamily("dbsync_thread_pool_queued", "Chamadas aguardando thread", labels=["pool"])
+        for name, stats in blocking_executor.stats().items():
+            workers.add_metric([name], stats["max_workers"])
+            active.add_metric([name], stats["active"])
+            queued.add_metric([name], stats["queued"])
+        yield from (workers, active, queued)
+
+
+# Instância global, registrada no registry padrão (que também expõe métricas do processo)
+state_collector = StateCollector()
+REGISTRY.register(state_collector)
@@ -0,0 +1,103 @@
+import contextvars
+import queue
+import threading
+import time
+import logging
+from typing import Dict, List, Any, Callable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Marcador de fim de stream colocado na fila pelo leitor
+_END_OF_STREAM = object()
+
+
+class PipelinedCopy:
+    """Cópia em pipeline: uma thread lê o lote N+1 da origem enquanto o lote N é gravado no destino"""
+
+    def __init__(self, batches: Iterable[List[Dict[str, Any]]], write_batch: Callable[[List[Dict[str, Any]]], bool], queue_size: int = 4):
+        if queue_size < 1:
+            raise ValueError("queue_size deve ser maior ou igual a 1")
+
+        self.batches = batches
+        self.write_batch = write_batch
+        # Fila limitada: quando cheia, o leitor espera o escritor (backpressure)
+        self.queue: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        self.queue_size = queue_size
+        self._stop = threading.Event()
+        self._reader_error: Optional[BaseException] = None
+        self._reader_wait = 0.0
+        self._writer_wait = 0.0
+
+    def _put(self, item: Any):
+        """Coloca um item na fila, desistindo se o escritor tiver parado"""
+        started = time.perf_counter()
+        try:
+            while not self._stop.is_set():
+                try:
+                    self.queue.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+        finally:
+            self._reader_wait += time.perf_counter() - started
+
+    def _read(self):
+        """Thread leitora: consome o iterador da origem e alimenta a fila"""
+        try:
+            for batch in self.batches:
+                if self._stop.is_set():
+                    break
+                self._put(batch)
+        except BaseException as e:
+            self._reader_error = e
+        finally:
+            # O gerador é fechado na própria thread que abriu o cursor da origem
+            close = getattr(self.batches, "close", None)
+            if close:
+                close()
+            self._put(_END_OF_STREAM)
+
+    def run(self) -> Dict[str, Any]:
+        """Executa a cópia e retorna estatísticas de throughput e de espera de cada lado"""
+        started = time.perf_counter()
+        records = 0
+        batches = 0
+
+        # O leitor herda o contexto (span e etapas da migração em andamento)
+        reader = threading.Thread(target=contextvars.copy_context().run, args=(self._read,), name="pipeline-reader", daemon=True)
+        reader.start()
+
+        try:
+            while True:
+                wait_started = time.perf_counter()
+                item = self.queue.get()
+                self._writer_wait += time.perf_counter() - wait_started
+
+                if item is _END_OF_STREAM:
+                    break
+
+                if not self.write_batch(item):
+                    raise Exception("Falha ao gravar lote no destino")
+                records += len(item)
+                batches += 1
+        finally:
+            self._stop.set()
+            reader.join()
+
+        if self._reader_error is not None:
+            raise self._reader_error
+
+        elapsed = time.perf_counter() - started
+        stats = {
+            "records": records,
+            "batches": batches,
+            "queue_size": self.queue_size,
+            "elapsed_seconds": round(elapsed, 3),
+            # Tempo que o leitor ficou parado com a fila cheia (destino é o gargalo)
+            "reader_wait_seconds": round(self._reader_wait, 3),
+            # Tempo que o escritor ficou parado com a fila vazia (origem é o gargalo)
+            "writer_wait_seconds": round(self._writer_wait, 3),
+            "rows_per_second": round(records / elapsed, 2) if elapsed > 0 else 0.0
+        }
+        logger.info(f"Cópia em pipeline concluída: {stats}")
+        return stats
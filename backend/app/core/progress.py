@@ -0,0 +1,103 @@
+import threading
+import time
+from typing import Dict, List, Any, Optional
+
+
+class JobCancelledError(Exception):
+    """Cancelamento solicitado durante a execução de um job"""
+    pass
+
+
+class MigrationProgress:
+    """
+    Progresso de uma migração (uma tabela ou um lote), atualizado pelas threads de cópia
+    Bytes são estimados pelo tamanho médio dos registros no catálogo da origem
+    Também carrega o pedido de cancelamento, verificado antes de cada lote gravado
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._started: Optional[float] = None
+        self.rows_copied = 0
+        self.bytes_copied = 0
+        self.tables_total = 0
+        self.tables_done = 0
+        # Estimativas por tabela: registros e bytes por registro
+        self._estimates: Dict[str, Dict[str, float]] = {}
+        self._table_rows: Dict[str, int] = {}
+        self._running: List[str] = []
+        self.current_table: Optional[str] = None
+
+    def start(self):
+        with self._lock:
+            if self._started is None:
+                self._started = time.perf_counter()
+
+    def plan_tables(self, estimates: Dict[str, Dict[str, float]]):
+        """Registra as tabelas previstas com suas estimativas: {tabela: {"rows": n, "row_bytes": b}}"""
+        with self._lock:
+            self._estimates.update(estimates)
+            self.tables_total = len(self._estimates)
+
+    def start_table(self, table_name: str):
+        self.check_cancelled()
+        with self._lock:
+            if table_name not in self._estimates:
+                self._estimates[table_name] = {"rows": 0, "row_bytes": 0}
+                self.tables_total = len(self._estimates)
+            self._table_rows.setdefault(table_name, 0)
+            if table_name not in self._running:
+                self._running.append(table_name)
+            self.current_table = table_name
+
+    def add_rows(self, table_name: str, rows: int):
+        with self._lock:
+            row_bytes = self._estimates.get(table_name, {}).get("row_bytes", 0)
+            self.rows_copied += rows
+            self.bytes_copied += int(rows * row_bytes)
+            self._table_rows[table_name] = self._table_rows.get(table_name, 0) + rows
+
+    def finish_table(self, table_name: str):
+        with self._lock:
+            if table_name in self._running:
+                self._running.remove(table_name)
+                self.tables_done += 1
+            if self.current_table == table_name:
+                self.current_table = self._running[-1] if self._running else None
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def check_cancelled(self):
+        if self._cancel.is_set():
+            raise JobCancelledError("Job cancelado")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Estado atual: registros e bytes copiados, taxa, ETA e tabelas em andamento"""
+        with self._lock:
+            elapsed = time.perf_counter() - self._started if self._started is not None else 0.0
+            rows_per_second = self.rows_copied / elapsed if elapsed > 0 else 0.0
+            # Tabelas que passaram da estimativa não contam como trabalho restante negativo
+            estimated_total = sum(
+                max(int(estimate["rows"]), self._table_rows.get(table, 0))
+                for table, estimate in self._estimates.items()
+            )
+            remaining = max(estimated_total - self.rows_copied, 0)
+            return {
+                "rows_copied": self.rows_copied,
+                "bytes_copied": self.bytes_copied,
+                "estimated_rows": estimated_total,
+                "percent": round(100.0 * self.rows_copied / estimated_total, 1) if estimated_total else None,
+                "rows_per_second": round(rows_per_second, 2),
+                "eta_seconds": round(remaining / rows_per_second, 1) if rows_per_second > 0 else None,
+                "elapsed_seconds": round(elapsed, 3),
+                "current_table": self.current_table,
+                "running_tables": list(self._running),
+                "tables_done": self.tables_done,
+                "tables_total": self.tables_total
+            }
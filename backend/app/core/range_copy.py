@@ -0,0 +1,153 @@
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, List, Any, Optional, Tuple, Callable
+from .adapters.base_adapter import DatabaseAdapter
+from .config import settings
+from .metrics import timed_batches
+
+logger = logging.getLogger(__name__)
+
+
+def _linear_boundaries(low: Any, high: Any, parts: int) -> List[Any]:
+    """Divide o intervalo [low, high] em partes iguais (chaves numéricas ou temporais)"""
+    if isinstance(low, bool):
+        return []
+    if isinstance(low, int):
+        return [low + (high - low) * i // parts for i in range(1, parts)]
+    if isinstance(low, (float, Decimal, datetime, date)):
+        return [low + (high - low) * i / parts for i in range(1, parts)]
+    return []
+
+
+def plan_key_ranges(adapter: DatabaseAdapter, table_name: str, key_column: str, parts: int) -> List[Tuple[Any, Any]]:
+    """
+    Planeja K faixas [lower, upper) sobre a coluna de chave
+    As pontas ficam abertas (None) para não perder registros fora do min/max lidos
+    """
+    low, high = adapter.get_key_bounds(table_name, key_column)
+    if low is None or parts < 2 or low == high:
+        return [(None, None)]
+
+    if isinstance(low, (int, float, Decimal, datetime, date)) and not isinstance(low, bool):
+        boundaries = _linear_boundaries(low, high, parts)
+    else:
+        # Chaves ordenáveis não numéricas: pontos de corte amostrados na própria tabela
+        boundaries = adapter.get_key_boundaries(table_name, key_column, parts)
+
+    # Remove cortes repetidos ou fora do intervalo (ex: faixa numérica menor que K)
+    unique = []
+    for boundary in boundaries:
+        if low < boundary <= high and (not unique or boundary > unique[-1]):
+            unique.append(boundary)
+
+    edges = [None] + unique + [None]
+    return [(edges[i], edges[i + 1]) for i in range(len(edges) - 1)]
+
+
+class RangeParallelCopy:
+    """Copia uma tabela dividida em faixas de chave, com K workers e conexões independentes na origem e no destino"""
+
+    def __init__(self, source: DatabaseAdapter, destination: DatabaseAdapter, table_name: str, key_column: str,
+                 ranges: List[Tuple[Any, Any]], batch_size: int, load_strategy: str = "insert",
+                 upsert_keys: Optional[List[str]] = None, target_table: Optional[str] = None,
+                 write_batch: Optional[Callable[[List[Dict[str, Any]]], bool]] = None):
+        self.source = source
+        self.destination = destination
+        self.table_name = table_name
+        self.key_column = key_column
+        self.ranges = ranges
+        self.batch_size = batch_size
+        self.load_strategy = load_strategy
+        # Com colunas de chave informadas, grava por upsert na tabela existente em vez de usar a estratégia de carga
+        self.upsert_keys = upsert_keys
+        # Tabela gravada no destino (ex: tabela sombra); por padrão, a mesma da origem
+        self.target_table = target_table or table_name
+        # Gravação personalizada de um lote (ex: com registro de progresso); substitui upsert/estratégia de carga
+        self.write_batch = write_batch
+    
+    def _write_batch(self, batch: List[Dict[str, Any]]) -> bool:
+        if self.write_batch is not None:
+            return self.write_batch(batch)
+        if self.upsert_keys:
+            return self.destination.upsert_data(self.target_table, batch, self.upsert_keys)
+        return self.destination.load_data(self.target_table, batch, self.load_strategy)
+
+    def _copy_range(self, index: int, lower: Any, upper: Any, cancel: Optional[threading.Event] = None) -> Dict[str, Any]:
+        """Copia uma faixa de chave da origem para o destino; para no próximo lote se cancel for sinalizado"""
+        started = time.perf_counter()
+        records = 0
+        batches = timed_batches(
+            self.source.iter_table_data(
+                self.table_name,
+                batch_size=self.batch_size,
+                key_column=self.key_column,
+                lower=lower,
+                upper=upper
+            ),
+            self.table_name
+        )
+        try:
+            for batch in batches:
+                if cancel is not None and cancel.is_set():
+                    break
+                if not self._write_batch(batch):
+                    raise Exception(f"Falha ao inserir a faixa {index} na tabela '{self.target_table}' do destino")
+                records += len(batch)
+        finally:
+            # Libera a conexão de leitura da origem também quando a faixa é interrompida
+            batches.close()
+
+        elapsed = time.perf_counter() - started
+        return {
+            "range": index,
+            "lower": None if lower is None else str(lower),
+            "upper": None if upper is None else str(upper),
+            "records": records,
+            "seconds": round(elapsed, 3),
+            "rows_per_second": round(records / elapsed, 2) if elapsed > 0 else 0.0
+        }
+
+    def run(self, workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Executa a cópia das faixas em paralelo e retorna contagens e tempos por faixa
+        Cada worker usa uma conexão na origem e uma no destino: no máximo MAX_MIGRATION_WORKERS (faixas além disso aguardam)
+        """
+        workers = min(workers or len(self.ranges), settings.max_migration_workers)
+        started = time.perf_counter()
+        logger.info(f"Copiando tabela '{self.table_name}' em {len(self.ranges)} faixas de '{self.key_column}' com {workers} workers")
+
+        cancel = threading.Event()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"range-{self.table_name}") as pool:
+            # Cada faixa herda o contexto (span e etapas da migração em andamento)
+            futures = [
+                pool.submit(contextvars.copy_context().run, self._copy_range, index, lower, upper, cancel)
+                for index, (lower, upper) in enumerate(self.ranges)
+            ]
+            wait(futures, return_when=FIRST_EXCEPTION)
+            failed = next((f for f in futures if f.done() and not f.cancelled() and f.exception()), None)
+            if failed is not None:
+                # A cópia já falhou: faixas na fila não começam e as em andamento param no próximo lote
+                cancel.set()
+                for future in futures:
+                    future.cancel()
+        if failed is not None:
+            raise failed.exception()
+        ranges = [future.result() for future in futures]
+
+        elapsed = time.perf_counter() - started
+        records = sum(r["records"] for r in ranges)
+        slowest = max((r["seconds"] for r in ranges), default=0.0)
+        fastest = min((r["seconds"] for r in ranges), default=0.0)
+        return {
+            "key_column": self.key_column,
+            "records": records,
+            "elapsed_seconds": round(elapsed, 3),
+            # Razão entre a faixa mais lenta e a mais rápida: valores altos indicam faixas desbalanceadas
+            "skew": round(slowest / fastest, 2) if fastest > 0 else None,
+            "ranges": ranges
+        }
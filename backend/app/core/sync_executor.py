@@ -0,0 +1,152 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Any, Awaitable, Callable, Optional
+from .config import settings
+from .metrics import SYNC_RUNS_RUNNING, SYNC_RUNS_PENDING, SYNC_CONNECTIONS_IN_USE
+
+logger = logging.getLogger(__name__)
+
+
+class SyncExecutor:
+    """
+    Fila das sincronizações agendadas com limites de recursos, executada no event loop
+    - no máximo max_concurrent_runs execuções ao mesmo tempo
+    - orçamento de conexões por banco: cada worker de uma execução usa uma conexão na origem e uma no destino
+    - uma execução pendente por chave (cron job): disparos enquanto ela aguarda são incorporados a ela
+    - execuções da mesma chave nunca se sobrepõem
+    As pendentes iniciam em ordem de chegada; a primeira que não cabe no orçamento espera, sem ser ultrapassada
+    """
+
+    def __init__(self, max_concurrent_runs: int, connection_budgets: Dict[str, int]):
+        self.max_concurrent_runs = max(1, max_concurrent_runs)
+        self.connection_budgets = {name: max(1, budget) for name, budget in connection_budgets.items()}
+        self._pending: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._running: Dict[str, Dict[str, Any]] = {}
+        self._in_use = {name: 0 for name in self.connection_budgets}
+        # Referências às tarefas em execução: o event loop guarda apenas referências fracas
+        self._tasks = set()
+        self._update_gauges()
+
+    def pending_run_id(self, key: str) -> Optional[str]:
+        """ID da execução da chave que aguarda na fila (None se não houver)"""
+        pending = self._pending.get(key)
+        return pending["run_id"] if pending else None
+
+    def coalesce(self, key: str) -> Optional[str]:
+        """Incorpora um novo disparo à execução pendente da chave, se houver; retorna o ID dela"""
+        pending = self._pending.get(key)
+        if pending is None:
+            return None
+        pending["coalesced"] += 1
+        return pending["run_id"]
+
+    def submit(self, key: str, run_id: str, workers: int, run: Callable[[int], Awaitable[Any]],
+               name: Optional[str] = None) -> int:
+        """
+        Enfileira uma execução (chamado no event loop); run(workers) é aguardado quando houver capacidade
+        Retorna os workers concedidos: pedidos acima do orçamento de conexões são reduzidos para caber nele
+        """
+        if key in self._pending:
+            raise ValueError(f"Já existe uma execução pendente para '{key}'")
+        granted = max(1, min([workers] + list(self.connection_budgets.values())))
+        if granted < workers:
+            logger.warning(f"Execução {run_id} ({key}): {workers} workers excedem o orçamento de conexões; usando {granted}")
+        self._pending[key] = {
+            "key": key,
+            "run_id": run_id,
+            "name": name,
+            "workers": granted,
+            "run": run,
+            "queued_at": datetime.now(),
+            "enqueued": time.perf_counter(),
+            "started": None,
+            "coalesced": 0
+        }
+        self._dispatch()
+        return granted
+
+    def _fits(self, workers: int) -> bool:
+        return all(self._in_use[name] + workers <= budget for name, budget in self.connection_budgets.items())
+
+    def _dispatch(self):
+        """Inicia as execuções pendentes, em ordem de chegada, enquanto houver capacidade"""
+        for key, entry in list(self._pending.items()):
+            if len(self._running) >= self.max_concurrent_runs:
+                break
+            if key in self._running:
+                # A execução anterior do mesmo cron job ainda não terminou
+                continue
+            if not self._fits(entry["workers"]):
+                break
+            del self._pending[key]
+            self._start(entry)
+        self._update_gauges()
+
+    def _start(self, entry: Dict[str, Any]):
+        for name in self._in_use:
+            self._in_use[name] += entry["workers"]
+        entry["started"] = time.perf_counter()
+        self._running[entry["key"]] = entry
+        wait = entry["started"] - entry["enqueued"]
+        logger.info(f"Execução {entry['run_id']} ({entry['key']}) iniciada após {wait:.2f}s na fila")
+        task = asyncio.get_running_loop().create_task(self._execute(entry))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _execute(self, entry: Dict[str, Any]):
+        try:
+            await entry["run"](entry["workers"])
+        except Exception as e:
+            logger.error(f"Erro na execução {entry['run_id']} ({entry['key']}): {e}")
+        finally:
+            for name in self._in_use:
+                self._in_use[name] -= entry["workers"]
+            self._running.pop(entry["key"], None)
+            self._dispatch()
+
+    def _update_gauges(self):
+        SYNC_RUNS_RUNNING.set(len(self._running))
+        SYNC_RUNS_PENDING.set(len(self._pending))
+        for name, in_use in self._in_use.items():
+            SYNC_CONNECTIONS_IN_USE.labels(name).set(in_use)
+
+    def _describe(self, entry: Dict[str, Any], since: float) -> Dict[str, Any]:
+        return {
+            "cron_job_id": entry["key"],
+            "job_id": entry["run_id"],
+            "name": entry["name"],
+            "workers": entry["workers"],
+            "queued_at": entry["queued_at"],
+            "seconds": round(time.perf_counter() - since, 3),
+            "coalesced_runs": entry["coalesced"]
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Execuções em andamento (tempo de execução) e na fila (tempo de espera) e uso do orçamento de conexões"""
+        return {
+            "max_concurrent_runs": self.max_concurrent_runs,
+            "running": [self._describe(entry, entry["started"]) for entry in self._running.values()],
+            "pending": [self._describe(entry, entry["enqueued"]) for entry in self._pending.values()],
+            "connection_budgets": dict(self.connection_budgets),
+            "connections_in_use": dict(self._in_use)
+        }
+
+    def shutdown(self) -> List[str]:
+        """Descarta as execuções pendentes e retorna os IDs delas (as em andamento não são interrompidas)"""
+        discarded = [entry["run_id"] for entry in self._pending.values()]
+        self._pending.clear()
+        self._update_gauges()
+        return discarded
+
+
+# Instância global usada pelos cron jobs
+sync_executor = SyncExecutor(
+    settings.cron_max_concurrent_runs,
+    {
+        "source": settings.cron_source_connection_budget,
+        "destination": settings.cron_destination_connection_budget
+    }
+)
@@ -0,0 +1,142 @@
+import json
+import logging
+import os
+import threading
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Dict, Any, Optional
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def encode_state_value(value: Any) -> Optional[Dict[str, Any]]:
+    """Serializa um valor (ex: marca d'água) preservando o tipo para leitura posterior"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return {"type": "datetime", "value": value.isoformat()}
+    if isinstance(value, date):
+        return {"type": "date", "value": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"type": "decimal", "value": str(value)}
+    if isinstance(value, (bytes, bytearray)):
+        return {"type": "bytes", "value": bytes(value).hex()}
+    if isinstance(value, bool):
+        return {"type": "bool", "value": value}
+    if isinstance(value, int):
+        return {"type": "int", "value": value}
+    if isinstance(value, float):
+        return {"type": "float", "value": value}
+    return {"type": "str", "value": str(value)}
+
+
+def decode_state_value(encoded: Optional[Dict[str, Any]]) -> Any:
+    """Restaura um valor serializado por encode_state_value"""
+    if not encoded:
+        return None
+    value_type, value = encoded["type"], encoded["value"]
+    if value_type == "datetime":
+        return datetime.fromisoformat(value)
+    if value_type == "date":
+        return date.fromisoformat(value)
+    if value_type == "decimal":
+        return Decimal(value)
+    if value_type == "bytes":
+        return bytes.fromhex(value)
+    return value
+
+
+class SyncStateStore:
+    """Estado persistente da sincronização (marcas d'água por tabela e checkpoints de replicação) em arquivo JSON"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.RLock()
+        self._state: Dict[str, Any] = {"tables": {}, "checkpoints": {}}
+        self._load()
+
+    def _load(self):
+        """Carrega o estado do disco, se existir"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as state_file:
+                self._state = json.load(state_file)
+            self._state.setdefault("tables", {})
+            self._state.setdefault("checkpoints", {})
+        except Exception as e:
+            logger.error(f"Erro ao carregar estado de sincronização de {self.path}: {e}")
+
+    def _save(self):
+        """Grava o estado de forma atômica (arquivo temporário + rename)"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as state_file:
+            json.dump(self._state, state_file, indent=2, sort_keys=True)
+        os.replace(temp_path, self.path)
+
+    def get_table_state(self, table_name: str) -> Dict[str, Any]:
+        """Retorna uma cópia do estado de uma tabela"""
+        with self._lock:
+            return dict(self._state["tables"].get(table_name, {}))
+
+    def list_table_states(self) -> Dict[str, Dict[str, Any]]:
+        """Retorna uma cópia do estado de todas as tabelas"""
+        with self._lock:
+            return {name: dict(state) for name, state in self._state["tables"].items()}
+
+    def update_table_state(self, table_name: str, **values: Any) -> Dict[str, Any]:
+        """Atualiza campos do estado de uma tabela e persiste no disco"""
+        with self._lock:
+            state = self._state["tables"].setdefault(table_name, {})
+            state.update(values)
+            state["updated_at"] = datetime.now().isoformat()
+            self._save()
+            return dict(state)
+
+    def remove_table_state(self, table_name: str) -> bool:
+        """Remove o estado de uma tabela"""
+        with self._lock:
+            if table_name not in self._state["tables"]:
+                return False
+            del self._state["tables"][table_name]
+            self._save()
+            return True
+
+    def get_watermark(self, table_name: str) -> Any:
+        """Obtém a última marca d'água sincronizada da tabela"""
+        return decode_state_value(self.get_table_state(table_name).get("watermark"))
+
+    def set_watermark(self, table_name: str, value: Any):
+        """Persiste a marca d'água sincronizada da tabela"""
+        self.update_table_state(table_name, watermark=encode_state_value(value))
+
+
+    def get_checkpoint(self, name: str) -> Dict[str, Any]:
+        """Obtém uma cópia de um checkpoint (ex: posição do binlog da replicação)"""
+        with self._lock:
+            return dict(self._state["checkpoints"].get(name, {}))
+
+    def set_checkpoint(self, name: str, **values: Any) -> Dict[str, Any]:
+        """Substitui um checkpoint e persiste no disco"""
+        with self._lock:
+            checkpoint = dict(values)
+            checkpoint["updated_at"] = datetime.now().isoformat()
+            self._state["checkpoints"][name] = checkpoint
+            self._save()
+            return dict(checkpoint)
+
+    def remove_checkpoint(self, name: str) -> bool:
+        """Remove um checkpoint"""
+        with self._lock:
+            if name not in self._state["checkpoints"]:
+                return False
+            del self._state["checkpoints"][name]
+            self._save()
+            return True
+
+
+# Instância global do estado de sincronização
+sync_state = SyncStateStore(settings.sync_state_path)
@@ -0,0 +1,191 @@
+import contextvars
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Iterator
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# Exportadores locais (funcionam sem coletor): spans em JSON no console ou em um arquivo (uma linha por span)
+EXPORTER_NONE = "none"
+EXPORTER_CONSOLE = "console"
+EXPORTER_FILE = "file"
+EXPORTERS = [EXPORTER_NONE, EXPORTER_CONSOLE, EXPORTER_FILE]
+
+
+def _create_provider() -> TracerProvider:
+    provider = TracerProvider(resource=Resource.create({
+        "service.name": settings.app_name,
+        "service.version": settings.app_version
+    }))
+    exporter_name = settings.tracing_exporter.lower()
+    if exporter_name not in EXPORTERS:
+        logger.warning(f"TRACING_EXPORTER '{settings.tracing_exporter}' inválido; spans não serão exportados")
+    elif exporter_name == EXPORTER_CONSOLE:
+        provider.add_span_processor(BatchSpanProcessor(ConsoleSpanExporter()))
+    elif exporter_name == EXPORTER_FILE:
+        directory = os.path.dirname(settings.tracing_file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        out = open(settings.tracing_file_path, "a", encoding="utf-8")
+        exporter = ConsoleSpanExporter(out=out, formatter=lambda span: span.to_json(indent=None) + os.linesep)
+        provider.add_span_processor(BatchSpanProcessor(exporter))
+        logger.info(f"Spans de rastreamento gravados em {settings.tracing_file_path}")
+    return provider
+
+
+# Sem exportador os spans continuam existindo (IDs e duração por etapa no resultado), só não são gravados
+tracer_provider = _create_provider()
+trace.set_tracer_provider(tracer_provider)
+tracer = trace.get_tracer("database_sync")
+
+
+class StageTimings:
+    """
+    Tempo acumulado por etapa de uma migração (ex: 'destination.create_table', 'copy.read', 'copy.write')
+    Compartilhado pelas threads da cópia: etapas repetidas (lotes) somam tempo, chamadas, registros e bytes
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages: Dict[str, Dict[str, Any]] = {}
+        self.trace_id: Optional[str] = None
+
+    def add(self, name: str, seconds: float, rows: int = 0, bytes_: int = 0):
+        with self._lock:
+            stage = self._stages.setdefault(name, {"seconds": 0.0, "calls": 0, "rows": 0, "bytes": 0})
+            stage["seconds"] += seconds
+            stage["calls"] += 1
+            stage["rows"] += rows
+            stage["bytes"] += bytes_
+
+    def breakdown(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                name: {
+                    "seconds": round(stage["seconds"], 4),
+                    "calls": stage["calls"],
+                    **({"rows": stage["rows"], "bytes": stage["bytes"]} if stage["rows"] else {})
+                }
+                for name, stage in self._stages.items()
+            }
+
+
+class _SpanCounters:
+    """Registros, bytes e espera por conexões acumulados enquanto um span está ativo (inclusive em outras threads)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.rows = 0
+        self.bytes = 0
+        self.connection_acquire_seconds = 0.0
+
+    def add(self, rows: int = 0, bytes_: int = 0, connection_acquire_seconds: float = 0.0):
+        with self._lock:
+            self.rows += rows
+            self.bytes += bytes_
+            self.connection_acquire_seconds += connection_acquire_seconds
+
+
+_current_timings: contextvars.ContextVar[Optional[StageTimings]] = contextvars.ContextVar("stage_timings", default=None)
+_current_counters: contextvars.ContextVar[Optional[_SpanCounters]] = contextvars.ContextVar("span_counters", default=None)
+
+
+def current_timings() -> Optional[StageTimings]:
+    """Etapas da migração em andamento no contexto atual (None fora de uma migração)"""
+    return _current_timings.get()
+
+
+def current_counters() -> Optional[_SpanCounters]:
+    """Contadores do span ativo no contexto atual"""
+    return _current_counters.get()
+
+
+@contextmanager
+def stage(name: str, **attributes: Any) -> Iterator[trace.Span]:
+    """
+    Span de uma etapa: registra a duração na migração em andamento e, ao final, os registros, bytes
+    e a espera por conexões do pool ocorridos durante a etapa (somados também ao span pai)
+    """
+    parent = _current_counters.get()
+    counters = _SpanCounters()
+    token = _current_counters.set(counters)
+    started = time.perf_counter()
+    try:
+        with tracer.start_as_current_span(name, attributes=_attributes(attributes)) as span:
+            try:
+                yield span
+            finally:
+                span.set_attribute("db.rows", counters.rows)
+                span.set_attribute("db.bytes", counters.bytes)
+                span.set_attribute("db.connection_acquire_seconds", round(counters.connection_acquire_seconds, 6))
+    finally:
+        _current_counters.reset(token)
+        if parent is not None:
+            parent.add(counters.rows, counters.bytes, counters.connection_acquire_seconds)
+        timings = _current_timings.get()
+        if timings is not None:
+            timings.add(name, time.perf_counter() - started)
+
+
+@contextmanager
+def migration_trace(name: str, **attributes: Any) -> Iterator[StageTimings]:
+    """
+    Span raiz de uma migração; as etapas executadas dentro dele (inclusive em threads que copiam o contexto)
+    são somadas nas StageTimings devolvidas
+    """
+    timings = StageTimings()
+    token = _current_timings.set(timings)
+    try:
+        with stage(name, **attributes) as span:
+            timings.trace_id = format(span.get_span_context().trace_id, "032x")
+            yield timings
+    finally:
+        _current_timings.reset(token)
+
+
+def annotate(**attributes: Any):
+    """Adiciona atributos ao span ativo"""
+    trace.get_current_span().set_attributes(_attributes(attributes))
+
+
+def record_batch(name: str, seconds: float, timings: Optional[StageTimings], counters: Optional[_SpanCounters],
+                 rows: int = 0, bytes_: int = 0):
+    """
+    Soma um lote lido ou gravado à etapa (sem um span por lote, que seriam milhares)
+    timings e counters são capturados na thread que iniciou a cópia: leitores e escritores podem rodar em outras threads
+    """
+    if timings is not None:
+        timings.add(name, seconds, rows, bytes_)
+    if counters is not None:
+        counters.add(rows=rows, bytes_=bytes_)
+
+
+def record_connection_acquire(seconds: float):
+    """Espera por uma conexão do pool, atribuída ao span ativo e à etapa 'connection.acquire' da migração"""
+    counters = _current_counters.get()
+    if counters is not None:
+        counters.add(connection_acquire_seconds=seconds)
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.add("connection.acquire", seconds)
+
+
+def _attributes(attributes: Dict[str, Any]) -> Dict[str, Any]:
+    """Atributos de span aceitam apenas tipos primitivos; None é descartado"""
+    return {
+        key: value if isinstance(value, (str, bool, int, float)) else str(value)
+        for key, value in attributes.items() if value is not None
+    }
+
+
+def shutdown_tracing():
+    """Exporta os spans pendentes e fecha os exportadores"""
+    tracer_provider.shutdown()
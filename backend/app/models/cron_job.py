@@ -1,7 +1,8 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime
 from enum import Enum
+from ..core.config import settings
 
 
 class CronJobStatus(str, Enum):
@@ -16,6 +17,11 @@ class CronJobCreate(BaseModel):
     description: Optional[str] = Field(None, description="Descrição do cron job")
     overwrite: bool = Field(False, description="Sobrescrever tabelas se existirem no destino")
     max_tables: int = Field(10, description="Número máximo de tabelas para migrar")
+    parallel_workers: Optional[int] = Field(None, ge=1, le=settings.max_migration_workers, description="Tabelas migradas em paralelo (padrão: MIGRATION_WORKERS; até MAX_MIGRATION_WORKERS)")
+    sync_mode: str = Field("full", description="'full', 'incremental' (tabelas sem marca d'água configurada usam 'full'), 'merge' ou 'shadow'")
+    delete_missing: bool = Field(False, description="No modo merge, remove do destino os registros que não existem mais na origem")
+    fast_load: bool = Field(False, description="Carrega sem índices secundários e FKs e os cria em paralelo ao final")
+    bulk_load: bool = Field(False, description="Aplica o perfil de carga em massa nas conexões do destino (BULK_LOAD_*)")
 
 
 class CronJobResponse(BaseModel):
@@ -29,6 +35,34 @@ class CronJobResponse(BaseModel):
     last_run: Optional[datetime]
     overwrite: bool
     max_tables: int
+    parallel_workers: Optional[int] = None
+    sync_mode: str = "full"
+    delete_missing: bool = False
+    fast_load: bool = False
+    bulk_load: bool = False
+    # Última execução (job em /api/v1/jobs), espera dela na fila e disparos incorporados a execuções pendentes
+    last_job_id: Optional[str] = None
+    last_queue_wait_seconds: Optional[float] = None
+    coalesced_runs: int = 0
+
+
+class CronRunInfo(BaseModel):
+    """Execução de cron job no executor: seconds é o tempo de execução (em andamento) ou de espera (na fila)"""
+    cron_job_id: str
+    job_id: str
+    name: Optional[str] = None
+    workers: int
+    queued_at: datetime
+    seconds: float
+    coalesced_runs: int = 0
+
+
+class CronExecutorStatus(BaseModel):
+    max_concurrent_runs: int
+    running: List[CronRunInfo]
+    pending: List[CronRunInfo]
+    connection_budgets: Dict[str, int]
+    connections_in_use: Dict[str, int]
 
 
 class CronJobList(BaseModel):
@@ -0,0 +1,88 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List, Dict, Any
+from datetime import datetime
+from enum import Enum
+from ..core.config import settings
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class JobKind(str, Enum):
+    MIGRATE_TABLE = "migrate_table"
+    MIGRATE_BATCH = "migrate_batch"
+
+
+class JobSource(str, Enum):
+    API = "api"
+    CRON = "cron"
+
+
+class MigrationJobCreate(BaseModel):
+    table_name: str = Field(..., description="Tabela a ser migrada")
+    overwrite: bool = Field(False, description="Sobrescrever tabela se existir no destino")
+    pipelined: bool = Field(False, description="Lê o próximo lote da origem enquanto o atual é gravado no destino")
+    queue_size: Optional[int] = Field(None, ge=1, description="Lotes em espera entre leitura e escrita no modo pipeline")
+    load_strategy: str = Field("insert", description="Estratégia de carga no destino: 'insert', 'load_data' (MySQL), 'copy' ou 'copy_binary' (PostgreSQL)")
+    parallel_ranges: int = Field(1, ge=1, le=settings.max_migration_workers, description="Divide a tabela em N faixas da chave primária copiadas em paralelo (até MAX_MIGRATION_WORKERS)")
+    mode: str = Field("full", description="'full', 'incremental', 'merge' ou 'shadow'")
+    watermark_column: Optional[str] = Field(None, description="Coluna de marca d'água do modo incremental (padrão: a configurada)")
+    delete_missing: bool = Field(False, description="No modo merge, remove do destino os registros que não existem mais na origem")
+    fast_load: bool = Field(False, description="Cria a tabela só com a chave primária e adiciona índices secundários e foreign keys após a carga")
+    bulk_load: bool = Field(False, description="Aplica o perfil de carga em massa nas conexões do destino (BULK_LOAD_*)")
+
+
+class BatchJobCreate(BaseModel):
+    overwrite: bool = Field(False, description="Sobrescrever tabelas se existirem no destino")
+    max_tables: int = Field(10, description="Número máximo de tabelas para migrar")
+    load_strategy: str = Field("insert", description="Estratégia de carga no destino")
+    workers: Optional[int] = Field(None, ge=1, le=settings.max_migration_workers, description="Tabelas migradas em paralelo (padrão: MIGRATION_WORKERS; até MAX_MIGRATION_WORKERS)")
+    mode: str = Field("full", description="'full', 'incremental', 'merge' ou 'shadow'")
+    delete_missing: bool = Field(False, description="No modo merge, remove do destino os registros que não existem mais na origem")
+    fast_load: bool = Field(False, description="Carrega sem índices secundários e FKs e os cria em paralelo ao final")
+    bulk_load: bool = Field(False, description="Aplica o perfil de carga em massa nas conexões do destino (BULK_LOAD_*)")
+
+
+class JobProgress(BaseModel):
+    """Progresso de um job de migração"""
+    rows_copied: int = 0
+    bytes_copied: int = 0
+    estimated_rows: int = 0
+    percent: Optional[float] = None
+    rows_per_second: float = 0.0
+    eta_seconds: Optional[float] = None
+    elapsed_seconds: float = 0.0
+    current_table: Optional[str] = None
+    running_tables: List[str] = []
+    tables_done: int = 0
+    tables_total: int = 0
+
+
+class JobResponse(BaseModel):
+    """Modelo para um job de migração executado em segundo plano"""
+    id: str
+    kind: JobKind
+    source: JobSource
+    status: JobStatus
+    params: Dict[str, Any]
+    cron_job_id: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    # Espera entre o pedido (ou disparo do cron) e o início da execução
+    queue_wait_seconds: Optional[float] = None
+    # Disparos do cron incorporados a este job enquanto ele aguardava na fila
+    coalesced_runs: int = 0
+    progress: JobProgress
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+
+class JobList(BaseModel):
+    jobs: List[JobResponse]
+    total: int
@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+
+class ReplicationStatus(BaseModel):
+    """Modelo para o estado da replicação contínua por binlog"""
+    running: bool
+    log_file: Optional[str] = None
+    log_pos: Optional[int] = None
+    started_at: Optional[datetime] = None
+    events_applied: int = 0
+    transactions_applied: int = 0
+    batches_applied: int = 0
+    events_per_second: float = 0.0
+    last_event_at: Optional[datetime] = None
+    apply_lag_seconds: Optional[float] = None
+    last_error: Optional[str] = None
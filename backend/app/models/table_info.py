@@ -1,5 +1,6 @@
+from datetime import datetime
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 
 class TableInfo(BaseModel):
@@ -9,6 +10,9 @@ class TableInfo(BaseModel):
     size_mb: float
     data_length: int
     index_length: int
+    # 'exact', 'estimated' (catálogo do banco) ou 'cached' (contagem exata feita há count_age_seconds)
+    count_kind: str = "exact"
+    count_age_seconds: Optional[float] = None
 
 
 class DatabaseSummary(BaseModel):
@@ -18,6 +22,7 @@ class DatabaseSummary(BaseModel):
     total_tables: int
     total_rows: int
     total_size_mb: float
+    count_strategy: Optional[str] = None
     tables: List[TableInfo]
 
 
@@ -46,6 +51,54 @@ class MigrationResult(BaseModel):
     success: bool
     table_name: str
     records_migrated: int = 0
+    records_deleted: Optional[int] = None
     overwritten: bool = False
+    mode: Optional[str] = None
+    load_strategy: Optional[str] = None
+    copy_seconds: Optional[float] = None
+    rows_per_second: Optional[float] = None
+    pipeline: Optional[Dict[str, Any]] = None
+    ranges: Optional[Dict[str, Any]] = None
+    incremental: Optional[Dict[str, Any]] = None
+    shadow: Optional[Dict[str, Any]] = None
+    foreign_keys_error: Optional[str] = None
+    deferred: Optional[Dict[str, Any]] = None
+    bulk_load: Optional[Dict[str, Any]] = None
+    stages: Optional[Dict[str, Dict[str, Any]]] = None
+    trace_id: Optional[str] = None
     error: Optional[str] = None
-    message: str 
\ No newline at end of file
+    message: str 
+
+
+class IncrementalTableConfig(BaseModel):
+    """Modelo para configuração da sincronização incremental de uma tabela"""
+    table_name: str
+    watermark_column: Optional[str] = None
+    watermark: Optional[str] = None
+    updated_at: Optional[str] = None
+
+
+class TableDiffResult(BaseModel):
+    """Modelo para o resultado da comparação por checksum de uma tabela"""
+    table_name: str
+    key_column: str
+    checksum: str
+    in_sync: bool
+    initial_chunks: int
+    chunks_compared: int
+    checksum_queries: int
+    divergent_ranges: List[Dict[str, Any]]
+    repair: Optional[Dict[str, Any]] = None
+    elapsed_seconds: float
+
+
+class DependencyGraph(BaseModel):
+    """Modelo para o grafo de foreign keys de um banco e a ordem de carga calculada sobre ele"""
+    database_type: str
+    tables: List[str]
+    dependencies: Dict[str, List[str]]
+    order: List[str]
+    levels: List[List[str]]
+    cycle_groups: List[List[str]]
+    computed_at: datetime
+    elapsed_seconds: float
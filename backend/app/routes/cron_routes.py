@@ -6,7 +6,8 @@ from ..models.cron_job import (
     CronJobCreate, 
     CronJobResponse, 
     CronJobList, 
-    CronJobDelete
+    CronJobDelete,
+    CronExecutorStatus
 )
 
 logger = logging.getLogger(__name__)
@@ -94,4 +95,15 @@ async def get_cron_job_count():
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Erro ao obter contagem de cron jobs: {str(e)}"
-        ) 
\ No newline at end of file
+        ) 
+
+
+@router.get("/executor", response_model=CronExecutorStatus)
+async def get_cron_executor_status():
+    """
+    Estado do executor de sincronizações dos cron jobs
+    
+    - Execuções em andamento e aguardando na fila (com o tempo de espera)
+    - Orçamento de conexões por banco e conexões em uso
+    """
+    return cron_service.get_executor_status()
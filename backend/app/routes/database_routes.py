@@ -1,13 +1,17 @@
 from fastapi import APIRouter, HTTPException, status, Query
-from typing import Dict, Any
+from typing import Dict, Any, List, Literal, Optional
 import logging
 from ..services.database_service import DatabaseService
+from ..core.blocking import run_blocking, run_migration
 from ..models.table_info import (
     DatabaseSummary, 
     ConnectionStatus, 
     SyncComparison, 
     HealthCheck,
-    MigrationResult
+    MigrationResult,
+    IncrementalTableConfig,
+    TableDiffResult,
+    DependencyGraph
 )
 from ..core.config import settings
 
@@ -20,7 +24,7 @@ router = APIRouter(prefix="/api/v1/database", tags=["database"])
 async def health_check():
     """Endpoint para verificar a saúde da aplicação"""
     try:
-        connections = DatabaseService.test_connections()
+        connections = await run_blocking(DatabaseService.test_connections)
         return HealthCheck(
             status="healthy",
             connections=connections,
@@ -38,11 +42,24 @@ async def health_check():
 
 
 
+REFRESH_DESCRIPTION = "Ignora o cache de metadados e consulta os bancos novamente (METADATA_CACHE_TTL_SECONDS)"
+# Valores fora da lista são recusados com 422 antes de chegar aos bancos
+CountStrategy = Literal["estimated", "exact", "cached"]
+COUNT_STRATEGY_DESCRIPTION = "Contagem de registros: 'estimated' (catálogo, sem varrer tabelas), 'exact' (COUNT(*) em paralelo com tempo limite) ou 'cached' (exata com TTL); padrão: ROW_COUNT_STRATEGY"
+
+
 @router.get("/source/tables", response_model=DatabaseSummary)
-async def get_source_tables(sort_by_dependencies: bool = Query(False, description="Ordenar por dependências de foreign keys")):
+async def get_source_tables(
+    sort_by_dependencies: bool = Query(False, description="Ordenar por dependências de foreign keys"),
+    count_strategy: Optional[CountStrategy] = Query(None, description=COUNT_STRATEGY_DESCRIPTION),
+    refresh: bool = Query(False, description=REFRESH_DESCRIPTION)
+):
     """Obtém informações das tabelas do banco de origem"""
     try:
-        return DatabaseService.get_source_tables(sort_by_dependencies=sort_by_dependencies)
+        return await run_blocking(
+            DatabaseService.get_source_tables,
+            sort_by_dependencies=sort_by_dependencies, count_strategy=count_strategy, refresh=refresh
+        )
     except Exception as e:
         logger.error(f"Erro ao obter tabelas do source: {e}")
         raise HTTPException(
@@ -52,10 +69,13 @@ async def get_source_tables(sort_by_dependencies: bool = Query(False, descriptio
 
 
 @router.get("/destination/tables", response_model=DatabaseSummary)
-async def get_destination_tables():
+async def get_destination_tables(
+    count_strategy: Optional[CountStrategy] = Query(None, description=COUNT_STRATEGY_DESCRIPTION),
+    refresh: bool = Query(False, description=REFRESH_DESCRIPTION)
+):
     """Obtém informações das tabelas do banco de destino"""
     try:
-        return DatabaseService.get_destination_tables()
+        return await run_blocking(DatabaseService.get_destination_tables, count_strategy=count_strategy, refresh=refresh)
     except Exception as e:
         logger.error(f"Erro ao obter tabelas do destination: {e}")
         raise HTTPException(
@@ -64,11 +84,48 @@ async def get_destination_tables():
         )
 
 
+@router.get("/cache/stats", response_model=Dict[str, Any])
+async def get_cache_stats():
+    """Estatísticas do cache de metadados (acertos, faltas, cargas compartilhadas, invalidações)"""
+    return DatabaseService.get_cache_stats()
+
+
+@router.post("/cache/invalidate", response_model=Dict[str, Any])
+async def invalidate_cache(
+    database: Optional[str] = Query(None, description="'source' ou 'destination' (padrão: todos)"),
+    table_name: Optional[str] = Query(None, description="Descarta só a estrutura desta tabela (e os resumos do banco)")
+):
+    """Descarta metadados em cache"""
+    try:
+        return DatabaseService.invalidate_cache(database, table_name)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/dependencies", response_model=DependencyGraph)
+async def get_dependency_graph(
+    database: str = Query("source", description="'source' ou 'destination'"),
+    refresh: bool = Query(False, description="Recalcula o grafo em vez de usar o guardado (DEPENDENCY_GRAPH_TTL_SECONDS)")
+):
+    """Obtém o grafo de foreign keys, a ordem de carga, as camadas paralelizáveis e os grupos em ciclo"""
+    try:
+        return await run_blocking(DatabaseService.get_dependency_graph, database, refresh=refresh)
+    except Exception as e:
+        logger.error(f"Erro ao obter grafo de dependências: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao obter grafo de dependências: {str(e)}"
+        )
+
+
 @router.get("/compare", response_model=SyncComparison)
-async def compare_databases():
+async def compare_databases(
+    count_strategy: Optional[CountStrategy] = Query(None, description=COUNT_STRATEGY_DESCRIPTION),
+    refresh: bool = Query(False, description=REFRESH_DESCRIPTION)
+):
     """Compara os bancos de origem e destino"""
     try:
-        return DatabaseService.compare_databases()
+        return await run_blocking(DatabaseService.compare_databases, count_strategy=count_strategy, refresh=refresh)
     except Exception as e:
         logger.error(f"Erro ao comparar bancos: {e}")
         raise HTTPException(
@@ -78,16 +135,18 @@ async def compare_databases():
 
 
 @router.get("/summary", response_model=Dict[str, Any])
-async def get_database_summary():
+async def get_database_summary(
+    count_strategy: Optional[CountStrategy] = Query(None, description=COUNT_STRATEGY_DESCRIPTION),
+    refresh: bool = Query(False, description=REFRESH_DESCRIPTION)
+):
     """Obtém um resumo completo dos bancos de dados"""
     try:
-        source_summary = DatabaseService.get_source_tables()
-        destination_summary = DatabaseService.get_destination_tables()
-        comparison = DatabaseService.compare_databases()
+        # A comparação já traz os dois resumos: cada banco é consultado uma vez só
+        comparison = await run_blocking(DatabaseService.compare_databases, count_strategy=count_strategy, refresh=refresh)
         
         return {
-            "source": source_summary.dict(),
-            "destination": destination_summary.dict(),
+            "source": comparison.source_summary.dict(),
+            "destination": comparison.destination_summary.dict(),
             "comparison": comparison.dict(),
             "status": "success"
         }
@@ -99,14 +158,82 @@ async def get_database_summary():
         )
 
 
+@router.get("/diff/{table_name}", response_model=TableDiffResult)
+async def diff_table(
+    table_name: str,
+    chunks: Optional[int] = Query(None, ge=1, description="Faixas iniciais da chave primária (padrão: DIFF_CHUNK_COUNT)"),
+    min_chunk_rows: Optional[int] = Query(None, ge=1, description="Faixas com até esse número de registros não são bissectadas (padrão: DIFF_MIN_CHUNK_ROWS)")
+):
+    """Compara uma tabela entre origem e destino por checksums de faixas da chave primária"""
+    try:
+        return await run_migration(DatabaseService.diff_table, table_name, chunks=chunks, min_chunk_rows=min_chunk_rows)
+    except Exception as e:
+        logger.error(f"Erro ao comparar tabela {table_name}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao comparar tabela {table_name}: {str(e)}"
+        )
+
+
+@router.post("/diff/{table_name}/repair", response_model=TableDiffResult)
+async def repair_table(
+    table_name: str,
+    chunks: Optional[int] = Query(None, ge=1, description="Faixas iniciais da chave primária (padrão: DIFF_CHUNK_COUNT)"),
+    min_chunk_rows: Optional[int] = Query(None, ge=1, description="Faixas com até esse número de registros não são bissectadas (padrão: DIFF_MIN_CHUNK_ROWS)"),
+    load_strategy: str = Query("insert", description="Estratégia de carga usada na recópia das faixas divergentes")
+):
+    """Compara uma tabela por checksums e copia novamente apenas as faixas divergentes"""
+    try:
+        return await run_migration(
+            DatabaseService.diff_table,
+            table_name,
+            repair=True,
+            chunks=chunks,
+            min_chunk_rows=min_chunk_rows,
+            load_strategy=load_strategy
+        )
+    except Exception as e:
+        logger.error(f"Erro ao reparar tabela {table_name}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao reparar tabela {table_name}: {str(e)}"
+        )
+
+
 @router.post("/migrate/{table_name}", response_model=MigrationResult)
 async def migrate_table(
     table_name: str,
-    overwrite: bool = Query(False, description="Sobrescrever tabela se existir no destino")
+    overwrite: bool = Query(False, description="Sobrescrever tabela se existir no destino"),
+    pipelined: bool = Query(False, description="Lê o próximo lote da origem enquanto o atual é gravado no destino"),
+    queue_size: Optional[int] = Query(None, ge=1, description="Lotes em espera entre leitura e escrita no modo pipeline"),
+    load_strategy: str = Query("insert", description="Estratégia de carga no destino: 'insert', 'load_data' (MySQL, requer MYSQL_LOCAL_INFILE), 'copy' ou 'copy_binary' (PostgreSQL)"),
+    parallel_ranges: int = Query(1, ge=1, le=settings.max_migration_workers, description="Divide a tabela em N faixas da chave primária copiadas em paralelo (até MAX_MIGRATION_WORKERS)"),
+    mode: str = Query("full", description="'full' recria e copia tudo; 'incremental' copia só registros após a marca d'água (upsert); 'merge' faz upsert de tudo na tabela existente; 'shadow' carrega uma tabela sombra e troca com RENAME atômico"),
+    watermark_column: Optional[str] = Query(None, description="Coluna de marca d'água do modo incremental (padrão: a configurada)"),
+    delete_missing: bool = Query(False, description="No modo merge, remove do destino os registros que não existem mais na origem"),
+    fast_load: bool = Query(False, description="Cria a tabela só com a chave primária e adiciona índices secundários e foreign keys após a carga"),
+    bulk_load: bool = Query(False, description="Aplica o perfil de carga em massa nas conexões do destino (BULK_LOAD_*) e compara o throughput com a execução anterior")
 ):
     """Migra uma tabela do banco de origem para o banco de destino"""
     try:
-        result = DatabaseService.migrate_table(table_name, overwrite)
+        DatabaseService.validate_copy_options(pipelined, parallel_ranges)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    try:
+        result = await run_migration(
+            DatabaseService.migrate_table,
+            table_name,
+            overwrite,
+            pipelined=pipelined,
+            queue_size=queue_size,
+            load_strategy=load_strategy,
+            parallel_ranges=parallel_ranges,
+            mode=mode,
+            watermark_column=watermark_column,
+            delete_missing=delete_missing,
+            fast_load=fast_load,
+            bulk_load=bulk_load
+        )
         return MigrationResult(**result)
     except Exception as e:
         logger.error(f"Erro ao migrar tabela {table_name}: {e}")
@@ -119,48 +246,71 @@ async def migrate_table(
 @router.post("/migrate-batch", response_model=Dict[str, Any])
 async def migrate_batch(
     overwrite: bool = Query(False, description="Sobrescrever tabelas se existirem no destino"),
-    max_tables: int = Query(10, description="Número máximo de tabelas para migrar")
+    max_tables: int = Query(10, description="Número máximo de tabelas para migrar"),
+    load_strategy: str = Query("insert", description="Estratégia de carga no destino: 'insert', 'load_data' (MySQL), 'copy' ou 'copy_binary' (PostgreSQL)"),
+    workers: Optional[int] = Query(None, ge=1, le=settings.max_migration_workers, description="Tabelas migradas em paralelo (padrão: MIGRATION_WORKERS; até MAX_MIGRATION_WORKERS)"),
+    mode: str = Query("full", description="'full', 'incremental' (tabelas sem marca d'água configurada usam 'full'), 'merge' ou 'shadow'"),
+    delete_missing: bool = Query(False, description="No modo merge, remove do destino os registros que não existem mais na origem"),
+    fast_load: bool = Query(False, description="Carrega sem índices secundários e FKs, sem ordem de dependência; cria índices e FKs em paralelo ao final"),
+    bulk_load: bool = Query(False, description="Aplica o perfil de carga em massa nas conexões do destino (BULK_LOAD_*)")
 ):
-    """Migra múltiplas tabelas na ordem correta de dependências"""
+    """Migra múltiplas tabelas em paralelo, respeitando a ordem de dependências"""
     try:
-        # Obtém tabelas ordenadas por dependências
-        source_tables = DatabaseService.get_source_tables(sort_by_dependencies=True)
-        
-        results = []
-        migrated_count = 0
-        
-        for table in source_tables.tables[:max_tables]:
-            try:
-                result = DatabaseService.migrate_table(table.table_name, overwrite)
-                results.append(result)
-                migrated_count += 1
-                
-                if result["success"]:
-                    logger.info(f"Tabela {table.table_name} migrada com sucesso")
-                else:
-                    logger.warning(f"Falha na migração da tabela {table.table_name}: {result.get('error', 'Erro desconhecido')}")
-                    
-            except Exception as e:
-                logger.error(f"Erro ao migrar tabela {table.table_name}: {e}")
-                results.append({
-                    "success": False,
-                    "table_name": table.table_name,
-                    "error": str(e),
-                    "message": f"Erro na migração da tabela {table.table_name}"
-                })
-        
-        return {
-            "success": True,
-            "total_tables": len(source_tables.tables),
-            "migrated_count": migrated_count,
-            "max_tables": max_tables,
-            "results": results,
-            "message": f"Migração em lote concluída: {migrated_count} tabelas processadas"
-        }
+        return await run_migration(
+            DatabaseService.migrate_batch,
+            overwrite=overwrite,
+            max_tables=max_tables,
+            load_strategy=load_strategy,
+            workers=workers,
+            mode=mode,
+            delete_missing=delete_missing,
+            fast_load=fast_load,
+            bulk_load=bulk_load
+        )
         
     except Exception as e:
         logger.error(f"Erro na migração em lote: {e}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Erro na migração em lote: {str(e)}"
-        ) 
\ No newline at end of file
+        ) 
+
+
+@router.get("/incremental", response_model=List[IncrementalTableConfig])
+async def list_incremental_configs():
+    """Lista as tabelas configuradas para sincronização incremental e suas marcas d'água"""
+    try:
+        return await run_blocking(DatabaseService.list_incremental_configs)
+    except Exception as e:
+        logger.error(f"Erro ao listar configurações incrementais: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao listar configurações incrementais: {str(e)}"
+        )
+
+
+@router.put("/incremental/{table_name}", response_model=IncrementalTableConfig)
+async def set_incremental_config(
+    table_name: str,
+    watermark_column: str = Query(..., description="Coluna monotônica (ex: updated_at ou id auto-incremento)")
+):
+    """Configura a sincronização incremental de uma tabela"""
+    try:
+        return await run_blocking(DatabaseService.set_incremental_config, table_name, watermark_column)
+    except Exception as e:
+        logger.error(f"Erro ao configurar sincronização incremental da tabela {table_name}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao configurar sincronização incremental da tabela {table_name}: {str(e)}"
+        )
+
+
+@router.delete("/incremental/{table_name}")
+async def remove_incremental_config(table_name: str):
+    """Remove a configuração incremental de uma tabela (a próxima sincronização será completa)"""
+    if not await run_blocking(DatabaseService.remove_incremental_config, table_name):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Tabela {table_name} não possui configuração incremental"
+        )
+    return {"success": True, "message": f"Configuração incremental da tabela {table_name} removida"}
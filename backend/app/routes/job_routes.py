@@ -0,0 +1,94 @@
+from fastapi import APIRouter, HTTPException, Query, status
+from typing import Optional
+import logging
+from ..services.job_service import job_service
+from ..services.database_service import DatabaseService
+from ..models.job import (
+    JobKind,
+    JobStatus,
+    JobResponse,
+    JobList,
+    MigrationJobCreate,
+    BatchJobCreate
+)
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/v1/jobs", tags=["jobs"])
+
+
+@router.post("/migrate", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_migrate_table(job_data: MigrationJobCreate):
+    """
+    Enfileira a migração de uma tabela e retorna o ID do job sem aguardar a cópia
+    
+    Acompanhe o progresso em `GET /api/v1/jobs/{job_id}`
+    """
+    try:
+        DatabaseService.validate_copy_options(job_data.pipelined, job_data.parallel_ranges)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    try:
+        return await job_service.submit(JobKind.MIGRATE_TABLE, job_data.model_dump())
+    except Exception as e:
+        logger.error(f"Erro ao enfileirar migração da tabela {job_data.table_name}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao enfileirar migração: {str(e)}"
+        )
+
+
+@router.post("/migrate-batch", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_migrate_batch(job_data: BatchJobCreate):
+    """Enfileira uma migração em lote e retorna o ID do job sem aguardar a cópia"""
+    try:
+        return await job_service.submit(JobKind.MIGRATE_BATCH, job_data.model_dump())
+    except Exception as e:
+        logger.error(f"Erro ao enfileirar migração em lote: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erro ao enfileirar migração em lote: {str(e)}"
+        )
+
+
+@router.get("", response_model=JobList)
+async def list_jobs(status_filter: Optional[JobStatus] = Query(None, alias="status", description="Filtra pelo status do job")):
+    """Lista os jobs de migração recentes (API e cron jobs), do mais recente para o mais antigo"""
+    jobs = job_service.list_jobs(status_filter)
+    return JobList(jobs=jobs, total=len(jobs))
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str):
+    """
+    Retorna o estado e o progresso de um job
+    
+    - **progress.rows_copied / bytes_copied**: registros gravados e bytes estimados pelo tamanho médio no catálogo
+    - **progress.rows_per_second / eta_seconds**: taxa desde o início e tempo restante estimado
+    - **progress.current_table**: tabela em cópia (no lote, `running_tables` lista todas)
+    """
+    job = job_service.get_job(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job {job_id} não encontrado"
+        )
+    return job
+
+
+@router.post("/{job_id}/cancel", response_model=JobResponse)
+async def cancel_job(job_id: str):
+    """Cancela um job em fila ou em execução; as cópias param no próximo lote"""
+    try:
+        job = job_service.cancel_job(job_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job {job_id} não encontrado"
+        )
+    return job
@@ -0,0 +1,41 @@
+from fastapi import APIRouter, HTTPException, status
+import logging
+from ..services.replication_service import replication_service
+from ..core.blocking import run_blocking
+from ..models.replication import ReplicationStatus
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/v1/replication", tags=["replication"])
+
+
+@router.get("/status", response_model=ReplicationStatus)
+async def get_replication_status():
+    """
+    Retorna o estado da replicação contínua por binlog
+    
+    - **log_file/log_pos**: último checkpoint aplicado no destino
+    - **apply_lag_seconds**: atraso entre o commit na origem e a aplicação no destino
+    - **events_per_second**: eventos aplicados por segundo no último minuto
+    """
+    return replication_service.status()
+
+
+@router.post("/start", response_model=ReplicationStatus)
+async def start_replication():
+    """Inicia a replicação contínua a partir do último checkpoint (ou da posição atual do binlog)"""
+    try:
+        return await run_blocking(replication_service.start)
+    except Exception as e:
+        logger.error(f"Erro ao iniciar replicação: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@router.post("/stop", response_model=ReplicationStatus)
+async def stop_replication():
+    """Para a replicação contínua (o checkpoint é mantido)"""
+    # Aguarda o fim do lote em andamento: não pode travar o event loop
+    return await run_blocking(replication_service.stop)
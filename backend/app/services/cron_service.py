@@ -3,11 +3,16 @@ from apscheduler.triggers.cron import CronTrigger
 from apscheduler.jobstores.memory import MemoryJobStore
 from apscheduler.executors.asyncio import AsyncIOExecutor
 import logging
+import time
 from typing import Dict, List, Optional
 from datetime import datetime
 import uuid
-from ..models.cron_job import CronJobCreate, CronJobResponse, CronJobStatus
-from ..services.database_service import DatabaseService
+from ..models.cron_job import CronJobCreate, CronJobResponse, CronJobStatus, CronExecutorStatus
+from ..models.job import JobKind, JobSource, JobStatus
+from ..services.job_service import job_service
+from ..core.config import settings
+from ..core.metrics import CRON_RUN_SECONDS, CRON_RUNS_COALESCED, JOB_STATUS_OUTCOMES, OUTCOME_FAILURE
+from ..core.sync_executor import sync_executor
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +23,7 @@ class CronService:
         jobstores = {
             'default': MemoryJobStore()
         }
+        # O scheduler só enfileira as execuções no executor de sincronizações (limites de execuções e conexões)
         executors = {
             'default': AsyncIOExecutor()
         }
@@ -49,7 +55,8 @@ class CronService:
             job = self.scheduler.add_job(
                 func=self._execute_sync_job,
                 trigger=CronTrigger.from_crontab(job_data.cron_expression),
-                args=[job_id, job_data.overwrite, job_data.max_tables],
+                args=[job_id, job_data.overwrite, job_data.max_tables, job_data.parallel_workers, job_data.sync_mode,
+                      job_data.delete_missing, job_data.fast_load, job_data.bulk_load],
                 id=job_id,
                 name=job_data.name,
                 replace_existing=True
@@ -66,7 +73,15 @@ class CronService:
                 "created_at": created_at,
                 "last_run": None,
                 "overwrite": job_data.overwrite,
-                "max_tables": job_data.max_tables
+                "max_tables": job_data.max_tables,
+                "parallel_workers": job_data.parallel_workers,
+                "sync_mode": job_data.sync_mode,
+                "delete_missing": job_data.delete_missing,
+                "fast_load": job_data.fast_load,
+                "bulk_load": job_data.bulk_load,
+                "last_job_id": None,
+                "last_queue_wait_seconds": None,
+                "coalesced_runs": 0
             }
             
             self.jobs[job_id] = job_info
@@ -109,6 +124,11 @@ class CronService:
             # Remover do scheduler
             self.scheduler.remove_job(job_id)
             
+            # Execução ainda na fila é cancelada: ao chegar a vez, termina sem copiar nada
+            pending_run = sync_executor.pending_run_id(job_id)
+            if pending_run:
+                job_service.cancel_job(pending_run)
+            
             # Remover do armazenamento local
             del self.jobs[job_id]
             
@@ -119,53 +139,100 @@ class CronService:
             logger.error(f"Erro ao remover cron job {job_id}: {e}")
             raise Exception(f"Erro ao remover cron job: {str(e)}")
     
-    async def _execute_sync_job(self, job_id: str, overwrite: bool, max_tables: int):
-        """Função executada pelo cron job para sincronização"""
+    async def _execute_sync_job(self, job_id: str, overwrite: bool, max_tables: int, parallel_workers: Optional[int] = None,
+                                sync_mode: str = "full", delete_missing: bool = False, fast_load: bool = False,
+                                bulk_load: bool = False):
+        """Função executada pelo cron job: enfileira a sincronização no executor de sincronizações"""
+        job_info = self.jobs.get(job_id, {})
+        
+        # Execução anterior ainda aguardando na fila: o disparo é incorporado a ela
+        pending_run = sync_executor.coalesce(job_id)
+        if pending_run:
+            job_service.record_coalesced(pending_run)
+            CRON_RUNS_COALESCED.inc()
+            if job_info:
+                job_info["coalesced_runs"] += 1
+            logger.info(f"Cron job {job_id}: execução {pending_run} ainda na fila; disparo incorporado a ela")
+            return
+        
+        # O job fica visível em /api/v1/jobs (status queued) enquanto aguarda capacidade
+        job = job_service.create(
+            JobKind.MIGRATE_BATCH,
+            {
+                "overwrite": overwrite,
+                "max_tables": max_tables,
+                "workers": parallel_workers,
+                "mode": sync_mode,
+                "delete_missing": delete_missing,
+                "fast_load": fast_load,
+                "bulk_load": bulk_load
+            },
+            source=JobSource.CRON,
+            cron_job_id=job_id
+        )
+        if job_info:
+            job_info["last_job_id"] = job.id
+        sync_executor.submit(
+            job_id,
+            job.id,
+            parallel_workers or settings.migration_workers,
+            lambda workers: self._run_sync_job(job_id, job.id, workers),
+            name=job_info.get("name")
+        )
+    
+    async def _run_sync_job(self, job_id: str, run_id: str, workers: int):
+        """Executa a sincronização enfileirada quando o executor libera execução e conexões"""
+        started = time.perf_counter()
+        outcome = OUTCOME_FAILURE
         try:
-            logger.info(f"Iniciando execução do cron job {job_id}")
+            logger.info(f"Iniciando execução do cron job {job_id} (job {run_id}, {workers} workers)")
             
             # Atualizar last_run
             if job_id in self.jobs:
                 self.jobs[job_id]["last_run"] = datetime.now()
             
-            # Executar sincronização
-            source_tables = DatabaseService.get_source_tables(sort_by_dependencies=True)
-            
-            results = []
-            migrated_count = 0
-            
-            for table in source_tables.tables[:max_tables]:
-                try:
-                    result = DatabaseService.migrate_table(table.table_name, overwrite)
-                    results.append(result)
-                    
-                    if result["success"]:
-                        migrated_count += 1
-                        logger.info(f"Cron job {job_id}: Tabela {table.table_name} migrada com sucesso")
-                    else:
-                        logger.warning(f"Cron job {job_id}: Falha na migração da tabela {table.table_name}")
-                        
-                except Exception as e:
-                    logger.error(f"Cron job {job_id}: Erro ao migrar tabela {table.table_name}: {e}")
-                    results.append({
-                        "success": False,
-                        "table_name": table.table_name,
-                        "error": str(e)
-                    })
-            
-            logger.info(f"Cron job {job_id} concluído: {migrated_count} tabelas migradas de {len(source_tables.tables[:max_tables])}")
+            # Executar sincronização (tabelas independentes em paralelo, fora do event loop) com os workers
+            # concedidos pelo orçamento de conexões; o progresso pode ser acompanhado em /api/v1/jobs
+            job = await job_service.execute(run_id, workers=workers)
+            outcome = JOB_STATUS_OUTCOMES.get(job.status.value, OUTCOME_FAILURE)
+            if job_id in self.jobs:
+                self.jobs[job_id]["last_queue_wait_seconds"] = job.queue_wait_seconds
+            if job.status != JobStatus.COMPLETED:
+                logger.error(f"Cron job {job_id}: job {job.id} finalizado com status {job.status.value}: {job.error}")
+                return
+            
+            result = job.result
+            for table_result in result["results"]:
+                if table_result.get("success"):
+                    logger.info(f"Cron job {job_id}: Tabela {table_result['table_name']} migrada com sucesso")
+                else:
+                    logger.warning(f"Cron job {job_id}: Falha na migração da tabela {table_result['table_name']}")
+            
+            logger.info(
+                f"Cron job {job_id} concluído: {result['success_count']} tabelas migradas de {result['migrated_count']} "
+                f"em {result['elapsed_seconds']}s após {job.queue_wait_seconds}s na fila "
+                f"(paralelismo efetivo {result['effective_parallelism']})"
+            )
             
         except Exception as e:
             logger.error(f"Erro na execução do cron job {job_id}: {e}")
+        finally:
+            CRON_RUN_SECONDS.labels(outcome).observe(time.perf_counter() - started)
+    
+    def get_executor_status(self) -> CronExecutorStatus:
+        """Execuções em andamento e na fila e uso do orçamento de conexões"""
+        return CronExecutorStatus(**sync_executor.stats())
     
     def get_job_count(self) -> int:
         """Retorna o número total de cron jobs"""
         return len(self.jobs)
     
     def shutdown(self):
-        """Desliga o scheduler"""
+        """Desliga o scheduler e descarta as execuções que aguardavam na fila"""
         if self.scheduler.running:
             self.scheduler.shutdown()
+        for run_id in sync_executor.shutdown():
+            job_service.cancel_job(run_id)
 
 
 # Instância global do serviço
@@ -1,7 +1,16 @@
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any
 import logging
+import time
+from ..core.config import settings
 from ..core.database import db_manager
-from ..models.table_info import DatabaseSummary, ConnectionStatus, SyncComparison
+from ..core.dag_executor import DependencyDagExecutor
+from ..core.progress import MigrationProgress
+from ..core.metrics import record_migration, OUTCOME_SUCCESS, OUTCOME_FAILURE, OUTCOME_CANCELLED
+from ..core.tracing import stage
+from ..core.sync_state import sync_state, decode_state_value
+from ..models.table_info import DatabaseSummary, ConnectionStatus, SyncComparison, IncrementalTableConfig, TableDiffResult, DependencyGraph
 
 logger = logging.getLogger(__name__)
 
@@ -20,31 +29,59 @@ class DatabaseService:
             raise
     
     @staticmethod
-    def get_source_tables(sort_by_dependencies: bool = False) -> DatabaseSummary:
+    def get_source_tables(sort_by_dependencies: bool = False, count_strategy: Optional[str] = None,
+                          refresh: bool = False) -> DatabaseSummary:
         """Obtém informações das tabelas do banco de origem"""
         try:
-            summary = db_manager.get_database_summary('source', sort_by_dependencies=sort_by_dependencies)
+            summary = db_manager.get_database_summary(
+                'source', sort_by_dependencies=sort_by_dependencies, count_strategy=count_strategy, refresh=refresh
+            )
             return DatabaseSummary(**summary)
         except Exception as e:
             logger.error(f"Erro ao obter tabelas do banco source: {e}")
             raise
     
     @staticmethod
-    def get_destination_tables(sort_by_dependencies: bool = False) -> DatabaseSummary:
+    def get_destination_tables(sort_by_dependencies: bool = False, count_strategy: Optional[str] = None,
+                               refresh: bool = False) -> DatabaseSummary:
         """Obtém informações das tabelas do banco de destino"""
         try:
-            summary = db_manager.get_database_summary('destination', sort_by_dependencies=sort_by_dependencies)
+            summary = db_manager.get_database_summary(
+                'destination', sort_by_dependencies=sort_by_dependencies, count_strategy=count_strategy, refresh=refresh
+            )
             return DatabaseSummary(**summary)
         except Exception as e:
             logger.error(f"Erro ao obter tabelas do banco destination: {e}")
             raise
     
     @staticmethod
-    def compare_databases() -> SyncComparison:
-        """Compara os bancos de origem e destino"""
+    def get_dependency_graph(database_type: str = "source", refresh: bool = False) -> DependencyGraph:
+        """Obtém o grafo de foreign keys e a ordem de carga das tabelas"""
         try:
-            source_summary = DatabaseService.get_source_tables()
-            destination_summary = DatabaseService.get_destination_tables()
+            return DependencyGraph(**db_manager.get_dependency_plan(database_type, refresh=refresh))
+        except Exception as e:
+            logger.error(f"Erro ao obter grafo de dependências do banco {database_type}: {e}")
+            raise
+    
+    @staticmethod
+    def get_cache_stats() -> Dict[str, Any]:
+        """Estatísticas do cache de metadados"""
+        return db_manager.metadata_cache.stats()
+    
+    @staticmethod
+    def invalidate_cache(database_type: Optional[str] = None, table_name: Optional[str] = None) -> Dict[str, Any]:
+        """Descarta metadados em cache (de um banco, de uma tabela ou todos)"""
+        if database_type is not None and database_type not in ['source', 'destination']:
+            raise ValueError("database_type deve ser 'source' ou 'destination'")
+        removed = db_manager.invalidate_metadata(database_type, table_name)
+        return {"success": True, "entries_removed": removed}
+    
+    @staticmethod
+    def compare_databases(count_strategy: Optional[str] = None, refresh: bool = False) -> SyncComparison:
+        """Compara os bancos de origem e destino (a partir dos resumos do cache de metadados)"""
+        try:
+            source_summary = DatabaseService.get_source_tables(count_strategy=count_strategy, refresh=refresh)
+            destination_summary = DatabaseService.get_destination_tables(count_strategy=count_strategy, refresh=refresh)
             
             # Encontra diferenças entre os bancos
             differences = DatabaseService._find_differences(source_summary, destination_summary)
@@ -101,17 +138,239 @@ class DatabaseService:
                         "source_info": source_table.dict(),
                         "destination_info": dest_table.dict(),
                         "row_count_diff": source_table.row_count - dest_table.row_count,
+                        # Com contagens estimadas a diferença de registros é aproximada
+                        "approximate": "estimated" in (source_table.count_kind, dest_table.count_kind),
                         "size_diff_mb": round(source_table.size_mb - dest_table.size_mb, 2)
                     })
         
         return differences
     
     @staticmethod
-    def migrate_table(table_name: str, overwrite: bool = False) -> Dict[str, Any]:
-        """Migra uma tabela do banco de origem para o banco de destino"""
+    def diff_table(table_name: str, repair: bool = False, chunks: Optional[int] = None,
+                   min_chunk_rows: Optional[int] = None, load_strategy: str = "insert") -> TableDiffResult:
+        """Compara uma tabela por checksums de faixas e, se solicitado, recopia só as faixas divergentes"""
+        try:
+            result = db_manager.diff_table(
+                table_name,
+                repair=repair,
+                chunks=chunks,
+                min_chunk_rows=min_chunk_rows,
+                load_strategy=load_strategy
+            )
+            return TableDiffResult(**result)
+        except Exception as e:
+            logger.error(f"Erro ao comparar tabela {table_name} por checksum: {e}")
+            raise
+        finally:
+            if repair:
+                db_manager.invalidate_metadata('destination', table_name)
+    
+    @staticmethod
+    def validate_copy_options(pipelined: bool, parallel_ranges: int):
+        """Recusa combinações de opções de cópia que seriam ignoradas em silêncio"""
+        if pipelined and parallel_ranges > 1:
+            raise ValueError(
+                "pipelined não se aplica com parallel_ranges > 1 (cada faixa já é lida e gravada por uma thread própria); "
+                "use apenas uma das opções"
+            )
+    
+    @staticmethod
+    def migrate_table(table_name: str, overwrite: bool = False, pipelined: bool = False,
+                      queue_size: Optional[int] = None, load_strategy: str = "insert",
+                      parallel_ranges: int = 1, mode: str = "full",
+                      watermark_column: Optional[str] = None, delete_missing: bool = False,
+                      fast_load: bool = False, defer_definitions: bool = False,
+                      bulk_load: bool = False, defer_foreign_keys: bool = False,
+                      progress: Optional[MigrationProgress] = None) -> Dict[str, Any]:
+        """
+        Migra uma tabela do banco de origem para o banco de destino
+        progress: progresso do job (registros, bytes, taxa, ETA); cancelado, interrompe a cópia no próximo lote
+        """
+        if progress is not None:
+            if not progress.tables_total:
+                progress.plan_tables(db_manager.get_table_estimates([table_name]))
+            progress.start()
+            progress.start_table(table_name)
+        started = time.perf_counter()
+        result = None
         try:
-            result = db_manager.migrate_table(table_name, overwrite)
+            result = db_manager.migrate_table(
+                table_name,
+                overwrite,
+                pipelined=pipelined,
+                queue_size=queue_size,
+                load_strategy=load_strategy,
+                parallel_ranges=parallel_ranges,
+                mode=mode,
+                watermark_column=watermark_column,
+                delete_missing=delete_missing,
+                fast_load=fast_load,
+                defer_definitions=defer_definitions,
+                bulk_load=bulk_load,
+                defer_foreign_keys=defer_foreign_keys,
+                progress=progress
+            )
             return result
         except Exception as e:
             logger.error(f"Erro ao migrar tabela {table_name}: {e}")
-            raise 
\ No newline at end of file
+            raise 
+        finally:
+            # A migração altera a tabela e as contagens do destino, mesmo quando falha no meio
+            db_manager.invalidate_metadata('destination', table_name)
+            if progress is not None:
+                progress.finish_table(table_name)
+            if progress is not None and progress.cancelled:
+                outcome = OUTCOME_CANCELLED
+            else:
+                outcome = OUTCOME_SUCCESS if result and result.get("success") else OUTCOME_FAILURE
+            record_migration(
+                table_name,
+                (result or {}).get("mode", mode),
+                outcome,
+                time.perf_counter() - started,
+                (result or {}).get("rows_per_second")
+            )
+    
+    @staticmethod
+    def migrate_batch(overwrite: bool = False, max_tables: int = 10, load_strategy: str = "insert",
+                      workers: Optional[int] = None, mode: str = "full", delete_missing: bool = False,
+                      fast_load: bool = False, bulk_load: bool = False,
+                      progress: Optional[MigrationProgress] = None) -> Dict[str, Any]:
+        """
+        Migra múltiplas tabelas em paralelo respeitando as dependências de foreign keys:
+        cada tabela começa assim que todas as tabelas pai terminam
+        
+        Com fast_load, as tabelas são criadas sem índices secundários e FKs e carregadas sem ordem de dependência;
+        índices e FKs são criados em paralelo, por tabela, depois que todas as cargas terminam
+        
+        Tabelas em ciclo de foreign keys são carregadas juntas, sem esperar umas pelas outras, e criadas sem FKs;
+        as FKs do ciclo são adicionadas ao final, com a checagem de foreign keys desligada
+        
+        Com progress, o cancelamento interrompe as tabelas em cópia no próximo lote e as restantes não são iniciadas
+        """
+        try:
+            # Ordem de carga e grafo de dependências calculados uma vez e reutilizados
+            plan = db_manager.get_dependency_plan('source')
+            table_names = plan["order"][:max_tables]
+            selected = set(table_names)
+            cycle_groups = [[t for t in group if t in selected] for group in plan["cycle_groups"]]
+            cycle_groups = [group for group in cycle_groups if group]
+            in_cycle = {table: set(group) for group in cycle_groups for table in group}
+            
+            if fast_load:
+                dependencies = {}
+            else:
+                # Dependências dentro do ciclo são ignoradas: as FKs do grupo só são criadas depois da carga
+                dependencies = {
+                    table: [parent for parent in plan["dependencies"].get(table, []) if parent not in in_cycle.get(table, ())]
+                    for table in table_names
+                }
+            
+            if progress is not None:
+                progress.plan_tables(db_manager.get_table_estimates(table_names))
+                progress.start()
+            
+            # Cada worker usa uma conexão por banco: o pool comporta até MAX_MIGRATION_WORKERS por migração
+            workers = min(workers or settings.migration_workers, settings.max_migration_workers)
+            executor = DependencyDagExecutor(table_names, dependencies, max_workers=workers)
+            logger.info(f"Iniciando migração em lote de {len(table_names)} tabelas com {workers} workers")
+            
+            # Span do lote: as migrações de cada tabela (em outras threads) ficam como spans filhos
+            with stage("migrate_batch", **{"sync.tables": len(table_names), "sync.workers": workers, "sync.mode": mode}):
+                run = executor.run(
+                    lambda table_name: DatabaseService.migrate_table(
+                        table_name, overwrite, load_strategy=load_strategy, mode=mode, delete_missing=delete_missing,
+                        fast_load=fast_load, defer_definitions=fast_load, bulk_load=bulk_load,
+                        defer_foreign_keys=table_name in in_cycle, progress=progress
+                    )
+                )
+                
+                results = run["results"]
+                deferred_seconds = None
+                if fast_load or in_cycle:
+                    deferred_seconds = DatabaseService._apply_deferred_definitions(results, workers)
+                    db_manager.invalidate_metadata('destination')
+            success_count = sum(1 for result in results if result.get("success"))
+            for result in results:
+                if result.get("success"):
+                    logger.info(f"Tabela {result['table_name']} migrada com sucesso")
+                else:
+                    logger.warning(f"Falha na migração da tabela {result['table_name']}: {result.get('error', 'Erro desconhecido')}")
+            
+            return {
+                "success": True,
+                "total_tables": len(plan["order"]),
+                "migrated_count": len(results),
+                "success_count": success_count,
+                "skipped_count": run["skipped_count"],
+                "max_tables": max_tables,
+                "parallel_workers": workers,
+                "mode": mode,
+                "max_concurrency": run["max_concurrency"],
+                "effective_parallelism": run["effective_parallelism"],
+                "elapsed_seconds": run["elapsed_seconds"],
+                "deferred_definitions_seconds": deferred_seconds,
+                "cycle_groups": cycle_groups,
+                "results": results,
+                "message": f"Migração em lote concluída: {len(results)} tabelas processadas"
+            }
+        except Exception as e:
+            logger.error(f"Erro na migração em lote: {e}")
+            raise
+    
+    @staticmethod
+    def _apply_deferred_definitions(results: List[Dict[str, Any]], workers: int) -> float:
+        """Cria, em paralelo por tabela, os índices e FKs adiados das tabelas carregadas com sucesso"""
+        pending = [
+            result for result in results
+            if result.get("success") and result.get("deferred") and not result["deferred"]["applied"]
+        ]
+        
+        def apply(result: Dict[str, Any]):
+            try:
+                result["deferred"] = db_manager.apply_deferred_definitions(result["table_name"], result["deferred"]["definitions"])
+            except Exception as e:
+                logger.error(f"Erro ao criar índices/foreign keys da tabela {result['table_name']}: {e}")
+                result["success"] = False
+                result["error"] = f"Dados carregados, mas falha ao criar índices/foreign keys: {e}"
+        
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="deferred-definitions") as pool:
+            list(pool.map(lambda result: contextvars.copy_context().run(apply, result), pending))
+        return round(time.perf_counter() - started, 3)
+    
+    @staticmethod
+    def _to_incremental_config(table_name: str, state: Dict[str, Any]) -> IncrementalTableConfig:
+        """Converte o estado persistido de uma tabela no modelo da API"""
+        watermark = decode_state_value(state.get("watermark"))
+        return IncrementalTableConfig(
+            table_name=table_name,
+            watermark_column=state.get("watermark_column"),
+            watermark=None if watermark is None else str(watermark),
+            updated_at=state.get("updated_at")
+        )
+    
+    @staticmethod
+    def list_incremental_configs() -> List[IncrementalTableConfig]:
+        """Lista a configuração incremental e a marca d'água de cada tabela"""
+        return [
+            DatabaseService._to_incremental_config(table_name, state)
+            for table_name, state in sorted(sync_state.list_table_states().items())
+        ]
+    
+    @staticmethod
+    def set_incremental_config(table_name: str, watermark_column: str) -> IncrementalTableConfig:
+        """Configura a coluna de marca d'água de uma tabela (a marca anterior é descartada se a coluna mudar)"""
+        try:
+            state = sync_state.get_table_state(table_name)
+            if state.get("watermark_column") != watermark_column:
+                state = sync_state.update_table_state(table_name, watermark_column=watermark_column, watermark=None)
+            return DatabaseService._to_incremental_config(table_name, state)
+        except Exception as e:
+            logger.error(f"Erro ao configurar sincronização incremental da tabela {table_name}: {e}")
+            raise
+    
+    @staticmethod
+    def remove_incremental_config(table_name: str) -> bool:
+        """Remove a configuração incremental de uma tabela (a próxima sincronização será completa)"""
+        return sync_state.remove_table_state(table_name)
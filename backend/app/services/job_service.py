@@ -0,0 +1,166 @@
+import asyncio
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional, Any
+from ..core.blocking import run_migration
+from ..core.config import settings
+from ..core.metrics import JOB_QUEUE_WAIT_SECONDS
+from ..core.progress import MigrationProgress, JobCancelledError
+from ..models.job import JobKind, JobSource, JobStatus, JobResponse, JobProgress
+from ..services.database_service import DatabaseService
+
+logger = logging.getLogger(__name__)
+
+
+class JobService:
+    """
+    Executa migrações em segundo plano (pool de migrações) e guarda o estado e o progresso de cada job
+    A API recebe o ID do job na hora e consulta o progresso; execuções dos cron jobs também viram jobs
+    """
+
+    # Funções executadas por tipo de job
+    RUNNERS = {
+        JobKind.MIGRATE_TABLE: DatabaseService.migrate_table,
+        JobKind.MIGRATE_BATCH: DatabaseService.migrate_batch
+    }
+
+    FINISHED = (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED)
+
+    def __init__(self):
+        # Armazenamento local dos jobs, do mais antigo para o mais recente (em produção, usar banco de dados)
+        self.jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # Referências às tarefas em execução: o event loop guarda apenas referências fracas
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._lock = threading.Lock()
+
+    def _create_job(self, kind: JobKind, params: Dict[str, Any], source: JobSource,
+                    cron_job_id: Optional[str]) -> Dict[str, Any]:
+        job = {
+            "id": str(uuid.uuid4()),
+            "kind": kind,
+            "source": source,
+            "status": JobStatus.QUEUED,
+            "params": dict(params),
+            "cron_job_id": cron_job_id,
+            "created_at": datetime.now(),
+            "started_at": None,
+            "finished_at": None,
+            "result": None,
+            "error": None,
+            "queue_wait_seconds": None,
+            "coalesced_runs": 0,
+            "progress": MigrationProgress()
+        }
+        with self._lock:
+            self.jobs[job["id"]] = job
+        return job
+
+    def _run_job(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Executa o job na thread do pool de migrações; um job cancelado enquanto aguardava nem começa"""
+        progress = job["progress"]
+        progress.check_cancelled()
+        job["status"] = JobStatus.RUNNING
+        job["started_at"] = datetime.now()
+        # Espera desde o pedido: fila dos cron jobs (quando houver) e pool de migrações
+        job["queue_wait_seconds"] = round((job["started_at"] - job["created_at"]).total_seconds(), 3)
+        JOB_QUEUE_WAIT_SECONDS.labels(job["source"].value).observe(job["queue_wait_seconds"])
+        return self.RUNNERS[job["kind"]](**job["params"], progress=progress)
+
+    async def _execute(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        progress = job["progress"]
+        try:
+            result = await run_migration(self._run_job, job)
+            job["result"] = result
+            if progress.cancelled:
+                job["status"] = JobStatus.CANCELLED
+            elif result.get("success", True):
+                job["status"] = JobStatus.COMPLETED
+            else:
+                job["status"] = JobStatus.FAILED
+                job["error"] = result.get("error")
+        except JobCancelledError:
+            job["status"] = JobStatus.CANCELLED
+        except Exception as e:
+            logger.error(f"Erro na execução do job {job['id']}: {e}")
+            job["status"] = JobStatus.FAILED
+            job["error"] = str(e)
+        finally:
+            job["finished_at"] = datetime.now()
+            self._tasks.pop(job["id"], None)
+            self._trim_history()
+
+        logger.info(f"Job {job['id']} ({job['kind'].value}, {job['source'].value}) finalizado com status {job['status'].value}")
+        return job
+
+    def _trim_history(self):
+        """Descarta os jobs finalizados mais antigos além de JOB_HISTORY_SIZE"""
+        with self._lock:
+            finished = [job_id for job_id, job in self.jobs.items() if job["status"] in self.FINISHED]
+            for job_id in finished[:max(len(finished) - settings.job_history_size, 0)]:
+                del self.jobs[job_id]
+
+    def _to_response(self, job: Dict[str, Any]) -> JobResponse:
+        fields = {name: value for name, value in job.items() if name != "progress"}
+        return JobResponse(**fields, progress=JobProgress(**job["progress"].snapshot()))
+
+    async def submit(self, kind: JobKind, params: Dict[str, Any], source: JobSource = JobSource.API,
+                     cron_job_id: Optional[str] = None) -> JobResponse:
+        """Enfileira o job no pool de migrações e retorna imediatamente"""
+        job = self._create_job(kind, params, source, cron_job_id)
+        self._tasks[job["id"]] = asyncio.create_task(self._execute(job))
+        logger.info(f"Job {job['id']} ({kind.value}) enfileirado")
+        return self._to_response(job)
+
+    async def run(self, kind: JobKind, params: Dict[str, Any], source: JobSource = JobSource.API,
+                  cron_job_id: Optional[str] = None) -> JobResponse:
+        """Executa o job e aguarda o fim; o job fica visível em /jobs durante a execução"""
+        job = self._create_job(kind, params, source, cron_job_id)
+        return self._to_response(await self._execute(job))
+
+    def create(self, kind: JobKind, params: Dict[str, Any], source: JobSource = JobSource.API,
+               cron_job_id: Optional[str] = None) -> JobResponse:
+        """Registra o job na fila sem executá-lo (execuções dos cron jobs aguardando o executor de sincronizações)"""
+        return self._to_response(self._create_job(kind, params, source, cron_job_id))
+
+    async def execute(self, job_id: str, **params: Any) -> JobResponse:
+        """Executa um job criado com create() e aguarda o fim; params substituem os parâmetros do job"""
+        job = self.jobs[job_id]
+        job["params"].update(params)
+        return self._to_response(await self._execute(job))
+
+    def record_coalesced(self, job_id: str):
+        """Conta um disparo do cron incorporado a este job, que ainda aguarda na fila"""
+        job = self.jobs.get(job_id)
+        if job:
+            job["coalesced_runs"] += 1
+
+    def get_job(self, job_id: str) -> Optional[JobResponse]:
+        job = self.jobs.get(job_id)
+        return self._to_response(job) if job else None
+
+    def list_jobs(self, status: Optional[JobStatus] = None) -> List[JobResponse]:
+        """Lista os jobs do mais recente para o mais antigo"""
+        with self._lock:
+            jobs = list(self.jobs.values())
+        return [self._to_response(job) for job in reversed(jobs) if status is None or job["status"] == status]
+
+    def cancel_job(self, job_id: str) -> Optional[JobResponse]:
+        """
+        Solicita o cancelamento do job: cópias em andamento param no próximo lote e tabelas pendentes não são iniciadas
+        Tabelas já concluídas permanecem no destino
+        """
+        job = self.jobs.get(job_id)
+        if not job:
+            return None
+        if job["status"] in self.FINISHED:
+            raise ValueError(f"Job {job_id} já finalizado com status {job['status'].value}")
+        job["progress"].cancel()
+        logger.info(f"Cancelamento do job {job_id} solicitado")
+        return self._to_response(job)
+
+
+# Instância global do serviço
+job_service = JobService()
@@ -0,0 +1,205 @@
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+from ..core.config import settings
+from ..core.database import db_manager
+from ..core.sync_state import sync_state
+from ..core.cdc import ChangeApplier, committed_batches, dump_records, event_to_record
+from ..models.replication import ReplicationStatus
+
+logger = logging.getLogger(__name__)
+
+
+class ReplicationService:
+    """Replicação contínua: lê o binlog (formato ROW) do MySQL de origem e aplica as alterações no destino"""
+
+    CHECKPOINT_NAME = "binlog"
+    # Janela usada no cálculo de eventos por segundo
+    RATE_WINDOW_SECONDS = 60
+
+    def __init__(self):
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._key_columns: Dict[str, List[str]] = {}
+        self._tables_in_destination: Dict[str, bool] = {}
+        self._applied_window: deque = deque()
+        self._metrics: Dict[str, Any] = self._empty_metrics()
+
+    @staticmethod
+    def _empty_metrics() -> Dict[str, Any]:
+        return {
+            "started_at": None,
+            "events_applied": 0,
+            "transactions_applied": 0,
+            "batches_applied": 0,
+            "last_event_at": None,
+            "apply_lag_seconds": None,
+            "last_error": None
+        }
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> ReplicationStatus:
+        """Inicia a replicação em uma thread de longa duração (a leitura do binlog é bloqueante)"""
+        if settings.database_type.lower() != "mysql":
+            raise ValueError("Replicação por binlog disponível apenas para bancos MySQL")
+        with self._lock:
+            if not self.is_running():
+                self._stop.clear()
+                self._metrics = self._empty_metrics()
+                self._metrics["started_at"] = datetime.now()
+                self._applied_window.clear()
+                self._thread = threading.Thread(target=self._run, name="binlog-replication", daemon=True)
+                self._thread.start()
+                logger.info("Replicação por binlog iniciada")
+        return self.status()
+
+    def stop(self) -> ReplicationStatus:
+        """Para a replicação após aplicar o lote em andamento"""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout=settings.cdc_poll_seconds * 5 + 30)
+            logger.info("Replicação por binlog parada")
+        return self.status()
+
+    def status(self) -> ReplicationStatus:
+        """Retorna estado, checkpoint e métricas (atraso de aplicação e eventos por segundo)"""
+        with self._lock:
+            metrics = dict(self._metrics)
+            now = time.monotonic()
+            while self._applied_window and now - self._applied_window[0][0] > self.RATE_WINDOW_SECONDS:
+                self._applied_window.popleft()
+            window_events = sum(count for _, count in self._applied_window)
+
+        checkpoint = sync_state.get_checkpoint(self.CHECKPOINT_NAME)
+        return ReplicationStatus(
+            running=self.is_running(),
+            log_file=checkpoint.get("log_file"),
+            log_pos=checkpoint.get("log_pos"),
+            events_per_second=round(window_events / self.RATE_WINDOW_SECONDS, 2),
+            **metrics
+        )
+
+    def _key_columns_for(self, table_name: str) -> List[str]:
+        if table_name not in self._key_columns:
+            self._key_columns[table_name] = db_manager.source_adapter.get_primary_key_columns(table_name)
+        return self._key_columns[table_name]
+
+    def _exists_in_destination(self, table_name: str) -> bool:
+        if table_name not in self._tables_in_destination:
+            exists = db_manager.destination_adapter.table_exists(table_name)
+            if not exists:
+                logger.warning(f"Tabela '{table_name}' não existe no destino; alterações do binlog ignoradas")
+            self._tables_in_destination[table_name] = exists
+        return self._tables_in_destination[table_name]
+
+    def _run(self):
+        """Laço principal: lê o binlog a partir do checkpoint; em caso de erro, tenta novamente do último checkpoint"""
+        applier = ChangeApplier(db_manager.destination_adapter, self._key_columns_for, self._exists_in_destination)
+        while not self._stop.is_set():
+            try:
+                caught_up = self._poll(applier)
+                if caught_up:
+                    with self._lock:
+                        self._metrics["apply_lag_seconds"] = 0.0
+                    self._stop.wait(settings.cdc_poll_seconds)
+            except Exception as e:
+                logger.error(f"Erro na replicação por binlog: {e}")
+                with self._lock:
+                    self._metrics["last_error"] = str(e)
+                # Estrutura pode ter mudado: recarrega chaves e tabelas na próxima tentativa
+                self._key_columns.clear()
+                self._tables_in_destination.clear()
+                self._stop.wait(max(settings.cdc_poll_seconds, 5))
+
+    def _open_stream(self):
+        # Dependência opcional: só é necessária quando a replicação é usada
+        from pymysqlreplication import BinLogStreamReader
+        from pymysqlreplication.event import QueryEvent, XidEvent
+        from pymysqlreplication.row_event import DeleteRowsEvent, UpdateRowsEvent, WriteRowsEvent
+
+        checkpoint = self._ensure_checkpoint()
+        return BinLogStreamReader(
+            connection_settings={
+                "host": settings.source_host,
+                "port": settings.source_port,
+                "user": settings.source_user,
+                "passwd": settings.source_password
+            },
+            server_id=settings.cdc_server_id,
+            only_events=[WriteRowsEvent, UpdateRowsEvent, DeleteRowsEvent, XidEvent, QueryEvent],
+            only_schemas=[settings.source_db],
+            log_file=checkpoint["log_file"],
+            log_pos=checkpoint["log_pos"],
+            resume_stream=True,
+            blocking=False
+        )
+
+    def _ensure_checkpoint(self) -> Dict[str, Any]:
+        """
+        Checkpoint de onde a leitura continua; sem checkpoint, grava a posição atual do binlog antes da primeira leitura
+        Sem isso cada leitura (não bloqueante) começaria no fim do binlog e perderia os commits feitos entre leituras
+        """
+        checkpoint = sync_state.get_checkpoint(self.CHECKPOINT_NAME)
+        if checkpoint.get("log_file") and checkpoint.get("log_pos") is not None:
+            return checkpoint
+        log_file, log_pos = db_manager.source_adapter.get_binlog_position()
+        logger.info(f"Replicação sem checkpoint: iniciando na posição atual do binlog ({log_file}:{log_pos})")
+        return sync_state.set_checkpoint(self.CHECKPOINT_NAME, log_file=log_file, log_pos=log_pos)
+
+    def _poll(self, applier: ChangeApplier) -> bool:
+        """
+        Lê os eventos disponíveis e aplica em lotes de transações completas
+        O checkpoint só avança no fim de uma transação aplicada; retorna True se não havia eventos
+        """
+        stream = self._open_stream()
+        received = 0
+
+        def records():
+            nonlocal received
+            for event in stream:
+                record = event_to_record(event, stream.log_file)
+                if record is not None:
+                    received += 1
+                    yield record
+
+        try:
+            for batch, transactions, position in committed_batches(records(), settings.cdc_batch_size):
+                self._apply_batch(applier, batch, transactions, position)
+                if self._stop.is_set():
+                    break
+        finally:
+            stream.close()
+        return received == 0
+
+    def _apply_batch(self, applier: ChangeApplier, records: List[Dict[str, Any]], transactions: int, position):
+        """Aplica um lote de transações e só então persiste o checkpoint"""
+        if settings.cdc_record_path and records:
+            dump_records(records, settings.cdc_record_path)
+
+        stats = applier.apply(records) if records else {"events": 0}
+        log_file, log_pos = position
+        sync_state.set_checkpoint(self.CHECKPOINT_NAME, log_file=log_file, log_pos=log_pos)
+
+        last_timestamp = max((r["timestamp"] for r in records if r.get("timestamp")), default=None)
+        with self._lock:
+            self._metrics["events_applied"] += stats["events"]
+            self._metrics["transactions_applied"] += transactions
+            self._metrics["batches_applied"] += 1
+            self._metrics["last_error"] = None
+            if last_timestamp:
+                self._metrics["last_event_at"] = datetime.fromtimestamp(last_timestamp)
+                self._metrics["apply_lag_seconds"] = round(max(0.0, time.time() - last_timestamp), 3)
+            self._applied_window.append((time.monotonic(), stats["events"]))
+
+        logger.info(f"Replicação: {stats['events']} eventos de {transactions} transações aplicados (checkpoint {log_file}:{log_pos})")
+
+
+# Instância global do serviço
+replication_service = ReplicationService()
@@ -0,0 +1 @@
+"""Benchmarks de throughput da migração (python -m benchmarks.run_benchmarks)"""
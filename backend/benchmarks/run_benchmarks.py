@@ -0,0 +1,290 @@
+"""
+Benchmark de throughput da migração com bancos SQLite locais (sem servidores MySQL/PostgreSQL)
+
+Gera tabelas sintéticas (registros, largura, mistura de TEXT/BLOB e grafo de foreign keys configuráveis),
+executa migrate_table (uma tabela por vez) e a migração em lote, e grava os resultados em JSON:
+registros/s, MB/s, pico de memória (RSS), tempo por etapa e, no lote, a latência do event loop e
+do health check do banco durante a migração
+
+Uso, a partir de backend/:
+    python -m benchmarks.run_benchmarks --rows 50000
+    python -m benchmarks.run_benchmarks --presets narrow,fk_chain --paths table --pipelined
+    python -m benchmarks.run_benchmarks --baseline benchmarks/results/anterior.json --threshold 0.15
+
+Cada caso roda em um processo novo: configurações, caches e o pico de RSS não vazam entre casos
+Com --baseline, casos com throughput ou pico de memória piores que o limite são marcados como regressão
+e o comando termina com código 1
+"""
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+from .synthetic import PRESETS, generate_database
+
+PATH_TABLE = "table"
+PATH_BATCH = "batch"
+PATHS = [PATH_TABLE, PATH_BATCH]
+
+# Intervalo das sondas de latência durante a migração em lote
+PROBE_INTERVAL_SECONDS = 0.05
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def _percentile(values: List[float], percentile: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(percentile / 100 * (len(ordered) - 1))))]
+
+
+def _latency_summary(seconds: List[float]) -> Dict[str, Any]:
+    milliseconds = [value * 1000 for value in seconds]
+    return {
+        "samples": len(milliseconds),
+        "p50_ms": round(statistics.median(milliseconds), 2) if milliseconds else None,
+        "p99_ms": round(_percentile(milliseconds, 99), 2) if milliseconds else None,
+        "max_ms": round(max(milliseconds), 2) if milliseconds else None
+    }
+
+
+def _sum_stages(results: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Soma as etapas (stages) de cada tabela migrada"""
+    totals: Dict[str, Dict[str, Any]] = {}
+    for result in results:
+        for name, stage in (result.get("stages") or {}).items():
+            total = totals.setdefault(name, {"seconds": 0.0, "calls": 0})
+            total["seconds"] = round(total["seconds"] + stage["seconds"], 4)
+            total["calls"] += stage["calls"]
+    return dict(sorted(totals.items(), key=lambda item: -item[1]["seconds"]))
+
+
+async def _run_batch_with_probes(db_manager, DatabaseService, options: Dict[str, Any], tables: int):
+    """Executa a migração em lote no pool de migrações enquanto mede a responsividade do event loop e do pool da API"""
+    from app.core.blocking import run_migration, run_blocking
+
+    migration = asyncio.create_task(run_migration(
+        DatabaseService.migrate_batch,
+        overwrite=True,
+        max_tables=tables,
+        load_strategy=options["load_strategy"],
+        workers=options["workers"],
+        bulk_load=options["bulk_load"]
+    ))
+    loop_lag, health = [], []
+    while not migration.done():
+        started = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL_SECONDS)
+        loop_lag.append(max(time.perf_counter() - started - PROBE_INTERVAL_SECONDS, 0.0))
+
+        started = time.perf_counter()
+        await run_blocking(db_manager.test_connections)
+        health.append(time.perf_counter() - started)
+    return await migration, loop_lag, health
+
+
+def run_case(case: Dict[str, Any]) -> Dict[str, Any]:
+    """Executa um caso (configuração + caminho) em um processo próprio"""
+    config, options = case["config"], case["options"]
+    workdir = tempfile.mkdtemp(prefix="dbsync-bench-")
+    source_path = os.path.join(workdir, "source.db")
+    destination_path = os.path.join(workdir, "destination.db")
+    try:
+        rows_per_table = max(1, int(case["rows"] * config["rows"]))
+        generated = generate_database(source_path, config, rows_per_table, seed=case["seed"])
+
+        # Configuração lida na importação de app.core: precisa estar no ambiente antes
+        os.environ.update({
+            "DATABASE_TYPE": "sqlite",
+            "SOURCE_DB": source_path,
+            "DESTINATION_DB": destination_path,
+            "SYNC_STATE_PATH": os.path.join(workdir, "sync_state.json"),
+            "MIGRATION_BATCH_SIZE": str(options["batch_size"]),
+            "MIGRATION_WORKERS": str(options["workers"]),
+            "DEBUG": "false",
+            "TRACING_EXPORTER": "none"
+        })
+        logging.basicConfig(level=logging.WARNING)
+
+        from app.core.database import db_manager
+        from app.services.database_service import DatabaseService
+
+        probes = {}
+        started = time.perf_counter()
+        if case["path"] == PATH_TABLE:
+            order = db_manager.get_dependency_plan('source')["order"]
+            results = [
+                DatabaseService.migrate_table(
+                    table_name,
+                    overwrite=True,
+                    pipelined=options["pipelined"],
+                    load_strategy=options["load_strategy"],
+                    parallel_ranges=options["parallel_ranges"],
+                    bulk_load=options["bulk_load"]
+                )
+                for table_name in order
+            ]
+        else:
+            batch, loop_lag, health = asyncio.run(
+                _run_batch_with_probes(db_manager, DatabaseService, options, config["tables"])
+            )
+            results = batch["results"]
+            probes = {"event_loop_lag": _latency_summary(loop_lag), "database_health": _latency_summary(health)}
+        elapsed = time.perf_counter() - started
+
+        failures = [result for result in results if not result.get("success")]
+        rows = sum(result.get("records_migrated", 0) for result in results)
+        payload_bytes = sum(table["bytes"] for table in generated.values())
+        return {
+            "case": f"{case['preset']}/{case['path']}",
+            "preset": case["preset"],
+            "path": case["path"],
+            "config": config,
+            "options": options,
+            "rows_per_table": rows_per_table,
+            "rows": rows,
+            "payload_mb": round(payload_bytes / 1024 / 1024, 3),
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_second": round(rows / elapsed, 1) if elapsed > 0 else None,
+            "mb_per_second": round(payload_bytes / 1024 / 1024 / elapsed, 3) if elapsed > 0 else None,
+            # ru_maxrss é em KB no Linux e em bytes no macOS
+            "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1),
+            "stages": _sum_stages(results),
+            "probes": probes or None,
+            "failures": [{"table_name": result["table_name"], "error": result.get("error")} for result in failures]
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any], threshold: float) -> List[Dict[str, Any]]:
+    """Compara cada caso com o mesmo caso da execução de referência; retorna as regressões"""
+    previous = {result["case"]: result for result in baseline.get("results", [])}
+    regressions = []
+    for result in results:
+        reference = previous.get(result["case"])
+        if not reference:
+            continue
+        result["baseline"] = {
+            "rows_per_second": reference.get("rows_per_second"),
+            "peak_rss_mb": reference.get("peak_rss_mb")
+        }
+        checks = [
+            ("rows_per_second", result["rows_per_second"], reference.get("rows_per_second"), -1),
+            ("peak_rss_mb", result["peak_rss_mb"], reference.get("peak_rss_mb"), 1)
+        ]
+        for metric, value, reference_value, direction in checks:
+            if not value or not reference_value:
+                continue
+            change = (value - reference_value) / reference_value
+            if change * direction > threshold:
+                regressions.append({
+                    "case": result["case"],
+                    "metric": metric,
+                    "baseline": reference_value,
+                    "current": value,
+                    "change": round(change, 3)
+                })
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de throughput da migração com bancos SQLite locais")
+    parser.add_argument("--presets", default=",".join(PRESETS), help=f"Configurações separadas por vírgula ({', '.join(PRESETS)})")
+    parser.add_argument("--paths", default=",".join(PATHS), help="'table' (migrate_table por tabela) e/ou 'batch' (migração em lote)")
+    parser.add_argument("--rows", type=int, default=20000, help="Registros por tabela (multiplicados pelo fator de cada configuração)")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Registros por lote (MIGRATION_BATCH_SIZE)")
+    parser.add_argument("--workers", type=int, default=4, help="Tabelas em paralelo na migração em lote")
+    parser.add_argument("--load-strategy", default="insert", help="Estratégia de carga no destino")
+    parser.add_argument("--pipelined", action="store_true", help="Lê o próximo lote enquanto o atual é gravado")
+    parser.add_argument("--parallel-ranges", type=int, default=1, help="Faixas da chave primária copiadas em paralelo")
+    parser.add_argument("--bulk-load", action="store_true", help="Aplica o perfil de carga em massa")
+    parser.add_argument("--seed", type=int, default=42, help="Semente dos dados sintéticos")
+    parser.add_argument("--output", help="Arquivo JSON de saída (padrão: benchmarks/results/benchmark-<data>.json)")
+    parser.add_argument("--baseline", help="Resultado anterior para comparação")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Piora relativa tolerada antes de marcar regressão (0.1 = 10%%)")
+    args = parser.parse_args(argv)
+
+    presets = [name.strip() for name in args.presets.split(",") if name.strip()]
+    paths = [name.strip() for name in args.paths.split(",") if name.strip()]
+    unknown = [name for name in presets if name not in PRESETS] + [name for name in paths if name not in PATHS]
+    if unknown:
+        parser.error(f"Configurações ou caminhos desconhecidos: {', '.join(unknown)}")
+    if args.pipelined and args.parallel_ranges > 1:
+        parser.error("--pipelined não se aplica com --parallel-ranges > 1; use apenas uma das opções")
+
+    options = {
+        "batch_size": args.batch_size,
+        "workers": args.workers,
+        "load_strategy": args.load_strategy,
+        "pipelined": args.pipelined,
+        "parallel_ranges": args.parallel_ranges,
+        "bulk_load": args.bulk_load
+    }
+    results = []
+    for preset in presets:
+        for path in paths:
+            case = {"preset": preset, "path": path, "config": PRESETS[preset], "options": options, "rows": args.rows, "seed": args.seed}
+            # Processo novo por caso (spawn): o pico de RSS e as configurações são só deste caso
+            with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+                result = pool.submit(run_case, case).result()
+            results.append(result)
+            print(
+                f"{result['case']:<20} {result['rows']:>9} registros  {result['rows_per_second'] or 0:>10.0f} registros/s  "
+                f"{result['mb_per_second'] or 0:>7.2f} MB/s  pico {result['peak_rss_mb']:>7.1f} MB"
+                + (f"  {len(result['failures'])} falhas" if result["failures"] else "")
+            )
+
+    report = {
+        "created_at": datetime.now().isoformat(),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "rows": args.rows,
+        "options": options,
+        "results": results,
+        "regressions": None
+    }
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            report["regressions"] = compare(results, json.load(baseline_file), args.threshold)
+        for regression in report["regressions"]:
+            print(f"REGRESSÃO {regression['case']} {regression['metric']}: {regression['baseline']} -> {regression['current']} ({regression['change']:+.1%})")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"benchmark-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as output_file:
+        json.dump(report, output_file, indent=2, default=str)
+    print(f"Resultados gravados em {output}")
+
+    failed = any(result["failures"] for result in results)
+    return 1 if report["regressions"] or failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+import random
+import sqlite3
+import string
+from typing import Dict, List, Any
+
+# Configurações de referência: rows é multiplicado pela escala da execução (--rows)
+PRESETS: Dict[str, Dict[str, Any]] = {
+    "narrow": {
+        "tables": 1, "rows": 1.0, "int_columns": 4, "text_columns": 1, "text_width": 16,
+        "blob_columns": 0, "blob_width": 0, "fk_graph": "none"
+    },
+    "wide_text": {
+        "tables": 1, "rows": 0.5, "int_columns": 2, "text_columns": 12, "text_width": 64,
+        "blob_columns": 0, "blob_width": 0, "fk_graph": "none"
+    },
+    "blob_mix": {
+        "tables": 1, "rows": 0.2, "int_columns": 2, "text_columns": 2, "text_width": 64,
+        "blob_columns": 2, "blob_width": 2048, "fk_graph": "none"
+    },
+    "fk_chain": {
+        "tables": 8, "rows": 1.0, "int_columns": 3, "text_columns": 2, "text_width": 32,
+        "blob_columns": 0, "blob_width": 0, "fk_graph": "chain"
+    },
+    "fk_star": {
+        "tables": 8, "rows": 1.0, "int_columns": 3, "text_columns": 2, "text_width": 32,
+        "blob_columns": 0, "blob_width": 0, "fk_graph": "star"
+    }
+}
+
+FK_GRAPHS = ["none", "chain", "star"]
+
+INSERT_CHUNK_ROWS = 5000
+
+
+def table_names(config: Dict[str, Any]) -> List[str]:
+    return [f"bench_{i:02d}" for i in range(config["tables"])]
+
+
+def parent_of(config: Dict[str, Any], index: int):
+    """Tabela pai da tabela index: cadeia (cada uma aponta para a anterior) ou estrela (todas apontam para a primeira)"""
+    if index == 0 or config["fk_graph"] == "none":
+        return None
+    return index - 1 if config["fk_graph"] == "chain" else 0
+
+
+def create_table_sql(config: Dict[str, Any], index: int) -> str:
+    columns = ["id INTEGER PRIMARY KEY"]
+    parent = parent_of(config, index)
+    if parent is not None:
+        columns.append(f"parent_id INTEGER REFERENCES bench_{parent:02d}(id)")
+    columns += [f"i{c} INTEGER" for c in range(config["int_columns"])]
+    columns += [f"t{c} TEXT" for c in range(config["text_columns"])]
+    columns += [f"b{c} BLOB" for c in range(config["blob_columns"])]
+    return f"CREATE TABLE bench_{index:02d} (\n    " + ",\n    ".join(columns) + "\n)"
+
+
+def generate_database(path: str, config: Dict[str, Any], rows_per_table: int, seed: int = 42) -> Dict[str, Any]:
+    """
+    Cria o banco de origem com dados sintéticos determinísticos (mesma semente, mesmos dados)
+    Retorna registros e bytes de carga útil (8 por inteiro, tamanho de textos e BLOBs) por tabela
+    """
+    if config["fk_graph"] not in FK_GRAPHS:
+        raise ValueError(f"Grafo de foreign keys '{config['fk_graph']}' inválido. Grafos suportados: {', '.join(FK_GRAPHS)}")
+
+    rng = random.Random(seed)
+    alphabet = string.ascii_letters + string.digits
+    # Blocos reaproveitados: gerar caractere a caractere dominaria o tempo da geração
+    text_pool = ["".join(rng.choice(alphabet) for _ in range(config["text_width"])) for _ in range(256)]
+    blob_pool = [rng.randbytes(config["blob_width"]) for _ in range(16)] if config["blob_columns"] else []
+
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=OFF")
+    tables = {}
+    try:
+        for index, name in enumerate(table_names(config)):
+            conn.execute(create_table_sql(config, index))
+            parent = parent_of(config, index)
+            if parent is not None:
+                # Índice secundário na coluna da foreign key, como em esquemas reais
+                conn.execute(f"CREATE INDEX idx_{name}_parent_id ON {name} (parent_id)")
+            int_count = 1 + (parent is not None) + config["int_columns"]
+            column_count = int_count + config["text_columns"] + config["blob_columns"]
+            insert = f"INSERT INTO {name} VALUES ({', '.join('?' * column_count)})"
+            row_bytes = 8 * int_count + config["text_width"] * config["text_columns"] + config["blob_width"] * config["blob_columns"]
+
+            payload_bytes = 0
+            for start in range(0, rows_per_table, INSERT_CHUNK_ROWS):
+                chunk = []
+                for row_id in range(start + 1, min(start + INSERT_CHUNK_ROWS, rows_per_table) + 1):
+                    row = [row_id]
+                    if parent is not None:
+                        row.append(rng.randint(1, rows_per_table))
+                    row += [rng.randint(0, 2 ** 40) for _ in range(config["int_columns"])]
+                    row += [rng.choice(text_pool) for _ in range(config["text_columns"])]
+                    row += [rng.choice(blob_pool) for _ in range(config["blob_columns"])]
+                    chunk.append(row)
+                conn.executemany(insert, chunk)
+                payload_bytes += len(chunk) * row_bytes
+            conn.commit()
+            tables[name] = {"rows": rows_per_table, "bytes": payload_bytes}
+    finally:
+        conn.close()
+    return tables
@@ -1,6 +1,13 @@
+import time
+
+# Início do processo, referência do time-to-ready (antes dos imports da aplicação)
+PROCESS_STARTED = time.perf_counter()
+
+import asyncio
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
 import logging
 import uvicorn
 from dotenv import load_dotenv
@@ -9,7 +16,14 @@ import os
 from app.core.config import settings
 from app.routes.database_routes import router as database_router
 from app.routes.cron_routes import router as cron_router
+from app.routes.replication_routes import router as replication_router
+from app.routes.job_routes import router as job_router
 from app.services.cron_service import cron_service
+from app.services.replication_service import replication_service
+from app.core.blocking import blocking_executor, run_blocking
+from app.core.database import db_manager
+from app.core.metrics import record_startup_phase
+from app.core.tracing import shutdown_tracing
 
 # Carrega variáveis de ambiente
 load_dotenv()
@@ -21,6 +35,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+record_startup_phase("imports", time.perf_counter() - PROCESS_STARTED)
+
 # Criação da aplicação FastAPI
 app = FastAPI(
     title=settings.app_name,
@@ -42,6 +58,8 @@ app.add_middleware(
 # Inclusão das rotas
 app.include_router(database_router)
 app.include_router(cron_router)
+app.include_router(replication_router)
+app.include_router(job_router)
 
 
 @app.get("/")
@@ -61,6 +79,26 @@ async def health():
     return {"status": "healthy", "version": settings.app_version}
 
 
+@app.get("/ready")
+async def ready():
+    """Prontidão: engines criadas e primeira conexão com os dois bancos, com os tempos da inicialização"""
+    status = db_manager.startup_status()
+    if not status["ready"]:
+        warm_up = getattr(app.state, "warm_up", None)
+        if warm_up is None or warm_up.done():
+            # Banco fora do ar na inicialização: nova tentativa em segundo plano, uma por vez;
+            # verificações concorrentes não empilham novas tentativas
+            app.state.warm_up = asyncio.create_task(warm_up_databases())
+        return JSONResponse(status_code=503, content=status)
+    return status
+
+
+@app.get("/metrics")
+async def metrics():
+    """Métricas no formato Prometheus: throughput da cópia, latência de lotes, migrações, cron jobs e pools"""
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """Handler global para exceções não tratadas"""
@@ -71,11 +109,35 @@ async def global_exception_handler(request, exc):
     )
 
 
+@app.on_event("startup")
+async def startup_event():
+    """Evento executado quando a aplicação é iniciada"""
+    if settings.cdc_enabled:
+        replication_service.start()
+    # Bancos preparados em segundo plano: a API responde mesmo com um banco lento ou fora do ar
+    app.state.warm_up = asyncio.create_task(warm_up_databases())
+
+
+async def warm_up_databases():
+    """Cria engines e abre as primeiras conexões dos dois bancos em paralelo e registra o time-to-ready"""
+    status = await run_blocking(db_manager.warm_up, PROCESS_STARTED)
+    if status["ready"]:
+        logger.info(
+            f"Aplicação pronta em {status['time_to_ready_seconds']:.2f}s "
+            f"(bancos preparados em {status['warm_up_seconds']:.2f}s)"
+        )
+    else:
+        logger.warning(f"Bancos indisponíveis na inicialização; conexões serão refeitas sob demanda: {status['databases']}")
+
+
 @app.on_event("shutdown")
 async def shutdown_event():
     """Evento executado quando a aplicação é encerrada"""
     logger.info("Encerrando aplicação...")
     cron_service.shutdown()
+    replication_service.stop()
+    blocking_executor.shutdown()
+    shutdown_tracing()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,30 @@
+import os
+import tempfile
+
+import pytest
+from sqlalchemy import create_engine
+
+# Configuração lida na importação de app.core: precisa estar no ambiente antes dos testes importarem a aplicação
+_WORKDIR = tempfile.mkdtemp(prefix="dbsync-tests-")
+os.environ.update({
+    "DATABASE_TYPE": "sqlite",
+    "SOURCE_DB": os.path.join(_WORKDIR, "source.db"),
+    "DESTINATION_DB": os.path.join(_WORKDIR, "destination.db"),
+    "SYNC_STATE_PATH": os.path.join(_WORKDIR, "sync_state.json"),
+    "CONNECTION_CACHE_PATH": os.path.join(_WORKDIR, "connection_cache.json"),
+    "DEBUG": "false",
+    "TRACING_EXPORTER": "none"
+})
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+@pytest.fixture
+def sqlite_adapter(tmp_path):
+    """Adaptador SQLite em arquivo temporário, isolado dos bancos configurados"""
+    from app.core.adapters.sqlite_adapter import SQLiteAdapter
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    adapter = SQLiteAdapter(engine, str(tmp_path / "test.db"))
+    yield adapter
+    engine.dispose()
@@ -0,0 +1,211 @@
+"""Replay offline de eventos do binlog gravados (tests/fixtures/binlog_events.jsonl, formato de dump_records)"""
+import os
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import text
+
+from app.core.cdc import ChangeApplier, EVENT_COMMIT, committed_batches, event_to_record, load_records
+from app.core.sync_state import SyncStateStore
+from app.services import replication_service as replication_module
+from app.services.replication_service import ReplicationService
+from tests.conftest import FIXTURES_DIR
+
+FIXTURE = os.path.join(FIXTURES_DIR, "binlog_events.jsonl")
+KEY_COLUMNS = {"customers": ["id"], "orders": ["id"], "audit_log": ["id"]}
+# Posição do último commit da gravação; o evento seguinte pertence a uma transação sem commit
+LAST_COMMIT = ("mysql-bin.000003", 2864)
+
+_EVENT_CLASSES = {
+    "write": "WriteRowsEvent",
+    "update": "UpdateRowsEvent",
+    "delete": "DeleteRowsEvent",
+    EVENT_COMMIT: "XidEvent"
+}
+
+
+def to_event(record):
+    """Reconstrói um evento com a interface do BinLogStreamReader a partir de um registro gravado"""
+    event = type(_EVENT_CLASSES[record["event"]], (), {})()
+    event.packet = SimpleNamespace(log_pos=record["log_pos"])
+    event.timestamp = record["timestamp"]
+    if record["event"] != EVENT_COMMIT:
+        event.schema, event.table, event.rows = record["schema"], record["table"], record["rows"]
+    return event
+
+
+class FakeStream:
+    """Stream de eventos gravados, no lugar do BinLogStreamReader"""
+
+    def __init__(self, records):
+        self.log_file = records[0]["log_file"]
+        self.events = [to_event(record) for record in records]
+        self.closed = False
+
+    def __iter__(self):
+        return iter(self.events)
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def records():
+    return load_records(FIXTURE)
+
+
+@pytest.fixture
+def destination(sqlite_adapter):
+    with sqlite_adapter.engine.begin() as conn:
+        conn.execute(text("CREATE TABLE customers (id INTEGER PRIMARY KEY, name TEXT, email TEXT)"))
+        conn.execute(text("CREATE TABLE orders (id INTEGER PRIMARY KEY, customer_id INTEGER, total TEXT, created_at TEXT)"))
+    return sqlite_adapter
+
+
+def make_applier(destination):
+    # audit_log não existe no destino: seus eventos são ignorados pelo filtro
+    return ChangeApplier(destination, KEY_COLUMNS.__getitem__, lambda table: table in ("customers", "orders"))
+
+
+def rows(adapter, table):
+    with adapter.engine.connect() as conn:
+        return [tuple(row) for row in conn.execute(text(f"SELECT * FROM {table} ORDER BY id"))]
+
+
+def test_load_records_restores_value_types(records):
+    order = records[1]["rows"][0]["values"]
+    assert order["total"] == Decimal("19.90")
+    assert order["created_at"].year == 2025
+
+
+def test_event_to_record_round_trip(records):
+    for record in records:
+        decoded = event_to_record(to_event(record), record["log_file"])
+        assert decoded == record
+
+
+def test_event_to_record_ignores_non_commit_queries():
+    begin = type("QueryEvent", (), {"query": "BEGIN", "packet": SimpleNamespace(log_pos=4), "timestamp": 0})()
+    commit = type("QueryEvent", (), {"query": "COMMIT", "packet": SimpleNamespace(log_pos=8), "timestamp": 0})()
+    assert event_to_record(begin, "mysql-bin.000001") is None
+    assert event_to_record(commit, "mysql-bin.000001")["event"] == EVENT_COMMIT
+
+
+def test_committed_batches_stop_at_last_commit(records):
+    batches = list(committed_batches(records, batch_size=1000))
+    assert len(batches) == 1
+    batch, transactions, position = batches[0]
+    assert transactions == 4
+    assert position == LAST_COMMIT
+    assert all(record["log_pos"] < LAST_COMMIT[1] for record in batch)
+
+
+def test_committed_batches_split_only_at_commits(records):
+    commits = [(r["log_file"], r["log_pos"]) for r in records if r["event"] == EVENT_COMMIT]
+    batches = list(committed_batches(records, batch_size=1))
+    assert [position for _, _, position in batches] == commits
+    assert [transactions for _, transactions, _ in batches] == [1, 1, 1, 1]
+
+
+def test_replay_applies_changes_in_order(records, destination):
+    batch, _, _ = next(committed_batches(records, batch_size=1000))
+    stats = make_applier(destination).apply(batch)
+
+    # Atualização do e-mail aplicada, troca de chave 2 -> 3 e inserção de 4; a transação sem commit (id 5) não entra
+    assert rows(destination, "customers") == [
+        (1, "Ana", "ana.souza@example.com"),
+        (3, "Bruno", "bruno@example.com"),
+        (4, "Carla", None)
+    ]
+    # Pedido inserido, atualizado e removido
+    assert rows(destination, "orders") == []
+    assert stats["rows_deleted"] == 2
+
+
+def test_replay_per_transaction_matches_single_batch(records, destination):
+    applier = make_applier(destination)
+    for batch, _, _ in committed_batches(records, batch_size=1):
+        applier.apply(batch)
+    assert [row[0] for row in rows(destination, "customers")] == [1, 3, 4]
+    assert rows(destination, "orders") == []
+
+
+def test_replay_is_idempotent(records, destination):
+    batch, _, _ = next(committed_batches(records, batch_size=1000))
+    applier = make_applier(destination)
+    applier.apply(batch)
+    first = rows(destination, "customers")
+    applier.apply(batch)
+    assert rows(destination, "customers") == first
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setattr(replication_module, "sync_state", SyncStateStore(str(tmp_path / "state.json")))
+    return ReplicationService()
+
+
+def test_poll_advances_checkpoint_only_at_commit(records, destination, service, monkeypatch):
+    stream = FakeStream(records)
+    monkeypatch.setattr(service, "_open_stream", lambda: stream)
+
+    caught_up = service._poll(make_applier(destination))
+
+    checkpoint = replication_module.sync_state.get_checkpoint(ReplicationService.CHECKPOINT_NAME)
+    assert (checkpoint["log_file"], checkpoint["log_pos"]) == LAST_COMMIT
+    assert caught_up is False
+    assert stream.closed
+    assert service.status().transactions_applied == 4
+
+
+def test_poll_keeps_checkpoint_of_last_applied_batch_on_failure(records, destination, service, monkeypatch):
+    monkeypatch.setattr(service, "_open_stream", lambda: FakeStream(records))
+    monkeypatch.setattr(replication_module.settings, "cdc_batch_size", 1)
+    applier = make_applier(destination)
+    apply = applier.apply
+    calls = []
+
+    def failing_apply(batch):
+        calls.append(batch)
+        if len(calls) == 3:
+            raise RuntimeError("destino indisponível")
+        return apply(batch)
+
+    applier.apply = failing_apply
+    with pytest.raises(RuntimeError):
+        service._poll(applier)
+
+    # Só os dois primeiros lotes foram aplicados: a leitura seguinte recomeça no commit da segunda transação
+    checkpoint = replication_module.sync_state.get_checkpoint(ReplicationService.CHECKPOINT_NAME)
+    assert checkpoint["log_pos"] == 1952
+
+
+def test_first_open_persists_current_binlog_position(service, monkeypatch):
+    positions = [("mysql-bin.000007", 4242)]
+    adapter = SimpleNamespace(get_binlog_position=lambda: positions.pop())
+    monkeypatch.setattr(replication_module, "db_manager", SimpleNamespace(source_adapter=adapter))
+
+    checkpoint = service._ensure_checkpoint()
+    assert (checkpoint["log_file"], checkpoint["log_pos"]) == ("mysql-bin.000007", 4242)
+    # Leituras seguintes continuam do checkpoint gravado, sem voltar ao fim do binlog
+    assert service._ensure_checkpoint()["log_pos"] == 4242
+    assert positions == []
+
+
+def test_failed_batch_leaves_destination_unchanged(records, destination, monkeypatch):
+    batch, _, _ = next(committed_batches(records, batch_size=1000))
+    applier = make_applier(destination)
+    upsert_data = destination.upsert_data
+
+    # Primeiros grupos gravados na transação do lote; a falha em orders desfaz também os de customers
+    def failing_upsert(table_name, data, key_columns, conn=None):
+        if table_name == "orders":
+            raise RuntimeError("destino indisponível")
+        return upsert_data(table_name, data, key_columns, conn=conn)
+
+    monkeypatch.setattr(destination, "upsert_data", failing_upsert)
+    with pytest.raises(RuntimeError):
+        applier.apply(batch)
+    assert rows(destination, "customers") == []
+    assert rows(destination, "orders") == []
@@ -0,0 +1,39 @@
+"""Execução das tabelas do lote pela ordem de dependências de foreign keys"""
+from app.core.dag_executor import DependencyDagExecutor
+
+# customers <- orders <- order_items; products é independente
+DEPENDENCIES = {"orders": ["customers"], "order_items": ["orders", "products"]}
+TABLES = ["customers", "products", "orders", "order_items"]
+
+
+def run(failing=()):
+    executed = []
+
+    def task(table):
+        executed.append(table)
+        if table in failing:
+            raise RuntimeError(f"falha ao copiar {table}")
+        return {"success": True, "table_name": table}
+
+    result = DependencyDagExecutor(TABLES, DEPENDENCIES, max_workers=2).run(task)
+    return executed, {r["table_name"]: r for r in result["results"]}, result
+
+
+def test_children_start_after_parents():
+    executed, results, run_result = run()
+    assert executed.index("orders") > executed.index("customers")
+    assert executed.index("order_items") > max(executed.index("orders"), executed.index("products"))
+    assert all(r["success"] for r in results.values())
+    assert run_result["skipped_count"] == 0
+
+
+def test_descendants_of_failed_parent_are_skipped():
+    executed, results, run_result = run(failing={"customers"})
+
+    assert "orders" not in executed and "order_items" not in executed
+    assert results["products"]["success"] is True
+    assert results["orders"]["skipped"] is True and results["orders"]["success"] is False
+    assert "customers" in results["orders"]["error"]
+    # Neta: indica a tabela pai ignorada e a falha de origem
+    assert "orders" in results["order_items"]["error"] and "customers" in results["order_items"]["error"]
+    assert run_result["skipped_count"] == 2
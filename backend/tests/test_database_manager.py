@@ -0,0 +1,113 @@
+"""Criação preguiçosa das engines: charset de fallback provisório e invalidação do charset em cache"""
+import pymysql
+import pytest
+
+from app.core import database as database_module
+from app.core.adapters.mysql_adapter import MySQLAdapter
+from app.core.connection_cache import ConnectionCache
+from app.core.database import DatabaseManager
+
+
+@pytest.fixture
+def mysql_manager(tmp_path, monkeypatch):
+    """DatabaseManager configurado para MySQL, sem servidor: só a criação das engines é exercitada"""
+    monkeypatch.setattr(database_module.settings, "database_type", "mysql")
+    cache = ConnectionCache(str(tmp_path / "connection_cache.json"))
+    monkeypatch.setattr(database_module, "connection_cache", cache)
+    return DatabaseManager(), cache
+
+
+def connect_fails_with(monkeypatch, code, message):
+    """Conexões do driver falham com o erro informado (sem servidor MySQL)"""
+    def connect(*args, **kwargs):
+        raise pymysql.err.OperationalError(code, message)
+    monkeypatch.setattr(pymysql, "connect", connect)
+
+
+def test_fallback_charset_engine_is_provisional(mysql_manager, monkeypatch):
+    manager, cache = mysql_manager
+    negotiated = []
+    monkeypatch.setattr(MySQLAdapter, "negotiate_charset", lambda self, **params: negotiated.append(1))
+
+    first = manager.source_engine
+    assert first.url.query["charset"] == "utf8"
+    # Reutilizada dentro da janela de nova tentativa, sem negociar de novo
+    assert manager.source_engine is first
+    assert len(negotiated) == 1
+
+    # Passada a janela, a engine é recriada e o charset negociado de novo (agora com o banco de volta)
+    monkeypatch.setattr(DatabaseManager, "FALLBACK_RETRY_SECONDS", 0.0)
+    monkeypatch.setattr(MySQLAdapter, "negotiate_charset", lambda self, **params: "utf8mb4")
+    second = manager.source_engine
+    assert second is not first
+    assert second.url.query["charset"] == "utf8mb4"
+    assert manager.source_engine is second
+    assert cache.get_charset(manager._charset_cache_key(manager._connection_params("source"))) == "utf8mb4"
+
+
+def test_rejected_cached_charset_is_invalidated(mysql_manager, monkeypatch):
+    manager, cache = mysql_manager
+    key = manager._charset_cache_key(manager._connection_params("source"))
+    cache.set_charset(key, "utf8mb4")
+    monkeypatch.setattr(MySQLAdapter, "negotiate_charset", lambda self, **params: "latin1")
+
+    engine = manager.source_engine
+    assert engine.url.query["charset"] == "utf8mb4"
+
+    connect_fails_with(monkeypatch, 1115, "Unknown character set: 'utf8mb4'")
+    with pytest.raises(Exception):
+        engine.connect()
+
+    assert cache.get_charset(key) is None
+    recreated = manager.source_engine
+    assert recreated is not engine
+    assert recreated.url.query["charset"] == "latin1"
+
+
+def test_other_errors_keep_cached_charset(mysql_manager, monkeypatch):
+    manager, cache = mysql_manager
+    key = manager._charset_cache_key(manager._connection_params("source"))
+    cache.set_charset(key, "utf8mb4")
+
+    engine = manager.source_engine
+    connect_fails_with(monkeypatch, 2003, "Can't connect to MySQL server")
+    with pytest.raises(Exception):
+        engine.connect()
+
+    assert cache.get_charset(key) == "utf8mb4"
+    assert manager.source_engine is engine
+
+
+@pytest.fixture
+def sqlite_manager(tmp_path, monkeypatch):
+    """DatabaseManager com origem e destino SQLite em arquivos temporários"""
+    monkeypatch.setattr(database_module.settings, "source_db", str(tmp_path / "source.db"))
+    monkeypatch.setattr(database_module.settings, "destination_db", str(tmp_path / "destination.db"))
+    manager = DatabaseManager()
+    yield manager
+    for engine in (manager.source_engine, manager.destination_engine):
+        engine.dispose()
+
+
+def test_shadow_swap_reports_foreign_key_failure(sqlite_manager, monkeypatch):
+    manager = sqlite_manager
+    for adapter, rows in ((manager.source_adapter, 3), (manager.destination_adapter, 1)):
+        adapter.create_table("items", "CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+        assert adapter.insert_data("items", [{"id": i, "name": f"item {i}"} for i in range(rows)])
+
+    # Foreign key recriada após a troca falha: os dados novos já estão no lugar
+    destination = type(manager.destination_adapter)
+    monkeypatch.setattr(destination, "split_foreign_keys", lambda self, sql: (sql, ["FOREIGN KEY (id) REFERENCES other (id)"]))
+
+    def add_table_definitions(self, table_name, clauses):
+        raise RuntimeError("referenced table 'other' does not exist")
+    monkeypatch.setattr(destination, "add_table_definitions", add_table_definitions)
+
+    result = manager.migrate_table("items", mode=DatabaseManager.SYNC_MODE_SHADOW)
+    assert result["success"] is True
+    assert result["records_migrated"] == 3
+    assert "other" in result["foreign_keys_error"]
+    assert result["shadow"]["foreign_keys_added"] == 0
+    assert result["shadow"]["old_table_dropped"] is True
+    assert len(manager.destination_adapter.get_table_data("items")) == 3
+    assert not manager.destination_adapter.table_exists(f"items{DatabaseManager.OLD_SUFFIX}")
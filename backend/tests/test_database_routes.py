@@ -0,0 +1,60 @@
+"""Validação dos parâmetros das rotas, sem acessar os bancos"""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+
+
+@pytest.fixture
+def client():
+    from main import app
+
+    # Sem o contexto do TestClient: o startup (warm-up dos bancos) não roda
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("path", [
+    "/api/v1/database/source/tables",
+    "/api/v1/database/destination/tables",
+    "/api/v1/database/compare"
+])
+def test_invalid_count_strategy_is_rejected(client, path):
+    response = client.get(path, params={"count_strategy": "approximate"})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["query", "count_strategy"]
+
+
+def test_pipelined_with_parallel_ranges_is_rejected(client):
+    response = client.post("/api/v1/database/migrate/items", params={"pipelined": True, "parallel_ranges": 4})
+    assert response.status_code == 400
+    assert "parallel_ranges" in response.json()["detail"]
+
+    response = client.post("/api/v1/jobs/migrate", json={"table_name": "items", "pipelined": True, "parallel_ranges": 4})
+    assert response.status_code == 400
+
+
+def test_parallel_ranges_above_pool_limit_is_rejected(client):
+    too_many = settings.max_migration_workers + 1
+    response = client.post("/api/v1/database/migrate/items", params={"parallel_ranges": too_many})
+    assert response.status_code == 422
+
+    response = client.post("/api/v1/jobs/migrate", json={"table_name": "items", "parallel_ranges": too_many})
+    assert response.status_code == 422
+
+
+def test_pool_fits_concurrent_migrations_at_worker_limit():
+    from app.core.database import DatabaseManager
+
+    pool_size, max_overflow = DatabaseManager._pool_limits()
+    assert pool_size + max_overflow >= settings.migration_thread_pool_size * settings.max_migration_workers
+
+
+def test_workers_above_pool_limit_are_rejected(client):
+    too_many = settings.max_migration_workers + 1
+    assert client.post("/api/v1/database/migrate-batch", params={"workers": too_many}).status_code == 422
+    assert client.post("/api/v1/jobs/migrate-batch", json={"workers": too_many}).status_code == 422
+    response = client.post(
+        "/api/v1/cron/jobs",
+        json={"name": "noturno", "cron_expression": "0 2 * * *", "parallel_workers": too_many}
+    )
+    assert response.status_code == 422
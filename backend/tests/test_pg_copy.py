@@ -0,0 +1,112 @@
+"""COPY do PostgreSQL: codificação text e binary conforme o tipo das colunas de destino e fallback para INSERT"""
+import json
+import struct
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import psycopg2
+import pytest
+
+from app.core.adapters.postgresql_adapter import PostgreSQLAdapter
+from app.core.adapters.pg_copy import CopyEncodingError, encode_binary_rows, encode_text_rows, encode_text_value
+
+COLUMN_TYPES = {
+    "id": ("int4", None, 0),
+    "payload": ("jsonb", None, 0),
+    "tags": ("_text", "text", 25),
+    "note": ("text", None, 0),
+}
+
+
+def test_text_list_in_json_column_is_encoded_as_json():
+    encoded = encode_text_rows(["id", "payload"], [{"id": 1, "payload": [1, "a\tb", {"k": None}]}], column_types=COLUMN_TYPES)
+    field = encoded.decode().rstrip("\n").split("\t")[1]
+    assert json.loads(field.replace("\\\\", "\\")) == [1, "a\tb", {"k": None}]
+
+
+def test_text_list_in_array_column_is_encoded_as_array():
+    assert encode_text_value(["a", None, 'x"y'], "_text", "text") == '{"a",NULL,"x\\\\"y"}'
+
+
+def test_text_list_in_scalar_column_is_rejected():
+    with pytest.raises(CopyEncodingError):
+        encode_text_rows(["note"], [{"note": ["a"]}], column_types=COLUMN_TYPES)
+
+
+def test_text_json_string_is_sent_unchanged():
+    assert encode_text_value('{"a": 1}', "json") == '{"a": 1}'
+
+
+def test_binary_list_in_jsonb_column_is_encoded_as_json():
+    encoded = encode_binary_rows(["payload"], COLUMN_TYPES, [{"payload": [1, 2]}])
+    # Cabeçalho (19 bytes), número de campos (2), tamanho do campo (4), versão do jsonb (1)
+    length = struct.unpack(">i", encoded[21:25])[0]
+    assert encoded[25:25 + length] == b"\x01" + json.dumps([1, 2]).encode()
+
+
+def test_binary_list_in_text_column_is_rejected():
+    with pytest.raises(CopyEncodingError):
+        encode_binary_rows(["note"], COLUMN_TYPES, [{"note": [1]}])
+
+
+class FakeCursor:
+    def __init__(self, error):
+        self.error = error
+        self.queries = []
+
+    def copy_expert(self, query, payload):
+        self.queries.append(query)
+        if self.error:
+            raise self.error
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def pg_adapter(monkeypatch):
+    """Adaptador PostgreSQL sem servidor: conexões de carga e INSERT substituídos por registros das chamadas"""
+    adapter = PostgreSQLAdapter(None, "destino")
+    state = {"open": 0, "open_during_insert": None, "cursor": FakeCursor(None), "inserted": []}
+    dbapi_conn = SimpleNamespace(
+        encoding="UTF8", cursor=lambda: state["cursor"], commit=lambda: None, rollback=lambda: None
+    )
+
+    @contextmanager
+    def load_connection(table_name):
+        state["open"] += 1
+        try:
+            yield SimpleNamespace(connection=SimpleNamespace(dbapi_connection=dbapi_conn))
+        finally:
+            state["open"] -= 1
+
+    def insert_data(table_name, data):
+        state["open_during_insert"] = state["open"]
+        state["inserted"].extend(data)
+        return True
+
+    monkeypatch.setattr(adapter, "_load_connection", load_connection)
+    monkeypatch.setattr(adapter, "_get_copy_column_types", lambda conn, table_name: COLUMN_TYPES)
+    monkeypatch.setattr(adapter, "insert_data", insert_data)
+    return adapter, state
+
+
+def test_copy_rejected_by_server_falls_back_after_releasing_connection(pg_adapter):
+    adapter, state = pg_adapter
+    state["cursor"] = FakeCursor(psycopg2.DataError("invalid input syntax"))
+    rows = [{"id": 1, "note": "a"}]
+
+    assert adapter.copy_data("my table", rows) is True
+    assert state["inserted"] == rows
+    assert state["open_during_insert"] == 0
+    assert state["cursor"].queries == ['COPY "my table" ("id", "note") FROM STDIN WITH (FORMAT text)']
+
+
+def test_unencodable_batch_falls_back_after_releasing_connection(pg_adapter):
+    adapter, state = pg_adapter
+    rows = [{"id": 1, "note": ["a"]}]
+
+    assert adapter.copy_data("items", rows) is True
+    assert state["inserted"] == rows
+    assert state["open_during_insert"] == 0
+    assert state["cursor"].queries == []
@@ -0,0 +1,60 @@
+"""Cópia paralela por faixas da chave: pontos de corte amostrados e interrupção após a primeira falha"""
+import threading
+import time
+
+import pytest
+from sqlalchemy import text
+
+from app.core.range_copy import RangeParallelCopy, plan_key_ranges
+
+
+def create_items(adapter, rows):
+    with adapter.engine.begin() as conn:
+        conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)"))
+        conn.execute(text("INSERT INTO items (id, name) VALUES (:id, :name)"), [{"id": i, "name": f"item {i}"} for i in range(rows)])
+
+
+def test_first_failed_range_stops_the_others(sqlite_adapter):
+    create_items(sqlite_adapter, 1000)
+    failing_range_started = threading.Event()
+    written = []
+
+    def write_batch(batch):
+        if batch[0]["id"] >= 500:
+            failing_range_started.set()
+            return False
+        # A faixa saudável só segue depois da falha: sem interrupção ela gravaria todos os seus lotes
+        failing_range_started.wait(5)
+        time.sleep(0.01)
+        written.append(len(batch))
+        return True
+
+    copy = RangeParallelCopy(
+        sqlite_adapter, sqlite_adapter, "items", "id", [(None, 500), (500, None)], batch_size=10,
+        write_batch=write_batch
+    )
+    with pytest.raises(Exception, match="faixa 1"):
+        copy.run()
+    assert sum(written) < 500
+
+
+def test_text_key_boundaries_are_sampled_in_key_order(sqlite_adapter):
+    with sqlite_adapter.engine.begin() as conn:
+        conn.execute(text("CREATE TABLE codes (code TEXT PRIMARY KEY)"))
+        conn.execute(text("INSERT INTO codes (code) VALUES (:code)"), [{"code": f"c{i:05d}"} for i in range(20000)])
+
+    boundaries = sqlite_adapter.get_key_boundaries("codes", "code", 4, total=20000)
+    assert boundaries == sorted(boundaries) and len(boundaries) == 3
+    # Amostra de ~400 chaves: cada corte fica perto do quantil correspondente
+    for i, boundary in enumerate(boundaries, start=1):
+        assert abs(int(boundary[1:]) - 5000 * i) < 2000
+
+    ranges = plan_key_ranges(sqlite_adapter, "codes", "code", 4)
+    assert ranges[0][0] is None and ranges[-1][1] is None
+    assert all(ranges[i][1] == ranges[i + 1][0] for i in range(len(ranges) - 1))
+
+
+def test_key_boundaries_in_sub_range_skip_small_ranges(sqlite_adapter):
+    create_items(sqlite_adapter, 10)
+    assert sqlite_adapter.get_key_boundaries("items", "id", 4, 0, 3, total=3) == []
+    assert sqlite_adapter.get_key_boundaries("items", "id", 2, 0, 10) == [5]
@@ -4,6 +4,9 @@ class TableInfo {
   final double sizeMb;
   final int dataLength;
   final int indexLength;
+  // 'exact', 'estimated' ou 'cached'
+  final String countKind;
+  final double? countAgeSeconds;
 
   TableInfo({
     required this.tableName,
@@ -11,6 +14,8 @@ class TableInfo {
     required this.sizeMb,
     required this.dataLength,
     required this.indexLength,
+    this.countKind = 'exact',
+    this.countAgeSeconds,
   });
 
   factory TableInfo.fromJson(Map<String, dynamic> json) {
@@ -20,6 +25,8 @@ class TableInfo {
       sizeMb: (json['size_mb'] ?? 0.0).toDouble(),
       dataLength: json['data_length'] ?? 0,
       indexLength: json['index_length'] ?? 0,
+      countKind: json['count_kind'] ?? 'exact',
+      countAgeSeconds: (json['count_age_seconds'] as num?)?.toDouble(),
     );
   }
 
@@ -30,6 +37,8 @@ class TableInfo {
       'size_mb': sizeMb,
       'data_length': dataLength,
       'index_length': indexLength,
+      'count_kind': countKind,
+      'count_age_seconds': countAgeSeconds,
     };
   }
 }
@@ -339,3 +348,61 @@ class CronJobDelete {
     return {'success': success, 'message': message};
   }
 }
+
+class DependencyGraph {
+  final String databaseType;
+  final List<String> tables;
+  final Map<String, List<String>> dependencies;
+  final List<String> order;
+  final List<List<String>> levels;
+  final List<List<String>> cycleGroups;
+  final DateTime? computedAt;
+
+  DependencyGraph({
+    required this.databaseType,
+    required this.tables,
+    required this.dependencies,
+    required this.order,
+    required this.levels,
+    required this.cycleGroups,
+    this.computedAt,
+  });
+
+  static List<List<String>> _groups(dynamic value) {
+    return (value as List<dynamic>?)
+            ?.map((group) => List<String>.from(group as List<dynamic>))
+            .toList() ??
+        [];
+  }
+
+  factory DependencyGraph.fromJson(Map<String, dynamic> json) {
+    return DependencyGraph(
+      databaseType: json['database_type'] ?? '',
+      tables: List<String>.from(json['tables'] ?? []),
+      dependencies:
+          (json['dependencies'] as Map<String, dynamic>?)?.map(
+            (table, parents) =>
+                MapEntry(table, List<String>.from(parents as List<dynamic>)),
+          ) ??
+          {},
+      order: List<String>.from(json['order'] ?? []),
+      levels: _groups(json['levels']),
+      cycleGroups: _groups(json['cycle_groups']),
+      computedAt: json['computed_at'] != null
+          ? DateTime.parse(json['computed_at'])
+          : null,
+    );
+  }
+
+  Map<String, dynamic> toJson() {
+    return {
+      'database_type': databaseType,
+      'tables': tables,
+      'dependencies': dependencies,
+      'order': order,
+      'levels': levels,
+      'cycle_groups': cycleGroups,
+      'computed_at': computedAt?.toIso8601String(),
+    };
+  }
+}
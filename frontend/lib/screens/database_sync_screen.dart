@@ -341,12 +341,24 @@ class _DatabaseSyncScreenState extends State<DatabaseSyncScreen> {
           "$title: ${table.tableName}",
           style: const TextStyle(fontWeight: FontWeight.bold),
         ),
-        Text('${table.rowCount} registros'),
+        Text(_formatRowCount(table)),
         Text('${table.sizeMb.toStringAsFixed(2)} MB'),
       ],
     );
   }
 
+  String _formatRowCount(TableInfo table) {
+    switch (table.countKind) {
+      case 'estimated':
+        return '~${table.rowCount} registros (estimativa)';
+      case 'cached':
+        final age = table.countAgeSeconds?.round() ?? 0;
+        return '${table.rowCount} registros (contagem de ${age}s atrás)';
+      default:
+        return '${table.rowCount} registros';
+    }
+  }
+
   Widget _buildBatchButton() {
     return Padding(
       padding: const EdgeInsets.all(16),
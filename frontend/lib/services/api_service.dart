@@ -66,6 +66,29 @@ class ApiService {
     }
   }
 
+  Future<DependencyGraph> getDependencyGraph({
+    String database = 'source',
+    bool refresh = false,
+  }) async {
+    try {
+      final response = await http.get(
+        Uri.parse(
+          '$baseUrl/database/dependencies?database=$database&refresh=$refresh',
+        ),
+      );
+
+      if (response.statusCode == 200) {
+        return DependencyGraph.fromJson(json.decode(response.body));
+      } else {
+        throw Exception(
+          'Failed to get dependency graph: ${response.statusCode}',
+        );
+      }
+    } catch (e) {
+      throw Exception('Error getting dependency graph: $e');
+    }
+  }
+
   Future<MigrationResult> migrateTable(
     String tableName, {
     bool overwrite = true,